@@ -0,0 +1,172 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from array import array
+
+from history_index import HistoryIndex, SAVES_DIR, index_entry
+from save_format import parse_save
+from segments import (is_segment, iter_records, next_segment_path, pack_record,
+                      read_archived, write_segment)
+
+# Games packed into one segment before a new one is started
+SEGMENT_BYTES = 64 * 1024 * 1024
+CHUNK_SIZE = 64
+
+
+def loose_saves(saves_dir: str):
+    # Archived games still in their own file
+    return [os.path.join(saves_dir, filename) for filename in sorted(os.listdir(saves_dir))
+            if filename.startswith('game_') and filename.endswith(('.json', '.sav'))]
+
+
+def pack_save(path: str):
+    # Worker: (path, record, index entry minus position), or (path, None,
+    # error) when the save cannot be read
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        entry = index_entry(path, parse_save(data, path), 0, 0)
+    except (OSError, ValueError) as e:
+        return path, None, str(e)
+    return path, pack_record(os.path.basename(path), data), entry
+
+
+def compact(saves_dir: str = SAVES_DIR, workers: int = None,
+            segment_bytes: int = SEGMENT_BYTES) -> dict:
+    # Move every loose archived game into segments. Files are compressed in
+    # a process pool; each segment is written, then indexed, and only then
+    # are its loose files removed, so an interrupted run loses nothing.
+    index = HistoryIndex()
+    paths = loose_saves(saves_dir)
+    stats = {'files': 0, 'segments': 0, 'bytes_before': 0, 'bytes_after': 0, 'skipped': []}
+    batch = []
+
+    def flush():
+        segment = next_segment_path(saves_dir)
+        positions = write_segment(segment, [record for _, record, _ in batch])
+        index.replace([path for path, _, _ in batch],
+                      [(segment,) + entry[1:7] + position
+                       for (_, _, entry), position in zip(batch, positions)])
+        for path, _, _ in batch:
+            stats['bytes_before'] += os.path.getsize(path)
+            os.remove(path)
+        stats['files'] += len(batch)
+        stats['segments'] += 1
+        stats['bytes_after'] += os.path.getsize(segment)
+        batch.clear()
+
+    size = 0
+    with multiprocessing.Pool(workers) as pool:
+        for path, record, entry in pool.imap(pack_save, paths, CHUNK_SIZE):
+            if record is None:
+                stats['skipped'].append((path, entry))
+                continue
+            batch.append((path, record, entry))
+            size += len(record)
+            if size >= segment_bytes:
+                flush()
+                size = 0
+    if batch:
+        flush()
+    return stats
+
+
+def verify_segment(path: str):
+    # Worker: (path, record offsets, errors) after reading every record back
+    offsets, errors = set(), []
+    try:
+        for offset, length, name, data in iter_records(path):
+            offsets.add(offset)
+            try:
+                parse_save(data, name)
+            except ValueError as e:
+                errors.append(f"{path}@{offset}: {e}")
+    except (OSError, ValueError) as e:
+        errors.append(str(e))
+    return path, offsets, errors
+
+
+def verify(saves_dir: str = SAVES_DIR, workers: int = None) -> list:
+    # Check every segment's checksums and that every indexed game can be read
+    segments = [os.path.join(saves_dir, filename) for filename in sorted(os.listdir(saves_dir))
+                if is_segment(filename)]
+    errors = []
+    positions = {}
+    with multiprocessing.Pool(workers) as pool:
+        for path, offsets, segment_errors in pool.imap_unordered(verify_segment, segments):
+            print(f"{path}: {len(offsets)} games, {len(segment_errors)} errors")
+            positions[os.path.normpath(path)] = offsets
+            errors.extend(segment_errors)
+    for game in HistoryIndex().games():
+        path = game['path']
+        if is_segment(path):
+            if game['offset'] not in positions.get(path, ()):
+                errors.append(f"index points at a missing record: {path}@{game['offset']}")
+        elif not os.path.exists(path):
+            errors.append(f"index points at a missing file: {path}")
+    return errors
+
+
+def export_line(game: dict) -> str:
+    # Worker: one archived game as a JSON line
+    data = read_archived(game['path'], game['offset'])
+    data['archive'] = {'path': game['path'], 'offset': game['offset']}
+    return json.dumps(data, default=to_json)
+
+
+def to_json(value):
+    # Move logs and chunked tile planes
+    if isinstance(value, array):
+        return value.tolist()
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def export(output: str, workers: int = None) -> int:
+    # Write every archived game, oldest first, as JSON Lines
+    games = HistoryIndex().games()[::-1]
+    with open(output, 'w') as f, multiprocessing.Pool(workers) as pool:
+        for line in pool.imap(export_line, games, CHUNK_SIZE):
+            f.write(line + '\n')
+    return len(games)
+
+
+def main():
+    # Run from the folder the game runs in: Saves/ and its history index
+    # are found relative to it
+    parser = argparse.ArgumentParser(description="Maintain the Saves/ archive of finished games.")
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: one per core)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    compact_parser = commands.add_parser('compact', help="pack loose saves into compressed segments")
+    compact_parser.add_argument('--segment-mb', type=float, default=SEGMENT_BYTES / 2 ** 20)
+    commands.add_parser('verify', help="check segment checksums and the history index")
+    export_parser = commands.add_parser('export', help="write every archived game as JSON Lines")
+    export_parser.add_argument('output')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == 'compact':
+        stats = compact(SAVES_DIR, args.workers, int(args.segment_mb * 2 ** 20))
+        for path, error in stats['skipped']:
+            print(f"skipped {path}: {error}", file=sys.stderr)
+        print(f"{stats['files']} games into {stats['segments']} segments, "
+              f"{stats['bytes_before'] / 1e6:.1f} MB -> {stats['bytes_after'] / 1e6:.1f} MB "
+              f"in {time.perf_counter() - start:.1f}s")
+    elif args.command == 'verify':
+        errors = verify(SAVES_DIR, args.workers)
+        for error in errors:
+            print(error, file=sys.stderr)
+        print(f"{len(errors)} errors in {time.perf_counter() - start:.1f}s")
+        if errors:
+            sys.exit(1)
+    else:
+        count = export(args.output, args.workers)
+        print(f"{count} games exported in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+# Autosave every N moves in GameWindow (0 turns autosave off)
+AUTOSAVE_EVERY = int(os.environ.get('MINESWEEPER_AUTOSAVE_EVERY', '0'))
+
+
+class BackgroundSaver:
+    # Writes save files on a worker thread. Callers hand over a job that
+    # writes a snapshot of the game; a newer job for the same path replaces
+    # one still waiting, so bursts of saves cost one write.
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.pending = OrderedDict()  # path -> (job or None to remove, requested at)
+        self.busy = False
+        self.closed = False
+        self.written = 0
+        self.coalesced = 0
+        self.latencies = deque(maxlen=100)
+        self.thread = threading.Thread(target=self.run, name="background-saver", daemon=True)
+        self.thread.start()
+
+    def write(self, path, job):
+        # Queue `job()`, which writes `path`
+        self.submit(path, job)
+
+    def remove(self, path):
+        # Queue deletion of `path`, dropping any write still waiting for it
+        self.submit(path, None)
+
+    def submit(self, path, job):
+        with self.condition:
+            if path in self.pending:
+                # Keep the original request time so latency covers the wait
+                self.coalesced += 1
+                self.pending[path] = (job, self.pending[path][1])
+            else:
+                self.pending[path] = (job, time.perf_counter())
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                path, (job, requested) = self.pending.popitem(last=False)
+                self.busy = True
+
+            try:
+                if job is not None:
+                    job()
+                elif os.path.exists(path):
+                    os.remove(path)
+            except Exception:
+                logger.exception("Background save of %s failed", path)
+
+            latency = time.perf_counter() - requested
+            with self.condition:
+                self.busy = False
+                self.written += 1
+                self.latencies.append(latency)
+                depth = len(self.pending)
+                self.condition.notify_all()
+            logger.debug("%s %s in %.1f ms (queue depth %d)",
+                         "saved" if job is not None else "removed",
+                         path, latency * 1000, depth)
+
+    def flush(self, timeout=None):
+        # Wait until every queued job has been written
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending and not self.busy, timeout)
+
+    def close(self):
+        # Write what is queued, then stop the worker
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+
+    @property
+    def queue_depth(self):
+        with self.condition:
+            return len(self.pending) + self.busy
+
+    def stats(self):
+        # Monitoring numbers: queue depth and save latency in milliseconds
+        with self.condition:
+            latencies = list(self.latencies)
+            return {
+                'queue_depth': len(self.pending) + self.busy,
+                'written': self.written,
+                'coalesced': self.coalesced,
+                'last_latency_ms': latencies[-1] * 1000 if latencies else None,
+                'mean_latency_ms': sum(latencies) / len(latencies) * 1000 if latencies else None,
+                'max_latency_ms': max(latencies) * 1000 if latencies else None,
+            }
+
+
+_default_saver = None
+
+
+def default_saver():
+    # The saver shared by every window, started on first use
+    global _default_saver
+    if _default_saver is None:
+        _default_saver = BackgroundSaver()
+    return _default_saver
+
+
+def shutdown():
+    # Finish pending saves before the process exits
+    if _default_saver is not None:
+        _default_saver.close()
@@ -0,0 +1,139 @@
+import random
+from array import array
+from typing import Iterator
+
+from board import BORDER_BIT, MINE_BIT, PackedBoard
+from game import Game, sample_mine_indices
+
+# NumPy is optional: without it batches are built one board at a time
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+
+class NumpyBoardBatch:
+    # Many boards of one size generated at once. `boards` is a (games,
+    # height, width) int8 array of board values (-1 for a mine) and
+    # `packed` the same boards in PackedBoard's padded byte layout; slices
+    # of either are views, not copies.
+    def __init__(self, games: int, width: int, height: int, mines: int,
+                 first_x: int, first_y: int, seed: int):
+        self.width = width
+        self.height = height
+        self.mines = mines
+        self.first_x = first_x
+        self.first_y = first_y
+        self.seed = seed
+
+        # Candidate cells: everything but the first click and its neighbors
+        safe = np.zeros(width * height, dtype=bool)
+        safe.reshape(height, width)[max(first_y - 1, 0):first_y + 2,
+                                    max(first_x - 1, 0):first_x + 2] = True
+        candidates = np.flatnonzero(~safe)
+        if not 0 <= mines <= len(candidates):
+            raise ValueError(f"Cannot place {mines} mines on a {width}x{height} board")
+
+        # The `mines` smallest of one uniform key per candidate are a
+        # uniform subset, chosen for every game in one call
+        rng = np.random.default_rng(seed)
+        keys = rng.random((games, len(candidates)))
+        if mines:
+            picks = np.argpartition(keys, mines - 1, axis=1)[:, :mines]
+        else:
+            picks = np.empty((games, 0), dtype=np.intp)
+        is_mine = np.zeros((games, width * height), dtype=bool)
+        np.put_along_axis(is_mine, candidates[picks], True, axis=1)
+        is_mine = is_mine.reshape(games, height, width)
+
+        # Neighbor counts as the sum of eight shifted views of a padded mask
+        padded = np.zeros((games, height + 2, width + 2), dtype=np.uint8)
+        padded[:, 1:-1, 1:-1] = is_mine
+        counts = np.zeros((games, height, width), dtype=np.uint8)
+        for dy in range(3):
+            for dx in range(3):
+                if dy != 1 or dx != 1:
+                    counts += padded[:, dy:dy + height, dx:dx + width]
+
+        self.boards = np.where(is_mine, -1, counts).astype(np.int8)
+
+        # PackedBoard bytes: count nibble and mine bit, border on the padding
+        packed = padded
+        packed[:, 1:-1, 1:-1] = counts | (is_mine.view(np.uint8) * MINE_BIT)
+        packed[:, [0, -1], :] = BORDER_BIT
+        packed[:, :, [0, -1]] = BORDER_BIT
+        self.packed = packed
+
+    def __len__(self) -> int:
+        return len(self.boards)
+
+    def mine_indices(self, n: int) -> array:
+        return array('q', np.flatnonzero(self.boards[n] == -1).tolist())
+
+    def game(self, n: int, engine: str = 'packed', persist: bool = True) -> Game:
+        # Game n with its mines laid out around the first click, which is
+        # the caller's move to make
+        game = Game(self.width, self.height, self.mines, engine, self.seed + n, persist)
+        game.mine_indices = self.mine_indices(n)
+        if isinstance(game.cells, PackedBoard):
+            game.cells.cells[:] = self.packed[n].data
+        else:
+            game.cells.lay_mines(game.mine_indices)
+        game.first_move = False
+        return game
+
+    def games(self, engine: str = 'packed', persist: bool = True) -> Iterator[Game]:
+        for n in range(len(self)):
+            yield self.game(n, engine, persist)
+
+
+class PythonBoardBatch:
+    # The same interface without NumPy: mines are sampled per game and
+    # counted when the game is handed out. There are no raw arrays.
+    def __init__(self, games: int, width: int, height: int, mines: int,
+                 first_x: int, first_y: int, seed: int):
+        self.width = width
+        self.height = height
+        self.mines = mines
+        self.first_x = first_x
+        self.first_y = first_y
+        self.seed = seed
+        rng = random.Random(seed)
+        self.placements = [sample_mine_indices(rng, width, height, mines, first_x, first_y)
+                           for _ in range(games)]
+
+    def __len__(self) -> int:
+        return len(self.placements)
+
+    def mine_indices(self, n: int) -> array:
+        return array('q', self.placements[n])
+
+    def game(self, n: int, engine: str = 'packed', persist: bool = True) -> Game:
+        game = Game(self.width, self.height, self.mines, engine, self.seed + n, persist)
+        game.mine_indices = self.mine_indices(n)
+        game.cells.lay_mines(game.mine_indices)
+        game.first_move = False
+        return game
+
+    def games(self, engine: str = 'packed', persist: bool = True) -> Iterator[Game]:
+        for n in range(len(self)):
+            yield self.game(n, engine, persist)
+
+
+def generate_boards(games: int, width: int, height: int, mines: int,
+                    first_x: int = None, first_y: int = None, seed: int = 0,
+                    use_numpy: bool = None):
+    # A batch of boards whose first click (default: the centre) is safe.
+    # NumPy is used when installed unless use_numpy is False.
+    if first_x is None:
+        first_x = width // 2
+    if first_y is None:
+        first_y = height // 2
+    if use_numpy is None:
+        use_numpy = HAVE_NUMPY
+    elif use_numpy and not HAVE_NUMPY:
+        raise ImportError("NumPy is not installed")
+    batch = NumpyBoardBatch if use_numpy else PythonBoardBatch
+    return batch(games, width, height, mines, first_x, first_y, seed)
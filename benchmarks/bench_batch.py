@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import HAVE_NUMPY, generate_boards
+from game import Game
+
+# (name, width, height, mines, boards)
+BOARDS = [("Easy", 9, 9, 10, 20000), ("Hard", 30, 16, 99, 10000), ("100x100", 100, 100, 2000, 500)]
+
+
+def rate(boards, run):
+    start = time.perf_counter()
+    run()
+    return boards / (time.perf_counter() - start)
+
+
+def place_mines(boards, width, height, mines):
+    # One Game per board, mines laid by Game.place_mines
+    for seed in range(boards):
+        Game(width, height, mines, 'packed', seed, persist=False).place_mines(width // 2, height // 2)
+
+
+def batch_games(boards, width, height, mines, use_numpy):
+    for _ in generate_boards(boards, width, height, mines, use_numpy=use_numpy).games(persist=False):
+        pass
+
+
+def main():
+    print("boards per second")
+    columns = ["place_mines", "python batch"] + (["numpy arrays", "numpy games"] if HAVE_NUMPY else [])
+    print(f"{'board':<8}" + "".join(f"{name:>14}" for name in columns))
+    for name, width, height, mines, boards in BOARDS:
+        rates = [rate(boards, lambda: place_mines(boards, width, height, mines)),
+                 rate(boards, lambda: batch_games(boards, width, height, mines, False))]
+        if HAVE_NUMPY:
+            rates.append(rate(boards, lambda: generate_boards(boards, width, height, mines, use_numpy=True)))
+            rates.append(rate(boards, lambda: batch_games(boards, width, height, mines, True)))
+        print(f"{name:<8}" + "".join(f"{value:>14,.0f}" for value in rates))
+    if not HAVE_NUMPY:
+        print("NumPy is not installed; install it to time the vectorized generator")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import os
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import BOARD_ENGINES
+
+SIZES = [(30, 16), (100, 100), (1000, 1000)]
+DENSITY = 0.15
+# Engines that take a mine layout; the chunked one draws its own (see bench_chunked.py)
+ENGINES = [name for name, engine in BOARD_ENGINES.items() if not engine.lazy_mines]
+
+
+def measure_memory(engine, width, height):
+    # Bytes held by a freshly built board
+    tracemalloc.start()
+    cells = BOARD_ENGINES[engine](width, height)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cells
+    return size
+
+
+def measure_reveal(engine, width, height):
+    # Open every safe cell and report cells per second
+    rng = random.Random(1)
+    cells = BOARD_ENGINES[engine](width, height)
+    mines = rng.sample(range(width * height), int(width * height * DENSITY))
+    cells.lay_mines(mines)
+
+    start = time.perf_counter()
+    opened = array('q')
+    for y in range(height):
+        for x in range(width):
+            if cells.get(x, y) != -1 and not cells.is_revealed(x, y):
+                cells.flood(x, y, opened)
+    elapsed = time.perf_counter() - start
+    return len(opened) / elapsed
+
+
+def main():
+    print(f"{'engine':<8} {'size':>11} {'memory':>12} {'reveal cells/s':>16}")
+    for width, height in SIZES:
+        for engine in ENGINES:
+            memory = measure_memory(engine, width, height)
+            rate = measure_reveal(engine, width, height)
+            print(f"{engine:<8} {f'{width}x{height}':>11} {memory / 1024:>10.1f}KB {rate:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
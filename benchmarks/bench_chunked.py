@@ -0,0 +1,58 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Game, SAVE_FILE
+
+# A board far too large to hold densely (10^10 cells, one byte each would
+# be 10 GB), played by clicking around the first click
+SIZE = 100000
+DENSITY = 0.12
+CLICKS = 200
+SPREAD = 300  # clicks land within this many cells of the centre
+
+
+def main():
+    os.chdir(tempfile.mkdtemp())  # save_game writes to the working directory
+    rng = random.Random(1)
+    start = time.perf_counter()
+    game = Game(SIZE, SIZE, int(SIZE * SIZE * DENSITY), 'chunked', seed=1)
+    centre = SIZE // 2
+    game.reveal(centre, centre)
+    first = time.perf_counter() - start
+
+    timings = []
+    while len(timings) < CLICKS and not game.game_over:
+        x, y = centre + rng.randint(-SPREAD, SPREAD), centre + rng.randint(-SPREAD, SPREAD)
+        if game.cells.is_revealed(x, y) or game.cells.is_flagged(x, y):
+            continue
+        start = time.perf_counter()
+        if rng.random() < 0.2:
+            game.toggle_flag(x, y)
+        else:
+            game.reveal(x, y)
+        timings.append(time.perf_counter() - start)
+        game.game_over = False  # keep clicking past mines
+    timings.sort()
+
+    start = time.perf_counter()
+    game.save_game()
+    save = time.perf_counter() - start
+    start = time.perf_counter()
+    Game.load_game()
+    load = time.perf_counter() - start
+
+    print(f"board {SIZE}x{SIZE}, {game.mines} mines")
+    print(f"first click {first * 1000:.1f}ms, {len(timings)} clicks: "
+          f"median {timings[len(timings) // 2] * 1000:.2f}ms, max {timings[-1] * 1000:.2f}ms")
+    print(f"{len(game.cells.tiles)} tiles, {game.cells.memory() / 1e6:.1f} MB, "
+          f"{game.revealed_count} cells revealed")
+    print(f"save {save * 1000:.1f}ms ({os.path.getsize(SAVE_FILE) / 1e3:.1f} kB), load {load * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from no_guess import BoardPool, generate
+
+# Generation throughput of no-guess boards on one core, then the pooled
+# cache serving first clicks the way a player starting game after game
+# would: hit rate, and how long the first click waits
+SIZES = {"Easy": (9, 9, 10), "Medium": (16, 16, 40), "Hard": (30, 16, 99)}
+
+
+def throughput(width, height, mines, seconds, rng):
+    boards = attempts = failed = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        board = generate(rng, width, height, mines, rng.randrange(width), rng.randrange(height))
+        if board is None:
+            failed += 1
+            continue
+        boards += 1
+        attempts += board[2]
+    elapsed = time.perf_counter() - start
+    return boards / elapsed, attempts / max(boards, 1), failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure no-guess board generation and the board cache.")
+    parser.add_argument('--seconds', type=float, default=5, help="generation time per difficulty")
+    parser.add_argument('--games', type=int, default=60, help="first clicks served per difficulty")
+    parser.add_argument('--gap', type=float, default=0.5, help="seconds between games")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    print(f"{'':<8} {'boards/s':>9} {'solver runs/board':>18}")
+    for name, size in SIZES.items():
+        rate, attempts, failed = throughput(*size, args.seconds, rng)
+        print(f"{name:<8} {rate:>9.1f} {attempts:>18.1f}" + (f"  ({failed} gave up)" if failed else ""))
+
+    pool = BoardPool(args.workers)
+    try:
+        for size in SIZES.values():
+            pool.warm(*size)
+        start = time.perf_counter()
+        while pool.stats()['pending']:
+            time.sleep(0.1)
+        print(f"\ncache filled in {time.perf_counter() - start:.1f}s on {pool.workers} workers "
+              f"({pool.stats()['cached']} boards)")
+
+        print(f"{'':<8} {'hit rate':>9} {'median wait':>12} {'max wait':>9}")
+        for name, (width, height, mines) in SIZES.items():
+            hits, waits = 0, []
+            for _ in range(args.games):
+                x, y = rng.randrange(width), rng.randrange(height)
+                start = time.perf_counter()
+                board = pool.take(width, height, mines, x, y)
+                if board is None:
+                    board = generate(rng, width, height, mines, x, y)  # what Game does on a miss
+                else:
+                    hits += 1
+                waits.append(time.perf_counter() - start)
+                time.sleep(args.gap)
+            print(f"{name:<8} {hits / args.games:>9.0%} {statistics.median(waits) * 1000:>10.2f}ms "
+                  f"{max(waits) * 1000:>7.1f}ms")
+        stats = pool.stats()
+        print(f"\noverall: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['generated']} boards generated in {stats['generation_seconds']:.1f} CPU-seconds")
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import ListBoard
+from game import Game
+
+SIZES = [(30, 16), (100, 100), (1000, 1000), (3163, 3163)]
+DENSITY = 0.15
+MAX_LEGACY_CELLS = 1000 * 1000
+
+
+def legacy_place_mines(width, height, mines, first_x, first_y):
+    # The placement Game used before sample_mine_indices, on the list layout
+    cells = ListBoard(width, height)
+    safe_zone = cells.neighbors(first_x, first_y) + [(first_x, first_y)]
+    all_positions = [(x, y) for x in range(width) for y in range(height)
+                     if (x, y) not in safe_zone]
+    mine_positions = set(random.sample(all_positions, mines))
+    for x, y in mine_positions:
+        cells.board[y][x] = -1
+        for adj_x, adj_y in cells.neighbors(x, y):
+            if cells.board[adj_y][adj_x] != -1:
+                cells.board[adj_y][adj_x] += 1
+
+
+def time_first_reveal(engine, width, height, mines):
+    # From constructing the game to the first reveal returning
+    start = time.perf_counter()
+    game = Game(width, height, mines, engine, seed=1)
+    game.reveal(width // 2, height // 2)
+    return time.perf_counter() - start
+
+
+def time_legacy(width, height, mines):
+    random.seed(1)
+    start = time.perf_counter()
+    legacy_place_mines(width, height, mines, width // 2, height // 2)
+    return time.perf_counter() - start
+
+
+def main():
+    os.chdir(tempfile.mkdtemp())  # Game creates Saves/ in the working directory
+    print(f"mine density {DENSITY:.0%}, time from Game() to the first reveal")
+    print(f"{'size':>11} {'cells':>12} {'legacy':>10} {'list':>10} {'packed':>10}")
+    for width, height in SIZES:
+        mines = int(width * height * DENSITY)
+        legacy = f"{time_legacy(width, height, mines):.3f}s" if width * height <= MAX_LEGACY_CELLS else "-"
+        list_time = time_first_reveal('list', width, height, mines)
+        packed_time = time_first_reveal('packed', width, height, mines)
+        print(f"{f'{width}x{height}':>11} {width * height:>12,} {legacy:>10} "
+              f"{list_time:>9.3f}s {packed_time:>9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Game
+from probability import ProbabilityEngine
+
+# (name, width, height, mines, games, p95 latency target in ms)
+BOARDS = [("Hard", 30, 16, 99, 30, 50), ("100x100@20%", 100, 100, 2000, 2, 250)]
+
+
+def play(width, height, mines, seed):
+    # Play by always opening the safest cell, timing every probability query.
+    # The engine lives across moves, so queries after the first are
+    # incremental.
+    game = Game(width, height, mines, 'packed', seed=seed)
+    game.reveal(width // 2, height // 2)
+    engine = ProbabilityEngine(game)
+    latencies = []
+    while not game.game_over and not game.check_win():
+        start = time.perf_counter()
+        probabilities, interior = engine.query()
+        latencies.append(time.perf_counter() - start)
+
+        best, risk = None, 2.0
+        for i, p in probabilities.items():
+            if p < risk:
+                best, risk = i, p
+        if interior < risk:
+            # Any interior cell will do; there may be none left
+            cells = [i for i in range(width * height)
+                     if i not in probabilities
+                     and not game.cells.is_revealed(i % width, i // width)
+                     and not game.cells.is_flagged(i % width, i // width)]
+            if cells:
+                best = random.Random(seed + len(latencies)).choice(cells)
+        y, x = divmod(best, width)
+        engine.notice(game.reveal(x, y).cells)
+    return latencies
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def main():
+    os.chdir(tempfile.mkdtemp())  # Game creates Saves/ in the working directory
+    print(f"{'board':<12} {'queries':>8} {'p50':>9} {'p95':>9} {'max':>9} {'target p95':>11}")
+    for name, width, height, mines, games, target in BOARDS:
+        latencies = []
+        for seed in range(games):
+            latencies.extend(play(width, height, mines, seed))
+        p95 = percentile(latencies, 0.95) * 1000
+        status = "ok" if p95 <= target else "MISSED"
+        print(f"{name:<12} {len(latencies):>8} {percentile(latencies, 0.5) * 1000:>7.1f}ms "
+              f"{p95:>7.1f}ms {max(latencies) * 1000:>7.1f}ms {target:>7}ms {status}")
+
+
+if __name__ == "__main__":
+    main()
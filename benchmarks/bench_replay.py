@@ -0,0 +1,60 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Game
+from replay import Replay
+from solver import Solver
+
+BOARDS = [("Hard", 30, 16, 99), ("100x100", 100, 100, 1500), ("300x300", 300, 300, 13500)]
+SEEKS = 200
+
+
+def record(width, height, mines, seed=1):
+    # A full game played cell by cell: the solver's safe cells one click
+    # each, its mines flagged, random guesses when stuck
+    rng = random.Random(seed)
+    game = Game(width, height, mines, 'packed', seed=seed, persist=False)
+    game.reveal(width // 2, height // 2)
+    solver = Solver(game)
+    while game.status == 'playing':
+        deductions = solver.analyse()
+        if not deductions:
+            while True:
+                x, y = rng.randrange(width), rng.randrange(height)
+                if not game.cells.is_revealed(x, y) and not game.cells.is_flagged(x, y):
+                    break
+            deductions.safe.add(y * width + x)
+        solver.apply(deductions)
+    return game
+
+
+def main():
+    print(f"{'board':<8} {'moves':>6} {'open':>9} {'seek':>9} {'from start':>11}")
+    for name, width, height, mines in BOARDS:
+        game = record(width, height, mines)
+        moves = game.moves
+        start = time.perf_counter()
+        replay = Replay(width, height, mines, game.mine_indices, moves)
+        opened = time.perf_counter() - start
+
+        rng = random.Random(2)
+        targets = [rng.randrange(len(moves) + 1) for _ in range(SEEKS)]
+        start = time.perf_counter()
+        for target in targets:
+            replay.seek(target)
+        seek = (time.perf_counter() - start) / SEEKS
+
+        # The same positions rebuilt by replaying from the first move
+        start = time.perf_counter()
+        for target in targets[:10]:
+            Replay(width, height, mines, game.mine_indices, moves[:target], keyframe_every=len(moves) + 1)
+        naive = (time.perf_counter() - start) / 10
+        print(f"{name:<8} {len(moves):>6} {opened * 1000:>7.1f}ms {seek * 1000:>7.2f}ms {naive * 1000:>9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
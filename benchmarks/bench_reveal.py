@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import BOARD_ENGINES
+
+SIZES = [(100, 100), (1000, 1000), (4000, 4000)]
+DENSITY = 0.02
+# Engines that take a mine layout; the chunked one draws its own (see bench_chunked.py)
+ENGINES = [name for name, engine in BOARD_ENGINES.items() if not engine.lazy_mines]
+
+
+def recursive_reveal(cells, x, y):
+    # The cascade Game.reveal used before the iterative flood fill
+    cells.set_revealed(x, y)
+    if cells.get(x, y) == 0:
+        for adj_x, adj_y in cells.neighbors(x, y):
+            if not cells.is_revealed(adj_x, adj_y):
+                recursive_reveal(cells, adj_x, adj_y)
+
+
+def build(engine, width, height, seed=1):
+    # Lay mines directly through the engine and pick an empty first click
+    rng = random.Random(seed)
+    cells = BOARD_ENGINES[engine](width, height)
+    mines = rng.sample(range(width * height), int(width * height * DENSITY))
+    cells.lay_mines(mines)
+    while True:
+        x, y = rng.randrange(width), rng.randrange(height)
+        if cells.get(x, y) == 0:
+            return cells, x, y
+
+
+def time_recursive(engine, width, height):
+    cells, x, y = build(engine, width, height)
+    start = time.perf_counter()
+    try:
+        recursive_reveal(cells, x, y)
+    except RecursionError:
+        return None
+    return time.perf_counter() - start
+
+
+def time_flood(engine, width, height):
+    cells, x, y = build(engine, width, height)
+    opened = array('q')
+    start = time.perf_counter()
+    cells.flood(x, y, opened)
+    return time.perf_counter() - start, len(opened)
+
+
+def main():
+    print(f"mine density {DENSITY:.0%}, first click on an empty cell")
+    print(f"{'engine':<8} {'size':>11} {'opened':>10} {'recursive':>12} {'flood':>10} {'cells/s':>12}")
+    engines = sys.argv[1:] or ENGINES
+    for width, height in SIZES:
+        for engine in engines:
+            elapsed, opened = time_flood(engine, width, height)
+            recursive = time_recursive(engine, width, height)
+            recursive = "RecursionError" if recursive is None else f"{recursive:.3f}s"
+            print(f"{engine:<8} {f'{width}x{height}':>11} {opened:>10,} {recursive:>12} "
+                  f"{elapsed:>9.3f}s {opened / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
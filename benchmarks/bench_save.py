@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Game, SAVE_FILE, LEGACY_SAVE_FILE
+
+BOARDS = [("Easy", 9, 9, 10), ("Hard", 30, 16, 99), ("1000x1000", 1000, 1000, 150000)]
+
+
+def round_trip(game, save_format):
+    # Save an ongoing game and load it back, returning size and timings
+    game.save_format = save_format
+    start = time.perf_counter()
+    game.save_game()
+    saved = time.perf_counter() - start
+    path = SAVE_FILE if save_format == 'binary' else LEGACY_SAVE_FILE
+    size = os.path.getsize(path)
+
+    start = time.perf_counter()
+    Game.load_file(path)
+    loaded = time.perf_counter() - start
+    os.remove(path)
+    return size, saved, loaded
+
+
+def main():
+    os.chdir(tempfile.mkdtemp())  # Game creates Saves/ in the working directory
+    print(f"{'board':<10} {'engine':<7} {'format':<7} {'size':>12} {'save':>9} {'load':>9}")
+    for name, width, height, mines in BOARDS:
+        for engine in ('list', 'packed'):
+            game = Game(width, height, mines, engine, seed=1)
+            game.reveal(0, 0)
+            for save_format in ('json', 'binary'):
+                size, saved, loaded = round_trip(game, save_format)
+                print(f"{name:<10} {engine:<7} {save_format:<7} {size:>11,}B "
+                      f"{saved * 1000:>7.1f}ms {loaded * 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
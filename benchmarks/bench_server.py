@@ -0,0 +1,85 @@
+import argparse
+import ast
+import asyncio
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from move_log import MOVE_REVEAL
+from server import HIDDEN, PLAYING, Client
+
+# Load generator: many tables, each a player clicking random hidden cells
+# as fast as the server answers, watched by spectators. A table starts a
+# new game whenever one ends. The server runs in its own process, so its
+# CPU time is measured apart from the clients'.
+WIDTH, HEIGHT, MINES = 30, 16, 99
+
+
+async def spectate(client: Client):
+    while client.status == PLAYING:
+        await client.receive()
+    client.close()
+
+
+async def table(host: str, port: int, spectators: int, deadline: float, rng: random.Random):
+    while time.perf_counter() < deadline:
+        player = await Client.connect(host, port)
+        await player.create(WIDTH, HEIGHT, MINES, rng.randrange(2 ** 31))
+        watchers = []
+        for _ in range(spectators):
+            watcher = await Client.connect(host, port)
+            await watcher.join(player.game_id)
+            watchers.append(asyncio.create_task(spectate(watcher)))
+        while player.status == PLAYING and time.perf_counter() < deadline:
+            hidden = [i for i, view in enumerate(player.view) if view == HIDDEN]
+            i = rng.choice(hidden)
+            await player.move(MOVE_REVEAL, i % WIDTH, i // WIDTH)
+        player.close()  # the game closes once its spectators have left too
+        if player.status == PLAYING:
+            for watcher in watchers:
+                watcher.cancel()
+        await asyncio.gather(*watchers, return_exceptions=True)
+
+
+async def load(host: str, port: int, tables: int, spectators: int, seconds: float):
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(table(host, port, spectators, deadline, random.Random(n))
+                           for n in range(tables)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive server.py with many players and spectators.")
+    parser.add_argument('--tables', type=int, default=50, help="games played at once")
+    parser.add_argument('--spectators', type=int, default=2, help="spectators per game")
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'server.py'), '--port', '0'],
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        host, port = server.stdout.readline().split()[-1].rsplit(':', 1)
+        start = time.perf_counter()
+        asyncio.run(load(host, int(port), args.tables, args.spectators, args.seconds))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.send_signal(signal.SIGINT)
+        output, _ = server.communicate()
+    stats = ast.literal_eval(output[output.index('stats') + len('stats'):].strip())
+
+    print(f"{args.tables} tables x {1 + args.spectators} clients, {WIDTH}x{HEIGHT} with {MINES} mines, "
+          f"{elapsed:.1f}s")
+    print(f"games hosted: {stats['games_created']} ({stats['games_created'] / elapsed:.1f}/s)")
+    print(f"moves: {stats['moves']} ({stats['moves'] / elapsed:.0f}/s wall clock, "
+          f"clients on the same machine)")
+    print(f"server CPU: {stats['cpu_s']:.2f}s, {stats['moves'] / stats['cpu_s']:.0f} moves "
+          f"and {stats['games_created'] / stats['cpu_s']:.1f} games per CPU-second (one core)")
+
+
+if __name__ == "__main__":
+    main()
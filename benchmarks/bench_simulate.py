@@ -0,0 +1,31 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulate import simulate
+
+GAMES_PER_WORKER = 200
+
+
+def main():
+    # Throughput of the solver strategy on Medium boards as workers are
+    # added; efficiency is per-core games/s relative to a single worker
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1)))
+    print(f"{'workers':>7} {'games':>6} {'games/s':>9} {'per core':>9} {'efficiency':>11}")
+    single = None
+    for workers in counts:
+        games = GAMES_PER_WORKER * workers
+        start = time.perf_counter()
+        for _ in simulate(games, 16, 16, 40, 'solver', workers=workers, chunk_size=25):
+            pass
+        rate = games / (time.perf_counter() - start)
+        single = single or rate
+        print(f"{workers:>7} {games:>6} {rate:>9,.1f} {rate / workers:>9,.1f} "
+              f"{rate / workers / single:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Game
+from solver import Solver
+
+BOARDS = [("Hard", 30, 16, 99, 50), ("100x100", 100, 100, 1500, 5), ("300x300", 300, 300, 13500, 1)]
+
+
+def play(width, height, mines, seed):
+    # Play one game with the solver, guessing when it is stuck. Returns the
+    # time spent in analyse() and the number of positions analysed.
+    rng = random.Random(seed)
+    game = Game(width, height, mines, 'packed', seed=seed)
+    game.reveal(width // 2, height // 2)
+    solver = Solver(game)
+    elapsed = 0.0
+    positions = 0
+    while not game.game_over and not game.check_win():
+        start = time.perf_counter()
+        deductions = solver.analyse()
+        elapsed += time.perf_counter() - start
+        positions += 1
+        if deductions:
+            solver.apply(deductions)
+        else:
+            while True:
+                x, y = rng.randrange(width), rng.randrange(height)
+                if not game.cells.is_revealed(x, y) and not game.cells.is_flagged(x, y):
+                    break
+            solver.notice(game.reveal(x, y).cells)
+    return elapsed, positions, solver
+
+
+def main():
+    os.chdir(tempfile.mkdtemp())  # Game creates Saves/ in the working directory
+    print(f"{'board':<9} {'games':>5} {'positions':>10} {'positions/s':>12} {'cache hits':>11}")
+    for name, width, height, mines, games in BOARDS:
+        elapsed = positions = hits = lookups = 0
+        for seed in range(games):
+            game_elapsed, game_positions, solver = play(width, height, mines, seed)
+            elapsed += game_elapsed
+            positions += game_positions
+            hits += solver.cache_hits
+            lookups += solver.cache_hits + solver.cache_misses
+        print(f"{name:<9} {games:>5} {positions:>10,} {positions / elapsed:>12,.0f} "
+              f"{hits / max(lookups, 1):>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 5
+SHOWN = 15  # slowest modules listed
+
+
+def import_times():
+    # Cumulative import time per module (microseconds) of `import main`,
+    # from python -X importtime, in a fresh interpreter
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative))
+    return times
+
+
+def first_frame(workdir):
+    # Milliseconds from process start to the menu being drawn
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'main.py'), '--startup-only'],
+                            cwd=workdir, capture_output=True, text=True, check=True)
+    return float(result.stdout.split()[-2])
+
+
+def main():
+    runs = [import_times() for _ in range(RUNS)]
+    modules = {name: (statistics.median(run[name][0] for run in runs),
+                      statistics.median(run[name][1] for run in runs))
+               for name in runs[0]}
+    local = {os.path.splitext(name)[0] for name in os.listdir(ROOT) if name.endswith('.py')}
+    print(f"import main: {modules['main'][1] / 1000:.1f} ms (median of {RUNS})")
+    print(f"{'module':<24} {'self':>9} {'cumulative':>11}")
+    for name, (self_us, cumulative) in sorted(modules.items(), key=lambda item: -item[1][1])[:SHOWN]:
+        print(f"{name + (' *' if name in local else ''):<24} {self_us / 1000:>7.1f}ms {cumulative / 1000:>9.1f}ms")
+    print("* modules of this project")
+
+    if not os.environ.get('DISPLAY'):
+        print("time to first frame: skipped (needs a display, e.g. xvfb-run)")
+        return
+    workdir = tempfile.mkdtemp()  # no saves: a first start
+    frames = [first_frame(workdir) for _ in range(RUNS)]
+    print(f"time to first frame: median {statistics.median(frames):.1f} ms, "
+          f"best {min(frames):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
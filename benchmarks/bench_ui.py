@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import tkinter as tk
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board_canvas import BoardCanvas
+
+# Needs a display (or Xvfb). Per-cell buttons are skipped above this size
+# because they take minutes to build.
+SIZES = [(30, 16), (100, 100), (300, 300), (1000, 1000)]
+MAX_BUTTON_CELLS = 100 * 100
+
+
+def build_buttons(master, width, height):
+    # The per-cell tk.Button grid GameWindow used before BoardCanvas
+    frame = tk.Frame(master)
+    for y in range(height):
+        for x in range(width):
+            btn = tk.Button(frame, width=2, height=1, command=lambda x=x, y=y: None)
+            btn.grid(row=y, column=x)
+            btn.bind('<Button-3>', lambda e, x=x, y=y: None)
+    frame.pack()
+    return frame
+
+
+def build_canvas(master, width, height):
+    view = BoardCanvas(master, width, height, lambda x, y: ("", None))
+    view.frame.pack()
+    return view.frame
+
+
+def measure(root, build, width, height):
+    # Time to first frame and Python-side memory of one board
+    tracemalloc.start()
+    start = time.perf_counter()
+    frame = build(root, width, height)
+    root.update()
+    elapsed = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    frame.destroy()
+    root.update()
+    return elapsed, memory
+
+
+def main():
+    root = tk.Tk()
+    print(f"{'renderer':<8} {'size':>11} {'startup':>10} {'memory':>12}")
+    for width, height in SIZES:
+        for name, build in (("buttons", build_buttons), ("canvas", build_canvas)):
+            if build is build_buttons and width * height > MAX_BUTTON_CELLS:
+                continue
+            elapsed, memory = measure(root, build, width, height)
+            print(f"{name:<8} {f'{width}x{height}':>11} {elapsed:>9.3f}s {memory / 1024:>10.1f}KB")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoreboard import DIFFICULTIES, ScoreStore
+
+# Many game processes adding scores to one store at the same moment:
+# every score must be there afterwards
+
+
+def write_scores(task):
+    path, worker, count = task
+    store = ScoreStore(path)
+    for n in range(count):
+        store.add(f"p{worker}-{n}", DIFFICULTIES[n % len(DIFFICULTIES)], 30, 16, 99, worker + n / 1000)
+        if n % 10 == 0:
+            store.top(DIFFICULTIES[n % len(DIFFICULTIES)])  # readers run alongside the writers
+    store.close()
+    return worker
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write scores from many processes at once.")
+    parser.add_argument('--processes', type=int, default=16)
+    parser.add_argument('--scores', type=int, default=200, help="scores written by each process")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())  # keep scores.json of the checkout out of the store
+    path = os.path.abspath("stress.db")
+    ScoreStore(path).close()
+    start = time.perf_counter()
+    with Pool(args.processes) as pool:
+        pool.map(write_scores, [(path, worker, args.scores) for worker in range(args.processes)])
+    elapsed = time.perf_counter() - start
+
+    store = ScoreStore(path)
+    expected = args.processes * args.scores
+    with store.connect() as db:
+        names = {row[0] for row in db.execute("SELECT name FROM scores")}
+    missing = expected - len(names)
+    print(f"{args.processes} processes x {args.scores} scores in {elapsed:.2f}s "
+          f"({expected / elapsed:.0f} writes/s)")
+    print(f"stored {store.count()} of {expected}, {missing} missing")
+    print("fastest Hard:", ", ".join(f"{s['name']} {s['duration']:.3f}s" for s in store.top("Hard", 3)))
+    if missing or store.count() != expected:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Game
+from history_index import HistoryIndex, INDEX_FILE, SAVES_DIR
+from save_format import write_binary
+
+# Every case is seeded, so each run does the same work
+SEED = 1
+REPEAT = 7
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+THRESHOLD = 0.25  # a case fails when its best run is this much slower than the baseline
+HISTORY_GAMES = 10000
+
+# (name, setup, repeat). setup() prepares fresh state and returns the
+# callable that is timed; it runs again before every repeat.
+CASES = []
+
+
+def case(name, repeat=REPEAT):
+    def register(setup):
+        CASES.append((name, setup, repeat))
+        return setup
+    return register
+
+
+def placement(width, height, mines, games=1):
+    # Cases under a millisecond repeat their work so noise stays small
+    boards = [Game(width, height, mines, 'packed', seed=SEED + n, persist=False) for n in range(games)]
+
+    def run():
+        for game in boards:
+            game.place_mines(width // 2, height // 2)
+    return run
+
+
+@case("place_mines/hard-x200")
+def place_mines_hard():
+    return placement(30, 16, 99, 200)
+
+
+@case("place_mines/1000x1000")
+def place_mines_large():
+    return placement(1000, 1000, 150000)
+
+
+def cascade(engine):
+    # A sparse board where the first click opens most of it
+    game = Game(300, 300, 4500, engine, seed=SEED, persist=False)
+    game.place_mines(150, 150)
+    game.first_move = False
+    return lambda: game.reveal(150, 150)
+
+
+@case("reveal/cascade-300x300-packed")
+def cascade_packed():
+    return cascade('packed')
+
+
+@case("reveal/cascade-300x300-list")
+def cascade_list():
+    return cascade('list')
+
+
+@case("reveal/chord-300x300")
+def chord():
+    # With every mine flagged, open the board by chording outwards from
+    # the first click until nothing is left
+    game = Game(300, 300, 13500, 'packed', seed=SEED, persist=False)
+    game.reveal(150, 150)
+    for i in game.mine_indices:
+        game.toggle_flag(i % 300, i // 300)
+    numbers = [(i % 300, i // 300) for i in range(300 * 300)
+               if game.cells.is_revealed(i % 300, i // 300) and game.cells.get(i % 300, i // 300) > 0]
+
+    def run():
+        while numbers:
+            for i in game.reveal_adjacent_cells(*numbers.pop()):
+                x, y = i % 300, i // 300
+                if game.cells.get(x, y) > 0:
+                    numbers.append((x, y))
+    return run
+
+
+@case("reveal/auto-chord-300x300")
+def auto_chord():
+    # The same board opened by one auto_chord call
+    game = Game(300, 300, 13500, 'packed', seed=SEED, persist=False)
+    game.reveal(150, 150)
+    for i in game.mine_indices:
+        game.toggle_flag(i % 300, i // 300)
+    return game.auto_chord
+
+
+@case("check_win/100k-calls")
+def check_win():
+    game = Game(30, 16, 99, 'packed', seed=SEED, persist=False)
+    game.reveal(15, 8)
+
+    def run():
+        for _ in range(100000):
+            game.check_win()
+    return run
+
+
+def round_trip(width, height, mines, save_format, times=1):
+    game = Game(width, height, mines, 'packed', seed=SEED)
+    game.save_format = save_format
+    game.reveal(width // 2, height // 2)
+
+    def run():
+        for _ in range(times):
+            game.save_game()
+            Game.load_game()
+    return run
+
+
+@case("save_load/hard-binary-x50")
+def save_load_binary():
+    return round_trip(30, 16, 99, 'binary', 50)
+
+
+@case("save_load/hard-json-x50")
+def save_load_json():
+    return round_trip(30, 16, 99, 'json', 50)
+
+
+@case("save_load/1000x1000-binary", repeat=3)
+def save_load_large():
+    return round_trip(1000, 1000, 150000, 'binary')
+
+
+def synthetic_saves(count=HISTORY_GAMES):
+    # Fill Saves/ with `count` archived games, once per run
+    if len(os.listdir(SAVES_DIR)) >= count:
+        return
+    games = []
+    for width, height, mines in ((9, 9, 10), (16, 16, 40), (30, 16, 99)):
+        game = Game(width, height, mines, 'packed', seed=SEED, persist=False)
+        game.reveal(width // 2, height // 2)
+        games.append(game)
+    start = datetime(2024, 1, 1)
+    for n in range(count):
+        timestamp = (start + timedelta(minutes=n)).strftime("%Y-%m-%d_%H-%M-%S")
+        with open(os.path.join(SAVES_DIR, f"game_{timestamp}.sav"), 'wb') as f:
+            write_binary(f, games[n % len(games)], timestamp)
+
+
+@case("history/rebuild-index-10k", repeat=3)
+def history_rebuild():
+    # Opening history with no index: every save is read once
+    synthetic_saves()
+    for path in (INDEX_FILE, INDEX_FILE + '-wal', INDEX_FILE + '-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+    return lambda: HistoryIndex().games()
+
+
+@case("history/load_game_history-10k")
+def history_list():
+    from history import HistoryWindow
+    synthetic_saves()
+    HistoryIndex()
+    return lambda: HistoryWindow.load_game_history(None)
+
+
+@case("ui/setup_ui-hard")
+def setup_ui():
+    # Needs a display: run under Xvfb (xvfb-run) on headless machines
+    import tkinter as tk
+    from game_window import GameWindow
+    global _root
+    if _root is None:
+        _root = tk.Tk()
+    window = GameWindow.__new__(GameWindow)
+    window.master = _root
+    window.game = Game(30, 16, 99, 'packed', seed=SEED, persist=False)
+
+    def run():
+        window.setup_ui(30, 16)
+        _root.update()
+        window.frame.destroy()
+    return run
+
+
+_root = None
+
+
+def measure(setup, repeat):
+    timings = []
+    for _ in range(repeat):
+        run = setup()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return {'median_s': statistics.median(timings), 'min_s': min(timings), 'runs': repeat}
+
+
+def run_suite(selected=None):
+    # A UI case without a display is skipped; any other error fails its case
+    results = {}
+    for name, setup, repeat in CASES:
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        if name.startswith('ui/') and not os.environ.get('DISPLAY'):
+            results[name] = {'skipped': "no display (DISPLAY is not set)"}
+            continue
+        try:
+            results[name] = measure(setup, repeat)
+        except Exception as e:
+            if name.startswith('ui/') and type(e).__name__ == 'TclError':
+                results[name] = {'skipped': f"TclError: {e}"}
+            else:
+                results[name] = {'failed': f"{type(e).__name__}: {e}"}
+    return results
+
+
+def compare(results, baseline, threshold):
+    # Rows of (name, result, baseline, change) and the regressions. Best
+    # runs are compared, as they are the least disturbed by other load.
+    rows, regressions = [], []
+    for name, result in results.items():
+        before = baseline.get(name, {}).get('min_s')
+        change = None
+        if before and 'min_s' in result:
+            change = result['min_s'] / before - 1
+            if change > threshold:
+                regressions.append(name)
+        rows.append((name, result, before, change))
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare with a baseline.")
+    parser.add_argument('cases', nargs='*', help="only run cases whose name contains one of these")
+    parser.add_argument('--output', metavar='PATH', help="write the results as JSON")
+    parser.add_argument('--baseline', metavar='PATH', default=BASELINE)
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help="allowed slowdown as a fraction (default %(default)s)")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store these results as the new baseline")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.baseline)
+
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)  # Game and the history index write to the working directory
+    os.makedirs(SAVES_DIR, exist_ok=True)
+    try:
+        results = run_suite(args.cases)
+    finally:
+        os.chdir(os.path.dirname(workdir))
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': SEED,
+        'cases': results,
+    }
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(baseline_path) and not args.save_baseline:
+        with open(baseline_path) as f:
+            baseline = json.load(f)['cases']
+    rows, regressions = compare(results, baseline, args.threshold)
+
+    print(f"{'case':<34} {'median':>10} {'min':>10} {'base min':>10} {'change':>8}")
+    for name, result, before, change in rows:
+        if 'skipped' in result:
+            print(f"{name:<34} skipped ({result['skipped']})")
+            continue
+        if 'failed' in result:
+            print(f"{name:<34} FAILED ({result['failed']})")
+            continue
+        print(f"{name:<34} {result['median_s'] * 1000:>8.2f}ms {result['min_s'] * 1000:>8.2f}ms "
+              f"{f'{before * 1000:.2f}ms' if before else '-':>10} "
+              f"{f'{change:+.0%}' if change is not None else '-':>8}"
+              f"{'  REGRESSION' if name in regressions else ''}")
+
+    failures = [name for name, result in results.items() if 'failed' in result]
+    if failures:
+        print(f"{len(failures)} case(s) failed")
+        sys.exit(1)
+    if args.save_baseline:
+        with open(baseline_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+    elif regressions:
+        print(f"{len(regressions)} case(s) more than {args.threshold:.0%} slower than the baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,727 @@
+import random
+from array import array
+from itertools import chain
+from typing import List, Tuple
+
+# Cell byte layout used by PackedBoard
+COUNT_MASK = 0x0F
+MINE_BIT = 0x10
+REVEALED_BIT = 0x20
+FLAG_BIT = 0x40
+BORDER_BIT = 0x80
+
+# Side of the square tiles used by ChunkedBoard
+TILE_SIZE = 64
+
+
+class ListBoard:
+    # Original layout: one list of lists per kind of cell state
+    lazy_mines = False
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.board = [[0 for _ in range(width)] for _ in range(height)]
+        self.revealed = [[False for _ in range(width)] for _ in range(height)]
+        self.flagged = [[False for _ in range(width)] for _ in range(height)]
+
+    def get(self, x: int, y: int) -> int:
+        return self.board[y][x]
+
+    def is_revealed(self, x: int, y: int) -> bool:
+        return self.revealed[y][x]
+
+    def is_flagged(self, x: int, y: int) -> bool:
+        return self.flagged[y][x]
+
+    def set_revealed(self, x: int, y: int):
+        self.revealed[y][x] = True
+
+    def set_flagged(self, x: int, y: int, flagged: bool):
+        self.flagged[y][x] = flagged
+
+    def neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        # Get all valid adjacent positions for a given cell
+        adjacent = []
+        for dx in [-1, 0, 1]:
+            for dy in [-1, 0, 1]:
+                if dx == 0 and dy == 0:
+                    continue
+                new_x, new_y = x + dx, y + dy
+                if 0 <= new_x < self.width and 0 <= new_y < self.height:
+                    adjacent.append((new_x, new_y))
+        return adjacent
+
+    def flood(self, x: int, y: int, opened: array):
+        # Open (x, y) and, if it is empty, the whole zero region around it.
+        # Cells are marked when pushed, so each one is visited once.
+        board, revealed, flagged = self.board, self.revealed, self.flagged
+        width, height = self.width, self.height
+        revealed[y][x] = True
+        opened.append(y * width + x)
+        if board[y][x] != 0:
+            return
+        stack = [y * width + x]
+        while stack:
+            cy, cx = divmod(stack.pop(), width)
+            x0, x1 = max(cx - 1, 0), min(cx + 2, width)
+            for ny in range(max(cy - 1, 0), min(cy + 2, height)):
+                row_revealed, row_flagged, row_board = revealed[ny], flagged[ny], board[ny]
+                for nx in range(x0, x1):
+                    if row_revealed[nx] or row_flagged[nx]:
+                        continue
+                    row_revealed[nx] = True
+                    opened.append(ny * width + nx)
+                    if row_board[nx] == 0:
+                        stack.append(ny * width + nx)
+
+    def lay_mines(self, mines):
+        # Place mines (flat indices) and compute every count in one pass
+        width = self.width
+        stride = width + 2
+        mask = bytearray(stride * (self.height + 2))
+        for i in mines:
+            mask[(i // width + 1) * stride + i % width + 1] = 1
+        self._count_from_mask(mask)
+
+    def _count_from_mask(self, mask: bytearray):
+        # Rebuild board values from a padded 0/1 mine mask
+        width = self.width
+        stride = width + 2
+        counts = neighbor_counts(mask, _offsets(stride)).to_bytes(len(mask), 'little')
+        self.board = []
+        for y in range(self.height):
+            start = (y + 1) * stride + 1
+            row = list(counts[start:start + width])
+            x = mask.find(1, start, start + width)
+            while x != -1:
+                row[x - start] = -1
+                x = mask.find(1, x + 1, start + width)
+            self.board.append(row)
+
+    def tally(self) -> Tuple[int, int, int]:
+        # Full scan: (revealed cells, flags, revealed safe cells)
+        revealed = flagged = safe = 0
+        for row_board, row_revealed, row_flagged in zip(self.board, self.revealed, self.flagged):
+            for value, is_revealed, is_flagged in zip(row_board, row_revealed, row_flagged):
+                if is_revealed:
+                    revealed += 1
+                    if value != -1:
+                        safe += 1
+                if is_flagged:
+                    flagged += 1
+        return revealed, flagged, safe
+
+    def load(self, board, revealed, flagged):
+        self.board = board
+        self.revealed = revealed
+        self.flagged = flagged
+
+    def to_lists(self):
+        return self.board, self.revealed, self.flagged
+
+    def copy(self):
+        other = ListBoard.__new__(ListBoard)
+        other.width, other.height = self.width, self.height
+        other.board = [row[:] for row in self.board]
+        other.revealed = [row[:] for row in self.revealed]
+        other.flagged = [row[:] for row in self.flagged]
+        return other
+
+    def flag_indices(self) -> List[int]:
+        # Flat indices of the flagged cells
+        return _ones(bytes(chain.from_iterable(self.flagged)))
+
+    def to_planes(self) -> Tuple[bytes, bytes, bytes]:
+        # Row-major 0/1 bytes per cell: (mines, revealed, flagged)
+        return (bytes(value == -1 for row in self.board for value in row),
+                bytes(chain.from_iterable(self.revealed)),
+                bytes(chain.from_iterable(self.flagged)))
+
+    def load_planes(self, mines: bytes, revealed: bytes, flagged: bytes):
+        width = self.width
+        self._count_from_mask(_pad(mines, width, self.height))
+        self.revealed = [list(map(bool, revealed[y * width:(y + 1) * width]))
+                         for y in range(self.height)]
+        self.flagged = [list(map(bool, flagged[y * width:(y + 1) * width]))
+                        for y in range(self.height)]
+
+
+class PackedBoard:
+    # One byte per cell in a flat bytearray. The grid is padded with a
+    # one-cell border so every cell shares the same eight neighbor offsets.
+    lazy_mines = False
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.stride = stride = width + 2
+        self.cells = bytearray(stride * (height + 2))
+        self.offsets = _offsets(stride)
+
+        # Mark the padding so neighbor walks never leave the grid
+        end = stride * (height + 1)
+        self.cells[:stride] = bytes([BORDER_BIT]) * stride
+        self.cells[end:] = bytes([BORDER_BIT]) * stride
+        self.cells[stride:end:stride] = bytes([BORDER_BIT]) * height
+        self.cells[2 * stride - 1:end:stride] = bytes([BORDER_BIT]) * height
+
+        self.board = _PackedGrid(self, _decode_value, _encode_value)
+        self.revealed = _PackedGrid(self, _bit_reader(REVEALED_BIT), _bit_writer(REVEALED_BIT))
+        self.flagged = _PackedGrid(self, _bit_reader(FLAG_BIT), _bit_writer(FLAG_BIT))
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * self.stride + x + 1
+
+    def position(self, i: int) -> Tuple[int, int]:
+        y, x = divmod(i, self.stride)
+        return x - 1, y - 1
+
+    def get(self, x: int, y: int) -> int:
+        return _decode_value(self.cells[(y + 1) * self.stride + x + 1])
+
+    def is_revealed(self, x: int, y: int) -> bool:
+        return bool(self.cells[(y + 1) * self.stride + x + 1] & REVEALED_BIT)
+
+    def is_flagged(self, x: int, y: int) -> bool:
+        return bool(self.cells[(y + 1) * self.stride + x + 1] & FLAG_BIT)
+
+    def set_revealed(self, x: int, y: int):
+        self.cells[(y + 1) * self.stride + x + 1] |= REVEALED_BIT
+
+    def set_flagged(self, x: int, y: int, flagged: bool):
+        i = (y + 1) * self.stride + x + 1
+        if flagged:
+            self.cells[i] |= FLAG_BIT
+        else:
+            self.cells[i] &= ~FLAG_BIT & 0xFF
+
+    def neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        # Walk the shared offset table and skip the padding
+        i = (y + 1) * self.stride + x + 1
+        cells = self.cells
+        return [self.position(i + o) for o in self.offsets
+                if not cells[i + o] & BORDER_BIT]
+
+    def flood(self, x: int, y: int, opened: array):
+        # Open (x, y) and, if it is empty, the whole zero region around it.
+        # Padding, flags and revealed cells share one mask test, and cells
+        # are marked when pushed, so each one is visited once.
+        cells = self.cells
+        offsets = self.offsets
+        stride = self.stride
+        to_flat = self.width + 1
+        i = (y + 1) * stride + x + 1
+        cells[i] |= REVEALED_BIT
+        opened.append(y * self.width + x)
+        if cells[i] & (COUNT_MASK | MINE_BIT):
+            return
+        stop = REVEALED_BIT | FLAG_BIT | BORDER_BIT
+        stack = [i]
+        pop, push, record = stack.pop, stack.append, opened.append
+        while stack:
+            i = pop()
+            for o in offsets:
+                j = i + o
+                c = cells[j]
+                if c & stop:
+                    continue
+                cells[j] = c | REVEALED_BIT
+                record(j - 2 * (j // stride) - to_flat)
+                if not c & COUNT_MASK:
+                    push(j)
+
+    def lay_mines(self, mines):
+        # Place mines (flat indices) on a fresh board. Mine bits and every
+        # count nibble are added to the whole buffer at once; mines keep a
+        # count too, but it is masked out when the value is read.
+        cells = self.cells
+        width = self.width
+        stride = self.stride
+        mask = bytearray(len(cells))
+        for i in mines:
+            mask[(i // width + 1) * stride + i % width + 1] = 1
+        self._add_counts(int.from_bytes(cells, 'little') + (int.from_bytes(mask, 'little') << 4),
+                         mask)
+
+    def _add_counts(self, state: int, mask: bytearray):
+        # Store `state` (one byte lane per padded cell) plus the neighbor
+        # counts of `mask`, leaving the padding as bare border cells
+        cells = self.cells
+        keep = int.from_bytes(cells.translate(_KEEP_TABLE), 'little')
+        counts = neighbor_counts(mask, self.offsets)
+        cells[:] = ((state + counts) & keep).to_bytes(len(cells), 'little')
+
+    def tally(self) -> Tuple[int, int, int]:
+        # Full scan: (revealed cells, flags, revealed safe cells), counted in
+        # C by mapping each byte to 1 or 0 with a translation table
+        return (self.cells.translate(_REVEALED_TABLE).count(1),
+                self.cells.translate(_FLAGGED_TABLE).count(1),
+                self.cells.translate(_SAFE_REVEALED_TABLE).count(1))
+
+    def load(self, board, revealed, flagged):
+        for y in range(self.height):
+            base = (y + 1) * self.stride + 1
+            for x in range(self.width):
+                value = _encode_value(0, board[y][x])
+                if revealed[y][x]:
+                    value |= REVEALED_BIT
+                if flagged[y][x]:
+                    value |= FLAG_BIT
+                self.cells[base + x] = value
+
+    def to_lists(self):
+        return ([list(row) for row in self.board],
+                [list(row) for row in self.revealed],
+                [list(row) for row in self.flagged])
+
+    def copy(self):
+        other = PackedBoard(self.width, self.height)
+        other.cells[:] = self.cells
+        return other
+
+    def flag_indices(self) -> List[int]:
+        # Flat indices of the flagged cells
+        return _ones(self.to_planes()[2])
+
+    def interior(self) -> bytes:
+        # Row-major cell bytes without the border
+        stride, width = self.stride, self.width
+        return b''.join(self.cells[(y + 1) * stride + 1:(y + 1) * stride + 1 + width]
+                        for y in range(self.height))
+
+    def to_planes(self) -> Tuple[bytes, bytes, bytes]:
+        # Row-major 0/1 bytes per cell: (mines, revealed, flagged)
+        interior = self.interior()
+        return (interior.translate(_MINE_PLANE),
+                interior.translate(_REVEALED_PLANE),
+                interior.translate(_FLAG_PLANE))
+
+    def load_planes(self, mines: bytes, revealed: bytes, flagged: bytes):
+        # Combine the planes into cell bytes with big-integer lane shifts
+        state = ((int.from_bytes(mines, 'little') << 4)
+                 | (int.from_bytes(revealed, 'little') << 5)
+                 | (int.from_bytes(flagged, 'little') << 6))
+        state = state.to_bytes(self.width * self.height, 'little')
+        padded = _pad(state, self.width, self.height)
+        self._add_counts(int.from_bytes(self.cells, 'little') + int.from_bytes(padded, 'little'),
+                         _pad(mines, self.width, self.height))
+
+
+class ChunkedBoard:
+    # Cells live in TILE_SIZE x TILE_SIZE tiles, each a bytearray in
+    # PackedBoard's cell byte layout, created the first time one of its
+    # cells is read or changed. Mines are not laid up front: each tile draws
+    # its own from a hash of the game seed and its position, so memory and
+    # time grow with the explored area and not with the board.
+    lazy_mines = True
+
+    def __init__(self, width: int, height: int, tile_size: int = TILE_SIZE):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.tiles_x = -(-width // tile_size)
+        self.tiles_y = -(-height // tile_size)
+        self.tiles = {}  # (tx, ty) -> cell bytes
+        self.mine_masks = {}  # (tx, ty) -> 0/1 byte per cell, also for untouched tiles
+
+        # Set by seed_mines on the first click
+        self.seed = None
+        self.mines = 0
+        self.first_click = None
+        self.safe_zone = frozenset()
+        self.quotas = {}  # (tx, ty) -> mines, where the proportional share does not fit
+
+        self.board = _CellGrid(self.get)
+        self.revealed = _CellGrid(self.is_revealed)
+        self.flagged = _CellGrid(self.is_flagged)
+
+    def seed_mines(self, seed: int, mines: int, first_x: int, first_y: int):
+        # Fix the mine layout: `mines` in total, none on the first click or
+        # its neighbors. Tiles created before this (flags placed before the
+        # first click) get their mines and counts now.
+        width, height = self.width, self.height
+        self.safe_zone = frozenset((nx, ny)
+                                   for ny in range(max(first_y - 1, 0), min(first_y + 2, height))
+                                   for nx in range(max(first_x - 1, 0), min(first_x + 2, width)))
+        if not 0 <= mines <= width * height - len(self.safe_zone):
+            raise ValueError(f"Cannot place {mines} mines on a {width}x{height} board")
+        self.seed = seed
+        self.mines = mines
+        self.first_click = (first_x, first_y)
+        self.mine_masks.clear()
+        self.spread_excess()
+
+        for (tx, ty), tile in self.tiles.items():
+            self.fill_tile(tx, ty, tile)
+
+    def tile_extent(self, tx: int, ty: int) -> Tuple[int, int]:
+        # Width and height of the board inside a tile
+        return (min(self.tile_size, self.width - tx * self.tile_size),
+                min(self.tile_size, self.height - ty * self.tile_size))
+
+    def spread_excess(self):
+        # Only tiles holding the safe zone can have fewer free cells than
+        # their proportional share. Their excess goes to the tiles after
+        # them in row-major order (wrapping around) that have room left;
+        # every other tile keeps its share, and with it its layout.
+        tile_size = self.tile_size
+        self.quotas = {}
+        safe = {}
+        for x, y in self.safe_zone:
+            key = (x // tile_size, y // tile_size)
+            safe[key] = safe.get(key, 0) + 1
+
+        def room(tx, ty):
+            tile_width, tile_height = self.tile_extent(tx, ty)
+            return tile_width * tile_height - safe.get((tx, ty), 0) - self.tile_mines(tx, ty)
+
+        tile_count = self.tiles_x * self.tiles_y
+        for tx, ty in sorted(safe, key=lambda key: (key[1], key[0])):
+            excess = -room(tx, ty)
+            if excess <= 0:
+                continue
+            self.quotas[(tx, ty)] = self.tile_mines(tx, ty) - excess
+            n = ty * self.tiles_x + tx
+            while excess:
+                n = (n + 1) % tile_count
+                other = (n % self.tiles_x, n // self.tiles_x)
+                moved = min(excess, max(room(*other), 0))
+                if moved:
+                    self.quotas[other] = self.tile_mines(*other) + moved
+                    excess -= moved
+
+    def tile_mines(self, tx: int, ty: int) -> int:
+        # The mines of a tile, so that tiles in row-major order split the
+        # total in proportion to their cells and add up to it exactly
+        quota = self.quotas.get((tx, ty))
+        if quota is not None:
+            return quota
+        width, height, tile_size = self.width, self.height, self.tile_size
+        tile_width, tile_height = self.tile_extent(tx, ty)
+        before = min(ty * tile_size, height) * width + tile_height * min(tx * tile_size, width)
+        total = width * height
+        return (self.mines * (before + tile_width * tile_height) // total
+                - self.mines * before // total)
+
+    def mine_mask(self, tx: int, ty: int) -> bytes:
+        # The tile's mines as a 0/1 byte per cell, drawn from a generator
+        # seeded with the game seed and the tile position
+        key = (tx, ty)
+        mask = self.mine_masks.get(key)
+        if mask is not None:
+            return mask
+        tile_size = self.tile_size
+        tile_width, tile_height = self.tile_extent(tx, ty)
+        x0, y0 = tx * tile_size, ty * tile_size
+        rng = random.Random(f"{self.seed}:{tx}:{ty}")
+        positions = range(tile_width * tile_height)
+        if any(x // tile_size == tx and y // tile_size == ty for x, y in self.safe_zone):
+            positions = [p for p in positions
+                         if (x0 + p % tile_width, y0 + p // tile_width) not in self.safe_zone]
+        mask = bytearray(tile_size * tile_size)
+        for p in rng.sample(positions, self.tile_mines(tx, ty)):
+            mask[(p // tile_width) * tile_size + p % tile_width] = 1
+        mask = self.mine_masks[key] = bytes(mask)
+        return mask
+
+    def fill_tile(self, tx: int, ty: int, tile: bytearray):
+        # Add mine bits and neighbor counts to a tile. Counts come from the
+        # tile's mines and the edge rows and columns of the tiles around it,
+        # copied into a grid padded by one cell.
+        tile_size = self.tile_size
+        stride = tile_size + 2
+        padded = bytearray(stride * stride)
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if not (0 <= tx + dx < self.tiles_x and 0 <= ty + dy < self.tiles_y):
+                    continue
+                mask = self.mine_mask(tx + dx, ty + dy)
+                rows = range(tile_size) if dy == 0 else (tile_size - 1,) if dy < 0 else (0,)
+                first, last = (0, tile_size) if dx == 0 else (tile_size - 1, tile_size) if dx < 0 else (0, 1)
+                for row in rows:
+                    start = (row + 1 + dy * tile_size) * stride + first + 1 + dx * tile_size
+                    padded[start:start + last - first] = mask[row * tile_size + first:row * tile_size + last]
+        counts = neighbor_counts(padded, _offsets(stride)).to_bytes(len(padded), 'little')
+        counts = b''.join(counts[(row + 1) * stride + 1:(row + 1) * stride + 1 + tile_size]
+                          for row in range(tile_size))
+        state = (int.from_bytes(tile, 'little') + int.from_bytes(counts, 'little')
+                 + (int.from_bytes(self.mine_mask(tx, ty), 'little') << 4))
+        tile[:] = state.to_bytes(len(tile), 'little')
+
+    def tile(self, tx: int, ty: int) -> bytearray:
+        tile = self.tiles.get((tx, ty))
+        if tile is None:
+            tile = self.tiles[(tx, ty)] = bytearray(self.tile_size * self.tile_size)
+            if self.seed is not None:
+                self.fill_tile(tx, ty, tile)
+        return tile
+
+    def cell(self, x: int, y: int) -> int:
+        # Cell byte without creating its tile; untouched cells are hidden
+        tile_size = self.tile_size
+        tile = self.tiles.get((x // tile_size, y // tile_size))
+        return tile[(y % tile_size) * tile_size + x % tile_size] if tile is not None else 0
+
+    def get(self, x: int, y: int) -> int:
+        tile_size = self.tile_size
+        return _decode_value(self.tile(x // tile_size, y // tile_size)[(y % tile_size) * tile_size + x % tile_size])
+
+    def is_revealed(self, x: int, y: int) -> bool:
+        return bool(self.cell(x, y) & REVEALED_BIT)
+
+    def is_flagged(self, x: int, y: int) -> bool:
+        return bool(self.cell(x, y) & FLAG_BIT)
+
+    def set_revealed(self, x: int, y: int):
+        tile_size = self.tile_size
+        self.tile(x // tile_size, y // tile_size)[(y % tile_size) * tile_size + x % tile_size] |= REVEALED_BIT
+
+    def set_flagged(self, x: int, y: int, flagged: bool):
+        tile_size = self.tile_size
+        tile = self.tile(x // tile_size, y // tile_size)
+        j = (y % tile_size) * tile_size + x % tile_size
+        if flagged:
+            tile[j] |= FLAG_BIT
+        else:
+            tile[j] &= ~FLAG_BIT & 0xFF
+
+    def neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        return [(nx, ny)
+                for nx in range(max(x - 1, 0), min(x + 2, self.width))
+                for ny in range(max(y - 1, 0), min(y + 2, self.height))
+                if nx != x or ny != y]
+
+    def flood(self, x: int, y: int, opened: array):
+        # Open (x, y) and, if it is empty, the whole zero region around it,
+        # crossing tile edges. The tile of the previous cell is kept, as
+        # neighbors nearly always share it.
+        width, height, tile_size = self.width, self.height, self.tile_size
+        self.set_revealed(x, y)
+        opened.append(y * width + x)
+        if self.get(x, y) != 0:
+            return
+        stop = REVEALED_BIT | FLAG_BIT
+        stack = [(x, y)]
+        key, tile = None, None
+        while stack:
+            cx, cy = stack.pop()
+            for ny in range(max(cy - 1, 0), min(cy + 2, height)):
+                for nx in range(max(cx - 1, 0), min(cx + 2, width)):
+                    if key != (nx // tile_size, ny // tile_size):
+                        key = (nx // tile_size, ny // tile_size)
+                        tile = self.tile(*key)
+                    j = (ny % tile_size) * tile_size + nx % tile_size
+                    c = tile[j]
+                    if c & stop:
+                        continue
+                    tile[j] = c | REVEALED_BIT
+                    opened.append(ny * width + nx)
+                    if not c & COUNT_MASK:
+                        stack.append((nx, ny))
+
+    def known_mines(self) -> List[int]:
+        # Flat indices of the mines in tiles created so far
+        if self.seed is None:
+            return []
+        return sorted(self.tile_to_flat(tx, ty, j)
+                      for tx, ty in self.tiles for j in _ones(self.mine_mask(tx, ty)))
+
+    def flag_indices(self) -> List[int]:
+        # Flat indices of the flagged cells
+        return [self.tile_to_flat(tx, ty, j)
+                for (tx, ty), tile in self.tiles.items() for j in _ones(tile.translate(_FLAG_PLANE))]
+
+    def tile_to_flat(self, tx: int, ty: int, j: int) -> int:
+        # Flat board index of cell j of a tile
+        tile_size = self.tile_size
+        return (ty * tile_size + j // tile_size) * self.width + tx * tile_size + j % tile_size
+
+    def tally(self) -> Tuple[int, int, int]:
+        # (revealed cells, flags, revealed safe cells) over created tiles
+        revealed = flagged = safe = 0
+        for tile in self.tiles.values():
+            revealed += tile.translate(_REVEALED_TABLE).count(1)
+            flagged += tile.translate(_FLAGGED_TABLE).count(1)
+            safe += tile.translate(_SAFE_REVEALED_TABLE).count(1)
+        return revealed, flagged, safe
+
+    def touched_tiles(self):
+        # (tx, ty, revealed plane, flag plane) of every tile with a revealed
+        # or flagged cell, the planes as 0/1 bytes per tile cell
+        for (tx, ty), tile in sorted(self.tiles.items()):
+            revealed = tile.translate(_REVEALED_PLANE)
+            flagged = tile.translate(_FLAG_PLANE)
+            if revealed.count(1) or flagged.count(1):
+                yield tx, ty, revealed, flagged
+
+    def load_tiles(self, tiles):
+        # Restore tiles from touched_tiles() output, after seed_mines
+        for tx, ty, revealed, flagged in tiles:
+            tile = self.tile(tx, ty)
+            state = (int.from_bytes(tile, 'little') + (int.from_bytes(revealed, 'little') << 5)
+                     + (int.from_bytes(flagged, 'little') << 6))
+            tile[:] = state.to_bytes(len(tile), 'little')
+
+    def copy(self):
+        other = ChunkedBoard(self.width, self.height, self.tile_size)
+        other.seed, other.mines = self.seed, self.mines
+        other.first_click, other.safe_zone = self.first_click, self.safe_zone
+        other.quotas = dict(self.quotas)
+        other.mine_masks = dict(self.mine_masks)
+        other.tiles = {key: bytearray(tile) for key, tile in self.tiles.items()}
+        return other
+
+    def memory(self) -> int:
+        # Bytes held in tiles and mine masks
+        cells = self.tile_size * self.tile_size
+        return (len(self.tiles) + len(self.mine_masks)) * cells
+
+
+def _ones(plane: bytes) -> List[int]:
+    # Positions of the 1 bytes of a 0/1 plane
+    found = []
+    j = plane.find(1)
+    while j != -1:
+        found.append(j)
+        j = plane.find(1, j + 1)
+    return found
+
+
+def _offsets(stride: int) -> Tuple[int, ...]:
+    # Flat offsets of the eight neighbors in a grid padded to `stride`
+    return (-stride - 1, -stride, -stride + 1, -1, 1, stride - 1, stride, stride + 1)
+
+
+def neighbor_counts(mask: bytearray, offsets) -> int:
+    # Sum eight shifted copies of a padded 0/1 mine mask in one pass. Each
+    # byte is a lane of one big integer; counts never exceed 8, so lanes do
+    # not carry into each other. The padding keeps rows from wrapping.
+    size = len(mask)
+    grid = int.from_bytes(mask, 'little')
+    total = 0
+    for o in offsets:
+        total += grid >> (8 * o) if o > 0 else grid << (-8 * o)
+    return total & ((1 << (8 * size)) - 1)
+
+
+def _pad(plane: bytes, width: int, height: int) -> bytearray:
+    # Copy row-major cells into a grid with a one-cell border
+    stride = width + 2
+    padded = bytearray(stride * (height + 2))
+    for y in range(height):
+        start = (y + 1) * stride + 1
+        padded[start:start + width] = plane[y * width:(y + 1) * width]
+    return padded
+
+
+def _count_table(mask: int, want: int) -> bytes:
+    return bytes(1 if c & mask == want else 0 for c in range(256))
+
+
+_REVEALED_TABLE = _count_table(REVEALED_BIT | BORDER_BIT, REVEALED_BIT)
+_FLAGGED_TABLE = _count_table(FLAG_BIT | BORDER_BIT, FLAG_BIT)
+_SAFE_REVEALED_TABLE = _count_table(REVEALED_BIT | MINE_BIT | BORDER_BIT, REVEALED_BIT)
+_MINE_PLANE = _count_table(MINE_BIT, MINE_BIT)
+_REVEALED_PLANE = _count_table(REVEALED_BIT, REVEALED_BIT)
+_FLAG_PLANE = _count_table(FLAG_BIT, FLAG_BIT)
+
+# Clears everything but the border bit on padding cells
+_KEEP_TABLE = bytes(BORDER_BIT if c & BORDER_BIT else 0xFF for c in range(256))
+
+
+def _decode_value(cell: int) -> int:
+    return -1 if cell & MINE_BIT else cell & COUNT_MASK
+
+
+def _encode_value(cell: int, value: int) -> int:
+    if value == -1:
+        return cell | MINE_BIT
+    return (cell & ~(MINE_BIT | COUNT_MASK)) | value
+
+
+def _bit_reader(bit):
+    return lambda cell: bool(cell & bit)
+
+
+def _bit_writer(bit):
+    return lambda cell, value: cell | bit if value else cell & ~bit
+
+
+class _CellGrid:
+    # Read-only [y][x] view that calls read(x, y) per cell
+    def __init__(self, read):
+        self.read = read
+
+    def __getitem__(self, y):
+        return _CellRow(self.read, y)
+
+
+class _CellRow:
+    def __init__(self, read, y):
+        self.read = read
+        self.y = y
+
+    def __getitem__(self, x):
+        return self.read(x, self.y)
+
+
+class _PackedGrid:
+    # Read/write [y][x] view over one field of a PackedBoard, so callers that
+    # index game.board, game.revealed or game.flagged keep working
+    def __init__(self, packed, decode, encode):
+        self.packed = packed
+        self.decode = decode
+        self.encode = encode
+
+    def __len__(self):
+        return self.packed.height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.packed.height:
+            raise IndexError(y)
+        return _PackedRow(self, (y + 1) * self.packed.stride + 1)
+
+    def __iter__(self):
+        for y in range(self.packed.height):
+            yield self[y]
+
+
+class _PackedRow:
+    def __init__(self, grid, base):
+        self.grid = grid
+        self.base = base
+
+    def __len__(self):
+        return self.grid.packed.width
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.grid.packed.width:
+            raise IndexError(x)
+        return self.grid.decode(self.grid.packed.cells[self.base + x])
+
+    def __setitem__(self, x, value):
+        if not 0 <= x < self.grid.packed.width:
+            raise IndexError(x)
+        cells = self.grid.packed.cells
+        cells[self.base + x] = self.grid.encode(cells[self.base + x], value) & 0xFF
+
+    def __iter__(self):
+        cells = self.grid.packed.cells
+        decode = self.grid.decode
+        for i in range(self.base, self.base + self.grid.packed.width):
+            yield decode(cells[i])
+
+
+BOARD_ENGINES = {
+    'list': ListBoard,
+    'packed': PackedBoard,
+    'chunked': ChunkedBoard,
+}
+
+
+def make_board(engine: str, width: int, height: int):
+    # Build the cell storage for the requested engine
+    if engine not in BOARD_ENGINES:
+        raise ValueError(f"Unknown board engine: {engine}")
+    return BOARD_ENGINES[engine](width, height)
@@ -0,0 +1,119 @@
+import tkinter as tk
+
+CELL_SIZE = 24
+HIDDEN_FILL = "#d9d9d9"
+MAX_VIEW_WIDTH = 720
+MAX_VIEW_HEIGHT = 480
+
+
+class BoardCanvas:
+    # Draws a board on a single tk.Canvas. Only cells inside the visible
+    # viewport own canvas items; scrolling creates and deletes them.
+    def __init__(self, master, width, height, describe, on_left=None, on_right=None):
+        self.width = width
+        self.height = height
+        self.describe = describe  # describe(x, y) -> (text, fill)
+        self.on_left = on_left
+        self.on_right = on_right
+        self.items = {}
+        self.view = (0, 0, 0, 0)
+
+        self.frame = tk.Frame(master)
+        board_width = width * CELL_SIZE
+        board_height = height * CELL_SIZE
+        self.view_width = min(board_width, MAX_VIEW_WIDTH)
+        self.view_height = min(board_height, MAX_VIEW_HEIGHT)
+        self.canvas = tk.Canvas(self.frame, width=self.view_width, height=self.view_height,
+                                highlightthickness=0, borderwidth=0,
+                                scrollregion=(0, 0, board_width, board_height),
+                                xscrollincrement=CELL_SIZE, yscrollincrement=CELL_SIZE)
+        self.canvas.grid(row=0, column=0)
+
+        # Scrollbars only for boards larger than the viewport
+        if board_width > self.view_width:
+            xscroll = tk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.canvas.xview)
+            xscroll.grid(row=1, column=0, sticky="ew")
+            self.canvas.configure(xscrollcommand=lambda *args: self.on_scroll(xscroll, args))
+        if board_height > self.view_height:
+            yscroll = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.canvas.yview)
+            yscroll.grid(row=0, column=1, sticky="ns")
+            self.canvas.configure(yscrollcommand=lambda *args: self.on_scroll(yscroll, args))
+
+        self.canvas.bind('<Button-1>', lambda e: self.click(e, self.on_left))
+        self.canvas.bind('<Button-3>', lambda e: self.click(e, self.on_right))
+        self.canvas.bind('<MouseWheel>', lambda e: self.scroll(e, -1 if e.delta > 0 else 1))
+        self.canvas.bind('<Button-4>', lambda e: self.scroll(e, -1))
+        self.canvas.bind('<Button-5>', lambda e: self.scroll(e, 1))
+
+        self.refresh_view()
+
+    def cell_at(self, event):
+        # Map a pixel position to the cell under it
+        x = int(self.canvas.canvasx(event.x)) // CELL_SIZE
+        y = int(self.canvas.canvasy(event.y)) // CELL_SIZE
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return x, y
+        return None
+
+    def click(self, event, handler):
+        cell = self.cell_at(event)
+        if handler and cell:
+            handler(*cell)
+
+    def scroll(self, event, step):
+        # Mouse wheel scrolls vertically, Shift + wheel horizontally
+        if event.state & 0x1:
+            self.canvas.xview_scroll(step, "units")
+        else:
+            self.canvas.yview_scroll(step, "units")
+
+    def on_scroll(self, scrollbar, args):
+        scrollbar.set(*args)
+        self.refresh_view()
+
+    def refresh_view(self):
+        # Create items for cells that scrolled into view, drop the rest
+        left = int(self.canvas.canvasx(0))
+        top = int(self.canvas.canvasy(0))
+        x0 = max(left // CELL_SIZE, 0)
+        y0 = max(top // CELL_SIZE, 0)
+        x1 = min((left + self.view_width) // CELL_SIZE + 1, self.width)
+        y1 = min((top + self.view_height) // CELL_SIZE + 1, self.height)
+        if (x0, y0, x1, y1) == self.view:
+            return
+        self.view = (x0, y0, x1, y1)
+
+        width = self.width
+        for i in [i for i in self.items
+                  if not (x0 <= i % width < x1 and y0 <= i // width < y1)]:
+            self.canvas.delete(*self.items.pop(i))
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                if y * width + x not in self.items:
+                    self.draw_cell(x, y)
+
+    def draw_cell(self, x, y):
+        text, fill = self.describe(x, y)
+        left, top = x * CELL_SIZE, y * CELL_SIZE
+        rect = self.canvas.create_rectangle(left, top, left + CELL_SIZE, top + CELL_SIZE,
+                                            fill=fill or HIDDEN_FILL, outline="gray50")
+        label = self.canvas.create_text(left + CELL_SIZE // 2, top + CELL_SIZE // 2, text=text)
+        self.items[y * self.width + x] = (rect, label)
+
+    def redraw_cell(self, x, y):
+        # Repaint one cell; cells out of view are drawn when scrolled to
+        items = self.items.get(y * self.width + x)
+        if items:
+            text, fill = self.describe(x, y)
+            self.canvas.itemconfigure(items[0], fill=fill or HIDDEN_FILL)
+            self.canvas.itemconfigure(items[1], text=text)
+            return True
+        return False
+
+    def redraw_all(self):
+        # Repaint every visible cell
+        width = self.width
+        for i in self.items:
+            y, x = divmod(i, width)
+            self.redraw_cell(x, y)
+        return len(self.items)
@@ -0,0 +1,68 @@
+import logging
+import queue
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class EngineWorker:
+    # Runs commands on a game from a worker thread, one at a time and in the
+    # order they were submitted, so a long cascade never blocks the Tk
+    # thread. The game's events are emitted on the worker and queued; the
+    # UI thread collects them with drain(). Tk must not be called from the
+    # worker.
+    def __init__(self, game):
+        self.game = game
+        self.commands = queue.Queue()
+        self.events = deque()
+        self.lock = threading.Lock()
+        self.pending = 0  # commands submitted and not finished
+        game.subscribe(self.events.append)
+        self.thread = threading.Thread(target=self.run, name="game-engine", daemon=True)
+        self.thread.start()
+
+    def submit(self, function, *args):
+        # Queue `function(*args)`
+        with self.lock:
+            self.pending += 1
+        self.commands.put((function, args, False))
+
+    def move(self, function, *args):
+        # Queue a player move. Moves still waiting when the game ends are
+        # dropped, as clicks on a finished game would have been.
+        with self.lock:
+            self.pending += 1
+        self.commands.put((function, args, True))
+
+    def run(self):
+        while True:
+            command = self.commands.get()
+            if command is None:
+                return
+            function, args, is_move = command
+            try:
+                if not is_move or self.game.status == 'playing':
+                    function(*args)
+            except Exception:
+                logger.exception("Game command %s%s failed", function.__name__, args)
+            finally:
+                with self.lock:
+                    self.pending -= 1
+
+    def drain(self) -> list:
+        # Event lists emitted since the last call, oldest first
+        batches = []
+        while self.events:
+            batches.append(self.events.popleft())
+        return batches
+
+    @property
+    def busy(self) -> bool:
+        with self.lock:
+            return self.pending > 0
+
+    def close(self):
+        # Run what is queued, then stop the worker
+        self.commands.put(None)
+        self.thread.join()
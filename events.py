@@ -0,0 +1,72 @@
+from array import array
+
+# Events a Game delivers to its subscribers. Everything one action changes
+# (a click, a chord, or a whole Game.batch()) arrives as one list, with
+# all the cells it opened merged into a single CellsRevealed.
+
+
+class CellsRevealed:
+    # Cells opened, as flat indices (y * width + x), mines included
+    __slots__ = ('cells',)
+
+    def __init__(self, cells: array):
+        self.cells = cells
+
+    def __repr__(self):
+        return f"CellsRevealed({len(self.cells)} cells)"
+
+
+class FlagToggled:
+    # A flag placed or removed; toggled back within one batch, the cell
+    # still gets an event with its final state
+    __slots__ = ('index', 'flagged')
+
+    def __init__(self, index: int, flagged: bool):
+        self.index = index
+        self.flagged = flagged
+
+    def __repr__(self):
+        return f"FlagToggled({self.index}, {self.flagged})"
+
+
+class GameLost:
+    # A mine was revealed at `index`
+    __slots__ = ('index',)
+
+    def __init__(self, index: int):
+        self.index = index
+
+    def __repr__(self):
+        return f"GameLost({self.index})"
+
+
+class GameWon:
+    # Every safe cell is revealed
+    __slots__ = ('duration',)
+
+    def __init__(self, duration: float):
+        self.duration = duration
+
+    def __repr__(self):
+        return f"GameWon({self.duration:.1f}s)"
+
+
+class EventBuffer:
+    # Changes collected during a batch, turned into events when it ends
+    def __init__(self):
+        self.revealed = array('q')
+        self.flags = {}  # index -> final state
+        self.outcome = None
+
+    def __bool__(self) -> bool:
+        return bool(self.revealed or self.flags or self.outcome)
+
+    def take(self) -> list:
+        # Flags first, then the opened cells, then the end of the game
+        events = [FlagToggled(index, flagged) for index, flagged in self.flags.items()]
+        if self.revealed:
+            events.append(CellsRevealed(self.revealed))
+        if self.outcome is not None:
+            events.append(self.outcome)
+        self.revealed, self.flags, self.outcome = array('q'), {}, None
+        return events
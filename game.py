@@ -1,165 +1,565 @@
 import random
+import copy
 import json
 import os
+import time
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Tuple, Set
+from board import make_board
+from events import EventBuffer, GameLost, GameWon
+from history_index import HistoryIndex
+from move_log import MOVE_CHORD, MOVE_FLAG, MOVE_REVEAL, pack_move
+from paths import LEGACY_SAVE_FILE, SAVE_FILE, SAVES_DIR
+from save_format import is_binary, mine_indices, read_binary, write_binary
+
+
+def sample_mine_indices(rng: random.Random, width: int, height: int, mines: int,
+                        first_x: int, first_y: int) -> array:
+    # Pick `mines` distinct flat indices uniformly, skipping the first click
+    # and its neighbors, without materializing the candidate cells
+    safe_zone = sorted(ny * width + nx
+                       for ny in range(max(first_y - 1, 0), min(first_y + 2, height))
+                       for nx in range(max(first_x - 1, 0), min(first_x + 2, width)))
+    candidates = width * height - len(safe_zone)
+    if not 0 <= mines <= candidates:
+        raise ValueError(f"Cannot place {mines} mines on a {width}x{height} board")
+
+    # Floyd's algorithm: a uniform subset of range(candidates) in O(mines)
+    chosen = set()
+    add, randrange = chosen.add, rng.randrange
+    for j in range(candidates - mines, candidates):
+        t = randrange(j + 1)
+        add(j if t in chosen else t)
+
+    # Shift each pick past the safe cells at or below it: the k-th safe
+    # cell is preceded by safe_zone[k] - k candidates
+    picks = sorted(chosen)
+    indices = array('q')
+    start = 0
+    for shift, safe in enumerate(safe_zone):
+        end = bisect_left(picks, safe - shift, start)
+        indices.extend([i + shift for i in picks[start:end]] if shift else picks[start:end])
+        start = end
+    indices.extend([i + len(safe_zone) for i in picks[start:]])
+    return indices
+
+
+class RevealResult:
+    # Cells opened by one reveal, as flat indices (y * width + x). Truthiness
+    # keeps the old bool contract: False only when a mine was hit.
+    def __init__(self, cells: array = None, hit_mine: bool = False):
+        self.cells = cells if cells is not None else array('q')
+        self.hit_mine = hit_mine
+
+    def __bool__(self) -> bool:
+        return not self.hit_mine
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
 
 class Game:
-    def __init__(self, width: int, height: int, mines: int):
+    # Compare the incremental counters with a full scan on every check_win
+    check_counters = os.environ.get('MINESWEEPER_CHECK_COUNTERS') == '1'
+
+    # 'binary' writes the compact format from save_format, 'json' the old one
+    save_format = 'binary'
+
+    # A BackgroundSaver takes file writes off the caller's thread when set
+    saver = None
+
+    # A no_guess.BoardPool serves ready no-guess boards when set
+    board_pool = None
+
+    def __init__(self, width: int, height: int, mines: int, engine: str = 'list',
+                 seed: int = None, persist: bool = True, no_guess: bool = False):
         self.width = width
         self.height = height
         self.mines = mines
-        self.board = [[0 for _ in range(width)] for _ in range(height)]
-        self.revealed = [[False for _ in range(width)] for _ in range(height)]
-        self.flagged = [[False for _ in range(width)] for _ in range(height)]
+        self.engine = engine
+        # Binary saves store the seed as an unsigned 64-bit number
+        if seed is not None and not 0 <= seed < 2 ** 64:
+            raise ValueError(f"Seed {seed} is not between 0 and 2 ** 64 - 1")
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.cells = make_board(engine, width, height)
+        if self.cells.lazy_mines:
+            self.save_format = 'binary'  # JSON would hold every cell
         self.game_over = False
         self.first_move = True
-        self.mine_positions: Set[Tuple[int, int]] = set()
+        self.mine_indices = array('q')
+
+        # Incremental counters kept up to date by reveal and toggle_flag
+        self.revealed_count = 0
+        self.flag_count = 0
+        self.safe_remaining = width * height - mines
+
+        # Flags around each cell (cells with none are left out), and the
+        # revealed numbers whose flags match them: the cells a chord opens
+        # around. Kept up to date by toggle_flag and open_cell.
+        self.flag_counts = {}
+        self.satisfied = set()
+
+        # Subscribers get the events of each action as one list (see events)
+        self.listeners = []
+        self.events = EventBuffer()
+        self.batch_depth = 0
 
-        # Create the Saves folder if it doesn't exist
-        if not os.path.exists('Saves'):
-            os.makedirs('Saves')
+        # Seconds played in earlier sessions, plus the current session
+        self.elapsed = 0.0
+        self.session_start = time.time()
+
+        # Every reveal, chord and flag as a packed record (see move_log);
+        # None turns recording off
+        self.moves = array('Q')
+        self.move_clock = time.monotonic()
+
+        # Without persist (simulations) the game never touches the disk.
+        # The Saves folder is created by the first archived game.
+        self.persist = persist
+
+        # Lay out mines so the game can be won without guessing (see no_guess)
+        self.no_guess = no_guess
+
+    def subscribe(self, listener):
+        # Call `listener(events)` after every action that changed the game.
+        # Returns a function that unsubscribes it.
+        self.listeners.append(listener)
+        return lambda: self.listeners.remove(listener)
+
+    @contextmanager
+    def batch(self):
+        # Deliver everything changed inside the block as one list of events.
+        # reveal and toggle_flag open their own batch, and nested batches
+        # only deliver when the outermost one ends.
+        self.batch_depth += 1
+        try:
+            yield
+        finally:
+            self.batch_depth -= 1
+            if not self.batch_depth and self.events:
+                self.flush_events()
+
+    def flush_events(self):
+        events = self.events.take()
+        for listener in list(self.listeners):
+            listener(events)
+
+    def duration(self) -> float:
+        # Seconds played, across saves
+        return self.elapsed + time.time() - self.session_start
+
+    @property
+    def mine_positions(self) -> Set[Tuple[int, int]]:
+        # Built on demand from the flat mine indices; a chunked board only
+        # knows the mines of the tiles it has created
+        width = self.width
+        indices = self.cells.known_mines() if self.cells.lazy_mines else self.mine_indices
+        return {(i % width, i // width) for i in indices}
+
+    @mine_positions.setter
+    def mine_positions(self, positions):
+        self.mine_indices = array('q', sorted(y * self.width + x for x, y in positions))
+
+    @property
+    def board(self):
+        return self.cells.board
+
+    @property
+    def revealed(self):
+        return self.cells.revealed
+
+    @property
+    def flagged(self):
+        return self.cells.flagged
 
     def count_adjacent_flags(self, x: int, y: int) -> int:
         # Count the number of flags around a cell
-        flag_count = 0
-        for adj_x, adj_y in self.get_adjacent_positions(x, y):
-            if self.flagged[adj_y][adj_x]:
-                flag_count += 1
-        return flag_count
+        return self.flag_counts.get(y * self.width + x, 0)
 
-    def reveal_adjacent_cells(self, x: int, y: int) -> bool:
+    def note_revealed(self, opened):
+        # Add newly revealed numbers to the satisfied index. Only cells next
+        # to a flag can qualify, so the check skips the rest of a cascade.
+        counts = self.flag_counts
+        if not counts:
+            return
+        width, get = self.width, self.cells.get
+        for i in counts.keys() & opened:
+            if get(i % width, i // width) == counts[i]:
+                self.satisfied.add(i)
+
+    def rebuild_flag_index(self):
+        # Recompute the adjacent flag counts and satisfied numbers from the
+        # flags on the board, e.g. after loading a save
+        width, cells = self.width, self.cells
+        counts = {}
+        for i in cells.flag_indices():
+            for nx, ny in cells.neighbors(i % width, i // width):
+                j = ny * width + nx
+                counts[j] = counts.get(j, 0) + 1
+        self.flag_counts = counts
+        self.satisfied = {i for i, count in counts.items()
+                          if cells.is_revealed(i % width, i // width)
+                          and cells.get(i % width, i // width) == count}
+
+    def record_move(self, kind: int, x: int, y: int):
+        # Append a move to the log with the time since the previous one;
+        # clicks on a finished game are not moves
+        if self.moves is None or self.game_over or self.safe_remaining == 0:
+            return
+        now = time.monotonic()
+        self.moves.append(pack_move(y * self.width + x, kind, now - self.move_clock))
+        self.move_clock = now
+
+    def reveal_adjacent_cells(self, x: int, y: int) -> RevealResult:
         # Reveal all adjacent cells if the number matches the flag count
-        if not self.revealed[y][x] or self.board[y][x] <= 0:
-            return True
-
-        flag_count = self.count_adjacent_flags(x, y)
-        if flag_count == self.board[y][x]:
-            for adj_x, adj_y in self.get_adjacent_positions(x, y):
-                if not self.revealed[adj_y][adj_x] and not self.flagged[adj_y][adj_x]:
-                    if not self.reveal(adj_x, adj_y):
-                        return False
-        return True
-
-    def reveal(self, x: int, y: int) -> bool:
+        if y * self.width + x not in self.satisfied:
+            return RevealResult()
+        return self.open_all(self.hidden_neighbors(x, y))
+
+    def hidden_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        cells = self.cells
+        return [(nx, ny) for nx, ny in cells.neighbors(x, y)
+                if not cells.is_revealed(nx, ny) and not cells.is_flagged(nx, ny)]
+
+    def open_all(self, targets) -> RevealResult:
+        # Open each cell in turn, stopping at a mine
+        result = RevealResult()
+        for x, y in targets:
+            step = self.open_cell(x, y)
+            result.cells.extend(step.cells)
+            if step.hit_mine:
+                result.hit_mine = True
+                break
+        return result
+
+    def auto_chord(self) -> RevealResult:
+        # Chord every satisfied number, including the ones the chords
+        # uncover, until none has a hidden unflagged neighbor left. Numbers
+        # with nothing left to open leave the index, so the work grows with
+        # the cells opened rather than with the board.
+        # Each chord is logged as a move, so replays match.
+        result = RevealResult()
+        width, satisfied = self.width, self.satisfied
+        with self.batch():
+            while satisfied and not self.game_over and self.safe_remaining:
+                # Once chorded a number has no hidden neighbors, so it stays
+                # out of the index until a flag next to it changes
+                i = satisfied.pop()
+                x, y = i % width, i // width
+                hidden = self.hidden_neighbors(x, y)
+                if not hidden:
+                    continue
+                self.record_move(MOVE_CHORD, x, y)
+                step = self.open_all(hidden)
+                result.cells.extend(step.cells)
+                result.hit_mine = step.hit_mine
+        return result
+
+    def reveal(self, x: int, y: int) -> RevealResult:
+        # A player's click: log it, then open the cell
+        self.record_move(MOVE_CHORD if self.cells.is_revealed(x, y) else MOVE_REVEAL, x, y)
+        with self.batch():
+            return self.open_cell(x, y)
+
+    def open_cell(self, x: int, y: int) -> RevealResult:
         # Handle first move
         if self.first_move:
             self.place_mines(x, y)
             self.first_move = False
 
         # If already revealed, try to reveal adjacent cells
-        if self.revealed[y][x]:
+        cells = self.cells
+        if cells.is_revealed(x, y):
             return self.reveal_adjacent_cells(x, y)
 
         # Skip if flagged
-        if self.flagged[y][x]:
-            return True
-
-        # Reveal current cell
-        self.revealed[y][x] = True
+        if cells.is_flagged(x, y):
+            return RevealResult()
 
         # Check if mine was hit
-        if self.board[y][x] == -1:
+        if cells.get(x, y) == -1:
+            cells.set_revealed(x, y)
+            self.revealed_count += 1
+            self.events.revealed.append(y * self.width + x)
+            self.events.outcome = GameLost(y * self.width + x)
             self.game_over = True
-            self.save_game()  # This will archive the game and clear saved_game.json
-            return False
+            self.save_game()  # This will archive the game and clear the saved game
+            return RevealResult(array('q', [y * self.width + x]), hit_mine=True)
 
-        # If empty cell, reveal adjacent cells
-        if self.board[y][x] == 0:
-            for adj_x, adj_y in self.get_adjacent_positions(x, y):
-                if not self.revealed[adj_y][adj_x]:
-                    self.reveal(adj_x, adj_y)
+        # Reveal current cell, and the zero region around it if it is empty
+        opened = array('q')
+        cells.flood(x, y, opened)
+        self.revealed_count += len(opened)
+        self.safe_remaining -= len(opened)
+        self.events.revealed.extend(opened)
+        self.note_revealed(opened)
 
         # Check for win condition
         if self.check_win():
-            self.save_game()  # This will archive the game and clear saved_game.json
+            self.events.outcome = GameWon(self.duration())
+            self.save_game()  # This will archive the game and clear the saved game
 
-        return True
+        return RevealResult(opened)
 
     def save_game(self):
         # Save the current game state
+        if not self.persist:
+            return
+        now = datetime.now()
+        timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
+        extension = '.sav' if self.save_format == 'binary' else '.json'
+
+        # If game is finished (won or lost), archive it and clear the saved game
+        if self.game_over or self.check_win():
+            # Save completed game to archive and record it in the history index
+            # The microseconds keep two games finished in the same second apart
+            unique = f"{timestamp}_{now.microsecond:06d}"
+            self.queue_write(os.path.join(SAVES_DIR, f"game_{unique}{extension}"), timestamp, archive=True)
+
+            # Remove the saved game files
+            self.queue_remove(SAVE_FILE)
+            self.queue_remove(LEGACY_SAVE_FILE)
+        else:
+            # Save ongoing game, replacing a save in the other format
+            path = SAVE_FILE if self.save_format == 'binary' else LEGACY_SAVE_FILE
+            self.queue_write(path, timestamp)
+            self.queue_remove(LEGACY_SAVE_FILE if path == SAVE_FILE else SAVE_FILE)
+
+    def queue_write(self, path: str, timestamp: str, archive: bool = False):
+        # Write now, or hand a snapshot to the background saver
+        game = self.snapshot() if self.saver else self
+        write = game.write_archive if archive else game.write_save
+        if self.saver:
+            self.saver.write(path, lambda: write(path, timestamp))
+        else:
+            write(path, timestamp)
+
+    def queue_remove(self, path: str):
+        if self.saver:
+            self.saver.remove(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def snapshot(self):
+        # Independent copy of the state a save file holds
+        snapshot = copy.copy(self)
+        snapshot.elapsed = self.duration()
+        snapshot.session_start = time.time()
+        snapshot.cells = self.cells.copy()
+        snapshot.mine_indices = array('q', self.mine_indices)
+        snapshot.flag_counts = dict(self.flag_counts)
+        snapshot.satisfied = set(self.satisfied)
+        snapshot.listeners = []
+        snapshot.events = EventBuffer()
+        snapshot.batch_depth = 0
+        snapshot.moves = array('Q', self.moves) if self.moves is not None else None
+        snapshot.saver = None
+        return snapshot
+
+    def write_archive(self, path: str, timestamp: str):
+        # Archive a finished game and add it to the history index
+        duration = self.duration()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.write_save(path, timestamp)
+        HistoryIndex().add(path, timestamp, self.width, self.height, self.mines,
+                           self.status, duration, 0, os.path.getsize(path))
+
+    def write_save(self, path: str, timestamp: str):
+        # Write the game to `path` in the configured format. The data goes to
+        # a temporary file first and replaces `path` in one rename, so a crash
+        # mid-write leaves the previous save intact.
+        temp_path = path + '.tmp'
+        if self.save_format == 'binary':
+            with open(temp_path, 'wb') as f:
+                write_binary(f, self, timestamp)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+            return
+
+        board, revealed, flagged = self.cells.to_lists()
         game_state = {
             'width': self.width,
             'height': self.height,
             'mines': self.mines,
-            'board': self.board,
-            'revealed': self.revealed,
-            'flagged': self.flagged,
+            'engine': self.engine,
+            'seed': self.seed,
+            'board': board,
+            'revealed': revealed,
+            'flagged': flagged,
             'game_over': self.game_over,
             'first_move': self.first_move,
             'mine_positions': list(self.mine_positions),
-            'timestamp': datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            'timestamp': timestamp,
+            'duration': self.duration(),
+            'moves': list(self.moves) if self.moves is not None else []
         }
+        with open(temp_path, 'w') as f:
+            json.dump(game_state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
 
-        # If game is finished (won or lost), archive it and clear the saved game
-        if self.game_over or self.check_win():
-            # Save completed game to archive
-            archive_path = f"Saves/game_{game_state['timestamp']}.json"
-            with open(archive_path, 'w') as f:
-                json.dump(game_state, f)
-
-            # Remove the saved game file
-            if os.path.exists('saved_game.json'):
-                os.remove('saved_game.json')
-        else:
-            # Save ongoing game
-            with open('saved_game.json', 'w') as f:
-                json.dump(game_state, f)
+    @classmethod
+    def load_game(cls, engine: str = None):
+        # Load a previously saved game, keeping the engine it was played with
+        # unless another one is requested
+        for path in (SAVE_FILE, LEGACY_SAVE_FILE):
+            try:
+                return cls.load_file(path, engine)
+            except FileNotFoundError:
+                continue
+        return None
 
     @classmethod
-    def load_game(cls):
-        # Load a previously saved game
-        try:
-            with open('saved_game.json', 'r') as f:
-                data = json.load(f)
-            game = cls(data['width'], data['height'], data['mines'])
-            game.board = data['board']
-            game.revealed = data['revealed']
-            game.flagged = data['flagged']
-            game.game_over = data['game_over']
-            game.first_move = data['first_move']
-            game.mine_positions = set(tuple(pos) for pos in data['mine_positions'])
+    def load_file(cls, path: str, engine: str = None):
+        # Load a save in either format, detected from the file header
+        if is_binary(path):
+            header, planes = read_binary(path)
+            if header['engine'] == 'chunked':
+                # The mines come from the seed, so only the chunked engine
+                # can rebuild the board
+                game = cls(header['width'], header['height'], header['mines'],
+                           'chunked', header['seed'])
+                if header['first_click']:
+                    game.cells.seed_mines(game.seed, game.mines, *header['first_click'])
+                game.cells.load_tiles(header['tiles'])
+            else:
+                mines, revealed, flagged = planes
+                game = cls(header['width'], header['height'], header['mines'],
+                           engine or header['engine'], header['seed'])
+                if game.cells.lazy_mines:
+                    raise ValueError(f"{path} has its mines laid out; load it with the list or packed engine")
+                game.cells.load_planes(mines, revealed, flagged)
+                game.mine_indices = array('q', mine_indices(mines))
+            game.game_over = header['game_over']
+            game.first_move = header['first_move']
+            game.revealed_count = header['revealed_count']
+            game.flag_count = header['flag_count']
+            game.safe_remaining = header['safe_remaining']
+            game.elapsed = header['duration']
+            game.resume_moves(header['moves'])
+            game.rebuild_flag_index()
             return game
-        except FileNotFoundError:
-            return None
+
+        with open(path, 'r') as f:
+            data = json.load(f)
+        game = cls(data['width'], data['height'], data['mines'],
+                   engine or data.get('engine', 'list'), data.get('seed'))
+        game.cells.load(data['board'], data['revealed'], data['flagged'])
+        game.game_over = data['game_over']
+        game.first_move = data['first_move']
+        game.mine_positions = set(tuple(pos) for pos in data['mine_positions'])
+        game.elapsed = data.get('duration', 0.0)
+        game.rebuild_counters()
+        game.rebuild_flag_index()
+        game.resume_moves(data.get('moves', []))
+        return game
+
+    def resume_moves(self, moves):
+        # Continue the saved move log. A game saved in progress before moves
+        # were logged cannot be replayed, so its log stays off.
+        if moves or self.first_move:
+            self.moves = array('Q', moves)
+        else:
+            self.moves = None
 
     def place_mines(self, first_x: int, first_y: int):
         # Place mines ensuring the first click is safe
-        safe_zone = self.get_adjacent_positions(first_x, first_y) + [(first_x, first_y)]
-        all_positions = [(x, y) for x in range(self.width) for y in range(self.height)
-                         if (x, y) not in safe_zone]
-
-        # Randomly select positions for mines
-        self.mine_positions = set(random.sample(all_positions, self.mines))
+        if self.cells.lazy_mines:
+            # Chunked boards draw each tile's mines when the tile is created
+            self.cells.seed_mines(self.seed, self.mines, first_x, first_y)
+            return
+        indices = self.no_guess_layout(first_x, first_y) if self.no_guess else None
+        if indices is None:
+            indices = sample_mine_indices(self.rng, self.width, self.height,
+                                          self.mines, first_x, first_y)
+        self.mine_indices = indices
 
         # Place mines and update adjacent cell counts
-        for x, y in self.mine_positions:
-            self.board[y][x] = -1
-            for adj_x, adj_y in self.get_adjacent_positions(x, y):
-                if self.board[adj_y][adj_x] != -1:
-                    self.board[adj_y][adj_x] += 1
+        self.cells.lay_mines(self.mine_indices)
+
+    def no_guess_layout(self, first_x: int, first_y: int):
+        # A ready board from the pool, else one generated now; None when no
+        # no-guess layout turned up and the mines are placed at random
+        from no_guess import generate
+        if self.board_pool is not None:
+            indices = self.board_pool.take(self.width, self.height, self.mines, first_x, first_y)
+            if indices is not None:
+                return indices
+        board = generate(self.rng, self.width, self.height, self.mines, first_x, first_y)
+        return board[0] if board is not None else None
 
     def get_adjacent_positions(self, x: int, y: int) -> List[Tuple[int, int]]:
         # Get all valid adjacent positions for a given cell
-        adjacent = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                new_x, new_y = x + dx, y + dy
-                if 0 <= new_x < self.width and 0 <= new_y < self.height:
-                    adjacent.append((new_x, new_y))
-        return adjacent
+        return self.cells.neighbors(x, y)
 
     def toggle_flag(self, x: int, y: int):
         # Toggle flag on a cell if not revealed
-        if not self.revealed[y][x]:
-            self.flagged[y][x] = not self.flagged[y][x]
+        if not self.cells.is_revealed(x, y):
+            flagged = not self.cells.is_flagged(x, y)
+            self.record_move(MOVE_FLAG, x, y)
+            self.cells.set_flagged(x, y, flagged)
+            self.flag_count += 1 if flagged else -1
+            self.update_flag_index(x, y, 1 if flagged else -1)
+            self.events.flags[y * self.width + x] = flagged
+            if not self.batch_depth:
+                self.flush_events()
+
+    def update_flag_index(self, x: int, y: int, change: int):
+        # A flag at (x, y) was placed (+1) or removed (-1)
+        width, cells = self.width, self.cells
+        counts, satisfied = self.flag_counts, self.satisfied
+        for nx, ny in cells.neighbors(x, y):
+            j = ny * width + nx
+            count = counts.get(j, 0) + change
+            if count:
+                counts[j] = count
+            else:
+                del counts[j]
+            # A revealed 0 with no flags left around it is not chordable
+            if count and cells.is_revealed(nx, ny) and cells.get(nx, ny) == count:
+                satisfied.add(j)
+            else:
+                satisfied.discard(j)
 
     def check_win(self) -> bool:
         # Check if all non-mine cells are revealed
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.board[y][x] != -1 and not self.revealed[y][x]:
-                    return False
-        return True
\ No newline at end of file
+        if self.check_counters:
+            self.verify_counters()
+        return self.safe_remaining == 0
+
+    @property
+    def status(self) -> str:
+        # Current game status: 'lost', 'won' or 'playing'
+        if self.game_over:
+            return 'lost'
+        return 'won' if self.safe_remaining == 0 else 'playing'
+
+    def scan_counters(self) -> Tuple[int, int, int]:
+        # Recompute (revealed_count, flag_count, safe_remaining) with a full scan
+        revealed, flagged, safe_revealed = self.cells.tally()
+        return revealed, flagged, self.width * self.height - self.mines - safe_revealed
+
+    def rebuild_counters(self):
+        # Reset the counters from the board, e.g. after loading a save
+        self.revealed_count, self.flag_count, self.safe_remaining = self.scan_counters()
+
+    def verify_counters(self):
+        # Consistency check: the counters must match a full scan
+        counters = (self.revealed_count, self.flag_count, self.safe_remaining)
+        expected = self.scan_counters()
+        if counters != expected:
+            raise AssertionError(f"Counters {counters} do not match board scan {expected}")
+        flag_counts, satisfied = self.flag_counts, self.satisfied
+        self.rebuild_flag_index()
+        if flag_counts != self.flag_counts or not satisfied <= self.satisfied:
+            raise AssertionError("Adjacent flag counts do not match the flags on the board")
+        self.flag_counts, self.satisfied = flag_counts, satisfied
\ No newline at end of file
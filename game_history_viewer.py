@@ -1,61 +1,130 @@
-import tkinter as tk
-
-
-class GameHistoryViewer:
-    def __init__(self, master, game_data, return_to_menu):
-        self.master = master
-        self.game_data = game_data
-        self.setup_ui(return_to_menu)
-
-    def setup_ui(self, return_to_menu):
-        self.frame = tk.Frame(self.master)
-        self.frame.pack(expand=True, padx=20, pady=20)
-
-        # Create title with game info
-        timestamp = self.game_data['timestamp'].replace('_', ' ')
-        difficulty = self.get_difficulty(self.game_data['width'],
-                                         self.game_data['height'],
-                                         self.game_data['mines'])
-
-        title = f"Game from {timestamp}\nDifficulty: {difficulty}"
-        tk.Label(self.frame, text=title, font=("Arial", 14)).pack(pady=10)
-
-        # Create grid of cells
-        grid_frame = tk.Frame(self.frame)
-        grid_frame.pack(pady=10)
-
-        for y in range(self.game_data['height']):
-            for x in range(self.game_data['width']):
-                cell = tk.Label(
-                    grid_frame,
-                    width=2,
-                    height=1,
-                    relief="raised",
-                    borderwidth=1
-                )
-                cell.grid(row=y, column=x, padx=1, pady=1)
-
-                # Show cell state
-                if self.game_data['revealed'][y][x]:
-                    value = self.game_data['board'][y][x]
-                    if value == -1:
-                        cell.configure(text="💣", bg="red")
-                    elif value == 0:
-                        cell.configure(bg="lightgray")
-                    else:
-                        cell.configure(text=str(value), bg="lightgray")
-                elif self.game_data['flagged'][y][x]:
-                    cell.configure(text="🚩")
-
-        # Add back button
-        tk.Button(self.frame, text="Back to Menu",
-                  command=lambda: [self.frame.destroy(), return_to_menu()]).pack(pady=20)
-
-    def get_difficulty(self, width, height, mines):
-        if width == 9 and height == 9 and mines == 10:
-            return "Easy"
-        elif width == 16 and height == 16 and mines == 40:
-            return "Medium"
-        elif width == 30 and height == 16 and mines == 99:
-            return "Hard"
-        return "Custom"
\ No newline at end of file
+import tkinter as tk
+from board_canvas import BoardCanvas
+from history_index import get_difficulty
+from replay import Replay
+
+# Playback runs this many times faster than the game was played, with the
+# pause between two moves kept within these bounds (milliseconds)
+PLAY_SPEED = 4
+MIN_PLAY_DELAY = 30
+MAX_PLAY_DELAY = 500
+
+
+class GameHistoryViewer:
+    def __init__(self, master, game_data, return_to_menu):
+        self.master = master
+        self.game_data = game_data
+        self.replay = Replay.from_save(game_data)  # None for saves without a move log
+        self.playing = None
+        self.setup_ui(return_to_menu)
+
+    def setup_ui(self, return_to_menu):
+        self.frame = tk.Frame(self.master)
+        self.frame.pack(expand=True, padx=20, pady=20)
+
+        # Create title with game info
+        timestamp = self.game_data['timestamp'].replace('_', ' ')
+        difficulty = get_difficulty(self.game_data['width'],
+                                    self.game_data['height'],
+                                    self.game_data['mines'])
+
+        title = f"Game from {timestamp}\nDifficulty: {difficulty}"
+        tk.Label(self.frame, text=title, font=("Arial", 14)).pack(pady=10)
+
+        # Create the board
+        self.board_view = BoardCanvas(self.frame, self.game_data['width'],
+                                      self.game_data['height'], self.describe_cell)
+        self.board_view.frame.pack(pady=10)
+
+        # Replay controls, starting on the final position
+        if self.replay:
+            self.move_label = tk.Label(self.frame)
+            self.move_label.pack()
+            self.slider = tk.Scale(self.frame, from_=0, to=len(self.replay), orient=tk.HORIZONTAL,
+                                   showvalue=False, length=300,
+                                   command=lambda value: self.seek(int(value)))
+            self.slider.pack()
+
+            controls = tk.Frame(self.frame)
+            controls.pack(pady=5)
+            tk.Button(controls, text="⏮", command=lambda: self.seek(0)).pack(side=tk.LEFT, padx=2)
+            tk.Button(controls, text="◀", command=lambda: self.step(-1)).pack(side=tk.LEFT, padx=2)
+            self.play_button = tk.Button(controls, text="Play", width=6, command=self.toggle_play)
+            self.play_button.pack(side=tk.LEFT, padx=2)
+            tk.Button(controls, text="▶", command=lambda: self.step(1)).pack(side=tk.LEFT, padx=2)
+            tk.Button(controls, text="⏭",
+                      command=lambda: self.seek(len(self.replay))).pack(side=tk.LEFT, padx=2)
+            self.show_position()
+
+        # Add back button
+        tk.Button(self.frame, text="Back to Menu",
+                  command=lambda: [self.stop(), self.frame.destroy(), return_to_menu()]).pack(pady=20)
+
+    def describe_cell(self, x, y):
+        # Show cell state, from the replay position when there is one
+        if self.replay:
+            cells = self.replay.game.cells
+            revealed, flagged = cells.is_revealed(x, y), cells.is_flagged(x, y)
+            value = cells.get(x, y) if revealed else None
+        else:
+            revealed, flagged = self.game_data['revealed'][y][x], self.game_data['flagged'][y][x]
+            value = self.game_data['board'][y][x]
+        if revealed:
+            if value == -1:
+                return "💣", "red"
+            elif value == 0:
+                return "", "lightgray"
+            return str(value), "lightgray"
+        elif flagged:
+            return "🚩", None
+        return "", None
+
+    def seek(self, target):
+        # Show the position after `target` moves
+        if target == self.replay.position:
+            return
+        changes = self.replay.seek(target)
+        if changes is None:
+            self.board_view.redraw_all()
+        else:
+            width = self.replay.game.width
+            for i in changes:
+                self.board_view.redraw_cell(i % width, i // width)
+        self.show_position()
+
+    def step(self, count):
+        self.stop()
+        self.seek(self.replay.position + count)
+
+    def show_position(self):
+        self.move_label.config(text=f"Move {self.replay.position} / {len(self.replay)}")
+        self.slider.set(self.replay.position)
+
+    def toggle_play(self):
+        if self.playing:
+            self.stop()
+            return
+        if self.replay.position == len(self.replay):
+            self.seek(0)
+        self.play_button.config(text="Pause")
+        self.play_next()
+
+    def play_next(self):
+        # Show the next move, then wait as long as the player did (sped up)
+        position = self.replay.position
+        if position >= len(self.replay):
+            self.stop()
+            return
+        self.seek(position + 1)
+        delay = 0
+        if position + 1 < len(self.replay):
+            delay = self.replay.delay(position + 1) * 1000 / PLAY_SPEED
+        self.playing = self.master.after(int(min(max(delay, MIN_PLAY_DELAY), MAX_PLAY_DELAY)),
+                                         self.play_next)
+
+    def stop(self):
+        if self.playing:
+            self.master.after_cancel(self.playing)
+            self.playing = None
+        if self.replay:
+            self.play_button.config(text="Play")
@@ -1,16 +1,37 @@
 import tkinter as tk
+import logging
 import time
+from collections import deque
+from events import CellsRevealed, FlagToggled, GameLost
 from game import Game
+from autosave import AUTOSAVE_EVERY, default_saver
+from board_canvas import BoardCanvas
+from engine_worker import EngineWorker
+from history_index import get_difficulty
+from no_guess import default_pool
 from scoreboard import save_score
 
+logger = logging.getLogger(__name__)
+
+# The window polls the engine worker once per frame and repaints for at
+# most FRAME_BUDGET seconds of it, checking the clock every REPAINT_CHUNK cells
+FRAME_MS = 16
+FRAME_BUDGET = 0.012
+REPAINT_CHUNK = 256
+
 
 class GameWindow:
-    def __init__(self, master, width=None, height=None, mines=None, return_to_menu=None, load_saved=False):
+    def __init__(self, master, width=None, height=None, mines=None, return_to_menu=None, load_saved=False,
+                 autosave_every=AUTOSAVE_EVERY, no_guess=False):
         self.master = master
         self.return_to_menu = return_to_menu
         self.start_time = time.time()
+        self.autosave_every = autosave_every
+        self.moves = 0
+        saver = default_saver()
 
         if load_saved:
+            saver.flush()  # Make sure the latest save is on disk
             self.game = Game.load_game()
             if not self.game:
                 self.return_to_menu()
@@ -18,19 +39,36 @@ class GameWindow:
             width, height = self.game.width, self.game.height
             mines = self.game.mines
         else:
-            self.game = Game(width, height, mines)
+            self.game = Game(width, height, mines, no_guess=no_guess)
+            if no_guess:
+                self.game.board_pool = default_pool()
+        self.game.saver = saver
+
+        # The game runs on the worker; its events come back through poll()
+        self.worker = EngineWorker(self.game)
+        self.dirty = deque()  # arrays of flat indices still to repaint
+        self.dirty_position = 0  # cells of dirty[0] already repainted
+        self.outcome = None  # GameLost or GameWon, shown once repainted
+        self.finished = False
 
-        self.difficulty = self.get_difficulty(width, height, mines)
+        self.difficulty = get_difficulty(width, height, mines)
         self.setup_ui(width, height)
+        self.polling = None
+        self.poll()
 
     def setup_ui(self, width, height):
         # Create main frame
         self.frame = tk.Frame(self.master)
         self.frame.pack(expand=True, padx=20, pady=20)
 
+        # Create the board
+        self.board_view = BoardCanvas(self.frame, width, height, self.describe_cell,
+                                      on_left=self.left_click, on_right=self.right_click)
+        self.board_view.frame.grid(row=0, column=0)
+
         # Create control buttons
         control_frame = tk.Frame(self.frame)
-        control_frame.grid(row=height, column=0, columnspan=width, pady=10)
+        control_frame.grid(row=1, column=0, pady=10)
 
         save_button = tk.Button(control_frame, text="Save Game", command=self.save_game)
         save_button.pack(side=tk.LEFT, padx=5)
@@ -38,93 +76,152 @@ class GameWindow:
         quit_button = tk.Button(control_frame, text="Quit", command=self.quit_game)
         quit_button.pack(side=tk.LEFT, padx=5)
 
-        # Create grid of buttons
-        self.buttons = []
-        for y in range(height):
-            row = []
-            for x in range(width):
-                btn = tk.Button(
-                    self.frame,
-                    width=2,
-                    height=1,
-                    command=lambda x=x, y=y: self.left_click(x, y)
-                )
-                btn.grid(row=y, column=x)
-                btn.bind('<Button-3>', lambda e, x=x, y=y: self.right_click(x, y))
-                row.append(btn)
-            self.buttons.append(row)
-
-        # Update display for saved games
-        if hasattr(self, 'game'):
-            self.update_all_buttons()
-
-    def get_difficulty(self, width, height, mines):
-        # Determine difficulty level based on board size and mines
-        if width == 9 and height == 9 and mines == 10:
-            return "Easy"
-        elif width == 16 and height == 16 and mines == 40:
-            return "Medium"
-        elif width == 30 and height == 16 and mines == 99:
-            return "Hard"
-        return "Custom"
+        # Shows that a click is still being worked out or drawn
+        self.progress = tk.Label(control_frame, width=20, anchor=tk.W)
+        self.progress.pack(side=tk.LEFT, padx=5)
 
     def left_click(self, x, y):
-        # Handle left click (reveal cell)
-        if not self.game.reveal(x, y):
-            self.show_all_mines()
+        # Handle left click (reveal cell): queued for the engine worker
+        if not self.finished:
+            self.worker.move(self.game.reveal, x, y)
+
+    def right_click(self, x, y):
+        # Handle right click (toggle flag)
+        if not self.finished:
+            self.worker.move(self.game.toggle_flag, x, y)
+
+    def poll(self):
+        # Once per frame on the Tk thread: take the worker's events, repaint
+        # within the frame budget, and show the end of the game once the
+        # board is drawn
+        for events in self.worker.drain():
+            self.on_game_events(events)
+        start = time.perf_counter()
+        touched = self.repaint_slice(start + FRAME_BUDGET)
+        if touched:
+            # Instrumentation: widgets configured and time spent per frame
+            logger.debug("%d widgets repainted in %.2f ms (%d batches queued)",
+                         touched, (time.perf_counter() - start) * 1000, len(self.dirty))
+        if self.outcome and not self.dirty:
+            self.show_outcome()
+        self.show_progress()
+        self.polling = self.master.after(FRAME_MS, self.poll)
+
+    def on_game_events(self, events):
+        # Queue the cells the game reports as changed, note the end of the
+        # game or count the move. Returns the cells queued.
+        queued = 0
+        for event in events:
+            if isinstance(event, CellsRevealed):
+                self.dirty.append(event.cells)
+                queued += len(event.cells)
+            elif isinstance(event, FlagToggled):
+                self.dirty.append((event.index,))
+                queued += 1
+            elif not self.finished:
+                self.outcome = event
+                self.finished = True
+                if isinstance(event, GameLost):
+                    mines = self.show_all_mines()
+                    queued += len(mines)
+        if not self.finished:
+            self.count_move()
+        return queued
+
+    def repaint_slice(self, deadline):
+        # Repaint queued cells until `deadline`; the rest waits for the next frame
+        width = self.game.width
+        touched = 0
+        while self.dirty and time.perf_counter() < deadline:
+            cells = self.dirty[0]
+            end = self.dirty_position + REPAINT_CHUNK
+            for i in cells[self.dirty_position:end]:
+                touched += self.update_button(i % width, i // width)
+            if end >= len(cells):
+                self.dirty.popleft()
+                self.dirty_position = 0
+            else:
+                self.dirty_position = end
+        return touched
+
+    def show_progress(self):
+        if self.dirty:
+            text = f"Drawing {sum(map(len, self.dirty)) - self.dirty_position} cells..."
+        elif self.worker.busy:
+            text = "Working..."
+        else:
+            text = ""
+        if self.progress.cget('text') != text:
+            self.progress.config(text=text)
+
+    def show_outcome(self):
+        outcome, self.outcome = self.outcome, None
+        if isinstance(outcome, GameLost):
             self.show_message("Game Over!")
             self.schedule_return_to_menu()
         else:
-            self.update_all_buttons()
-            if self.game.check_win():
-                self.show_message("Congratulations! You won!")
-                self.get_player_name()
+            self.show_message("Congratulations! You won!")
+            self.get_player_name(outcome.duration)
 
-    def right_click(self, x, y):
-        # Handle right click (toggle flag)
-        self.game.toggle_flag(x, y)
-        btn = self.buttons[y][x]
-        btn.configure(text="🚩" if self.game.flagged[y][x] else "")
+    def count_move(self):
+        # Autosave every `autosave_every` moves of an ongoing game
+        self.moves += 1
+        if self.autosave_every and self.moves % self.autosave_every == 0:
+            self.worker.submit(self.autosave)
 
-    def update_all_buttons(self):
-        # Update all button displays
-        for y in range(self.game.height):
-            for x in range(self.game.width):
-                self.update_button(x, y)
+    def autosave(self):
+        # Runs on the worker, after any moves queued before it. A move that
+        # ended the game has archived it already, so only save while playing.
+        if self.game.status == 'playing':
+            self.game.save_game()
 
     def update_button(self, x, y):
-        # Update single button display
-        btn = self.buttons[y][x]
-        if self.game.revealed[y][x]:
-            value = self.game.board[y][x]
+        # Update single cell display
+        return self.board_view.redraw_cell(x, y)
+
+    def describe_cell(self, x, y):
+        # Text and background for a cell; mines show once the game is lost.
+        # The value is only read when it is shown, so a chunked board does
+        # not create tiles just to be drawn.
+        revealed = self.game.revealed[y][x]
+        value = self.game.board[y][x] if revealed or self.game.game_over else None
+        if revealed or value == -1:
             if value == -1:
-                btn.configure(text="💣", bg="red")
+                return "💣", "red"
             elif value == 0:
-                btn.configure(text="", bg="lightgray")
-            else:
-                btn.configure(text=str(value), bg="lightgray")
+                return "", "lightgray"
+            return str(value), "lightgray"
         elif self.game.flagged[y][x]:
-            btn.configure(text="🚩")
+            return "🚩", None
+        return "", None
 
     def show_all_mines(self):
-        # Reveal all mines on game over
-        for y in range(self.game.height):
-            for x in range(self.game.width):
-                if self.game.board[y][x] == -1:
-                    self.buttons[y][x].configure(text="💣", bg="red")
+        # Reveal all mines on game over: queued like any other change
+        width = self.game.width
+        mines = [y * width + x for x, y in self.game.mine_positions]
+        self.dirty.append(mines)
+        return mines
 
     def save_game(self):
-        # Save current game state
-        self.game.save_game()
+        # Save current game state, after the moves already queued
+        self.worker.submit(self.game.save_game)
         self.show_message("Game saved successfully!")
 
     def quit_game(self):
         # Handle game quit with save option
-        if not self.game.game_over and not self.game.check_win():
+        if not self.finished and self.game.status == 'playing':
             self.show_quit_dialog()
         else:
-            self.frame.destroy()
-            self.return_to_menu()
+            self.leave()
+
+    def leave(self):
+        # Finish the queued commands and saves, stop polling and return to
+        # the menu, which looks for the saved game on disk
+        self.master.after_cancel(self.polling)
+        self.worker.close()
+        self.game.saver.flush()
+        self.frame.destroy()
+        self.return_to_menu()
 
     def show_quit_dialog(self):
         # Show quit confirmation dialog
@@ -134,12 +231,11 @@ class GameWindow:
         tk.Label(popup, text="Do you want to save before quitting?", padx=20, pady=10).pack()
 
         tk.Button(popup, text="Save and Quit",
-                  command=lambda: [self.game.save_game(), popup.destroy(),
-                                   self.frame.destroy(), self.return_to_menu()]).pack(side=tk.LEFT, padx=5, pady=10)
+                  command=lambda: [self.worker.submit(self.game.save_game), popup.destroy(),
+                                   self.leave()]).pack(side=tk.LEFT, padx=5, pady=10)
 
         tk.Button(popup, text="Quit without Saving",
-                  command=lambda: [popup.destroy(), self.frame.destroy(),
-                                   self.return_to_menu()]).pack(side=tk.LEFT, padx=5, pady=10)
+                  command=lambda: [popup.destroy(), self.leave()]).pack(side=tk.LEFT, padx=5, pady=10)
 
     def show_message(self, message):
         # Show popup message
@@ -148,7 +244,7 @@ class GameWindow:
         tk.Label(popup, text=message, padx=20, pady=20).pack()
         self.master.after(3000, popup.destroy)
 
-    def get_player_name(self):
+    def get_player_name(self, duration):
         # Get player name for high score
         popup = tk.Toplevel(self.master)
         popup.title("Enter Your Name")
@@ -159,7 +255,8 @@ class GameWindow:
 
         def save():
             name = name_entry.get()
-            save_score(name, self.difficulty)
+            save_score(name, self.difficulty, self.game.width, self.game.height,
+                       self.game.mines, duration)
             popup.destroy()
             self.schedule_return_to_menu()
 
@@ -167,4 +264,4 @@ class GameWindow:
 
     def schedule_return_to_menu(self):
         # Schedule return to menu after delay
-        self.master.after(3000, lambda: [self.frame.destroy(), self.return_to_menu()])
\ No newline at end of file
+        self.master.after(3000, self.leave)
\ No newline at end of file
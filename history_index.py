@@ -0,0 +1,153 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+from paths import SAVES_DIR
+from save_format import parse_save, read_save
+from segments import is_segment, iter_records
+
+INDEX_FILE = os.path.join(SAVES_DIR, "history.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    offset INTEGER NOT NULL DEFAULT 0,
+    length INTEGER,
+    timestamp TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    difficulty TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL,
+    UNIQUE (path, offset)
+);
+CREATE INDEX IF NOT EXISTS games_by_time ON games (timestamp DESC);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def get_difficulty(width, height, mines):
+    if width == 9 and height == 9 and mines == 10:
+        return "Easy"
+    elif width == 16 and height == 16 and mines == 40:
+        return "Medium"
+    elif width == 30 and height == 16 and mines == 99:
+        return "Hard"
+    return "Custom"
+
+
+class HistoryIndex:
+    # SQLite index of archived games, so the history list can be shown
+    # without opening every save. Until one rebuild has finished, the index
+    # picks up the saves already in the Saves folder each time it is opened.
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self.connect() as db:
+            db.executescript(SCHEMA)
+            indexed = db.execute("SELECT 1 FROM meta WHERE key = 'saves_indexed'").fetchone()
+        if not indexed:
+            self.rebuild()
+
+    @contextmanager
+    def connect(self):
+        # One short-lived connection per call, committed on success
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.row_factory = sqlite3.Row
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def add(self, path, timestamp, width, height, mines, outcome, duration, offset=0, length=None):
+        # Record one archived game
+        self.add_many([(path, timestamp, width, height, mines, outcome, duration, offset, length)])
+
+    def add_many(self, games):
+        # Record archived games, given as tuples of add()'s arguments, in
+        # one transaction
+        self.replace([], games)
+
+    def replace(self, paths, games):
+        # Drop the games stored in `paths` and record `games` in one
+        # transaction, e.g. when loose saves move into a segment
+        with self.connect() as db:
+            db.executemany("DELETE FROM games WHERE path = ?",
+                           [(os.path.normpath(path),) for path in paths])
+            self.insert(db, games)
+
+    @staticmethod
+    def insert(db, games):
+        db.executemany(
+            "INSERT OR REPLACE INTO games (path, offset, length, timestamp, width, height,"
+            " mines, difficulty, outcome, duration) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(os.path.normpath(path), offset, length, timestamp, width, height, mines,
+              get_difficulty(width, height, mines), outcome, duration)
+             for path, timestamp, width, height, mines, outcome, duration, offset, length in games])
+
+    def games(self, limit=None):
+        # Archived games, newest first
+        query = "SELECT * FROM games ORDER BY timestamp DESC"
+        params = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+        with self.connect() as db:
+            return [dict(row) for row in db.execute(query, params)]
+
+    def rebuild(self, saves_dir=SAVES_DIR):
+        # Index every save in `saves_dir` that is not indexed yet. The games
+        # and the saves_indexed marker are committed together, so a rebuild
+        # that is cut short runs again the next time the index is opened.
+        with self.connect() as db:
+            known = {row[0] for row in db.execute("SELECT path FROM games")}
+        games = []
+        for filename in sorted(os.listdir(saves_dir)):
+            path = os.path.normpath(os.path.join(saves_dir, filename))
+            if path in known:
+                continue
+            if is_segment(path):
+                games.extend(segment_entries(path))
+                continue
+            if not filename.endswith((".json", ".sav")):
+                continue
+            try:
+                data = read_save(path)
+            except (OSError, ValueError):
+                continue
+            games.append(index_entry(path, data, 0, os.path.getsize(path)))
+        with self.connect() as db:
+            self.insert(db, games)
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('saves_indexed', '1')")
+
+
+def index_entry(path, data, offset, length):
+    # add() arguments for an archived game read from `path`
+    return (path, data['timestamp'], data['width'], data['height'], data['mines'],
+            outcome_of(data), data.get('duration'), offset, length)
+
+
+def segment_entries(path):
+    # add() arguments for every game in a segment, up to the first bad record
+    games = []
+    try:
+        for offset, length, name, data in iter_records(path):
+            games.append(index_entry(path, parse_save(data, name), offset, length))
+    except (OSError, ValueError):
+        pass
+    return games
+
+
+def outcome_of(game_data):
+    # 'lost' if a mine was revealed, 'won' otherwise. Chunked saves hold no
+    # board, but only a lost game has game_over set.
+    if 'board' not in game_data:
+        return "lost" if game_data['game_over'] else "won"
+    for board_row, revealed_row in zip(game_data['board'], game_data['revealed']):
+        for value, revealed in zip(board_row, revealed_row):
+            if value == -1 and revealed:
+                return "lost"
+    return "won"
@@ -0,0 +1,215 @@
+import cProfile
+import functools
+import importlib
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Trace events kept for the Chrome trace; older ones are dropped
+MAX_TRACE_EVENTS = 200000
+
+# Histogram buckets are powers of two: bucket b holds values in
+# [2 ** (b - 1), 2 ** b), with durations in microseconds
+BUCKETS = 40
+
+# (module, class, method, items) for every timed hot path. `items(self,
+# result)` gives the cells visited or widgets configured by one call.
+PROBES = [
+    ('game', 'Game', 'reveal', lambda game, result: len(result)),
+    ('game', 'Game', 'toggle_flag', None),
+    ('game', 'Game', 'place_mines', lambda game, result: game.mines),
+    ('game', 'Game', 'check_win', None),
+    ('game', 'Game', 'save_game', None),
+    ('game', 'Game', 'write_save', None),
+    ('game', 'Game', 'write_archive', None),
+    ('game', 'Game', 'load_game', None),
+    ('game_window', 'GameWindow', 'left_click', None),
+    ('game_window', 'GameWindow', 'right_click', None),
+    ('game_window', 'GameWindow', 'on_game_events', lambda window, queued: queued),
+    ('game_window', 'GameWindow', 'repaint_slice', lambda window, touched: touched),
+    ('game_window', 'GameWindow', 'setup_ui', lambda window, result: len(window.board_view.items)),
+    ('board_canvas', 'BoardCanvas', '__init__', lambda canvas, result: len(canvas.items)),
+    ('board_canvas', 'BoardCanvas', 'refresh_view', lambda canvas, result: len(canvas.items)),
+]
+
+
+def bucket(value: int) -> int:
+    return min(value.bit_length(), BUCKETS - 1)
+
+
+def bucket_label(b: int) -> str:
+    return f"<{2 ** b}"
+
+
+class EventStats:
+    # Calls, time and items of one event, with log2 histograms of both
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.items = 0
+        self.max_items = 0
+        self.latency = [0] * BUCKETS  # microseconds
+        self.item_counts = [0] * BUCKETS
+
+    def add(self, duration_ns: int, items: int):
+        self.calls += 1
+        self.total_ns += duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+        self.latency[bucket(duration_ns // 1000)] += 1
+        if items is not None:
+            self.items += items
+            self.max_items = max(self.max_items, items)
+            self.item_counts[bucket(items)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        # Upper bound of the histogram bucket holding the percentile, in ms
+        seen = 0
+        for b, count in enumerate(self.latency):
+            seen += count
+            if seen >= fraction * self.calls:
+                return 2 ** b / 1000
+        return self.max_ns / 1e6
+
+    def summary(self) -> dict:
+        return {
+            'calls': self.calls,
+            'total_ms': self.total_ns / 1e6,
+            'mean_ms': self.total_ns / 1e6 / self.calls if self.calls else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'max_ms': self.max_ns / 1e6,
+            'items': self.items,
+            'max_items': self.max_items,
+            'latency_us': {bucket_label(b): n for b, n in enumerate(self.latency) if n},
+            'items_per_call': {bucket_label(b): n for b, n in enumerate(self.item_counts) if n},
+        }
+
+
+class Recorder:
+    # Collects timed events from the installed probes
+    def __init__(self, max_trace_events: int = MAX_TRACE_EVENTS):
+        self.events = {}
+        self.trace = deque(maxlen=max_trace_events)
+        self.origin = time.perf_counter_ns()
+        self.lock = threading.Lock()
+
+    def record(self, name: str, start_ns: int, end_ns: int, items: int = None):
+        with self.lock:
+            stats = self.events.get(name)
+            if stats is None:
+                stats = self.events[name] = EventStats()
+            stats.add(end_ns - start_ns, items)
+            self.trace.append((name, start_ns, end_ns, threading.get_ident(), items))
+
+    def summary(self) -> dict:
+        with self.lock:
+            return {name: stats.summary() for name, stats in sorted(self.events.items())}
+
+    def export_json(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def export_chrome_trace(self, path: str):
+        # Complete ("X") events, loadable in chrome://tracing or Perfetto
+        pid = os.getpid()
+        with self.lock:
+            events = [{'name': name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                       'ts': (start - self.origin) / 1000, 'dur': (end - start) / 1000,
+                       'args': {} if items is None else {'items': items}}
+                      for name, start, end, tid, items in self.trace]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def format_summary(self) -> str:
+        lines = [f"{'event':<32} {'calls':>7} {'mean':>9} {'p95':>9} {'max':>9} {'items':>9}"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<32} {stats['calls']:>7} {stats['mean_ms']:>7.2f}ms "
+                         f"{stats['p95_ms']:>7.2f}ms {stats['max_ms']:>7.2f}ms {stats['items']:>9}")
+        return "\n".join(lines)
+
+
+recorder = None
+_originals = []
+
+
+def timed(name: str, function, items=None):
+    # Wrap `function` so every call is recorded under `name`
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        result = function(*args, **kwargs)
+        end = time.perf_counter_ns()
+        count = items(args[0], result) if items is not None and args else None
+        recorder.record(name, start, end, count)
+        return result
+    return wrapper
+
+
+def enable(probes=PROBES) -> Recorder:
+    # Install the probes. Nothing is wrapped until this is called, so
+    # instrumentation costs nothing when it is off.
+    global recorder
+    if recorder is not None:
+        return recorder
+    recorder = Recorder()
+    for module_name, class_name, method, items in probes:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        original = cls.__dict__[method]
+        name = f"{class_name}.{method}"
+        if isinstance(original, classmethod):
+            patched = classmethod(timed(name, original.__func__))
+        else:
+            patched = timed(name, original, items)
+        setattr(cls, method, patched)
+        _originals.append((cls, method, original))
+    return recorder
+
+
+def disable():
+    # Restore the original methods
+    global recorder
+    while _originals:
+        cls, method, original = _originals.pop()
+        setattr(cls, method, original)
+    recorder = None
+
+
+@contextmanager
+def profile_session(path: str):
+    # Run the body under cProfile and dump the stats to `path`
+    # (read them with `python -m pstats path`). Threads started in the body,
+    # such as the game engine worker and the background saver, get their
+    # own profiler, and their stats are merged into the same file.
+    profiler = cProfile.Profile()
+    thread_profilers = []
+    lock = threading.Lock()
+
+    def profile_thread(frame, event, arg):
+        # First profile event of a new thread: replace this hook with a profiler
+        sys.setprofile(None)
+        thread_profiler = cProfile.Profile()
+        try:
+            thread_profiler.enable()
+        except ValueError:
+            return  # Python 3.12+: the session's profiler already sees every thread
+        with lock:
+            thread_profilers.append(thread_profiler)
+
+    threading.setprofile(profile_thread)
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        threading.setprofile(None)
+        stats = pstats.Stats(profiler)
+        with lock:
+            for thread_profiler in thread_profilers:
+                stats.add(thread_profiler)
+        stats.dump_stats(path)
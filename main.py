@@ -1,14 +1,71 @@
+import time
+STARTED = time.perf_counter()  # before the other imports, for the startup timing
+
 import tkinter as tk
+import argparse
+import logging
+import os
+import sys
+from contextlib import nullcontext
+import autosave
 from menu import MenuWindow
 
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    # Each flag can also be set through its environment variable
+    parser = argparse.ArgumentParser(description="Minesweeper")
+    parser.add_argument('--instrument', metavar='PATH', default=os.environ.get('MINESWEEPER_INSTRUMENT'),
+                        help="time the hot paths and write per-event histograms to PATH as JSON")
+    parser.add_argument('--trace', metavar='PATH', default=os.environ.get('MINESWEEPER_TRACE'),
+                        help="time the hot paths and write a Chrome trace to PATH")
+    parser.add_argument('--cprofile', metavar='PATH', default=os.environ.get('MINESWEEPER_CPROFILE'),
+                        help="run the session under cProfile and dump the stats to PATH")
+    parser.add_argument('--startup-only', action='store_true',
+                        help="print the time to the first frame and quit")
+    return parser.parse_args()
+
+
+def on_first_frame(root, quit_after):
+    # Called once the menu has been drawn
+    elapsed = (time.perf_counter() - STARTED) * 1000
+    logger.info("first frame after %.1f ms", elapsed)
+    if quit_after:
+        print(f"first frame after {elapsed:.1f} ms")
+        root.destroy()
+
 
 def main():
+    # Set MINESWEEPER_LOG=DEBUG to see per-click repaint timings, INFO for
+    # the startup time
+    logging.basicConfig(level=os.environ.get('MINESWEEPER_LOG', 'WARNING').upper())
+    args = parse_args()
+    recorder = None
+    if args.instrument or args.trace or args.cprofile:
+        import instrument
+        recorder = instrument.enable() if args.instrument or args.trace else None
+
     # Create and start the main application window
-    root = tk.Tk()
-    root.title("Minesweeper")
-    MenuWindow(root)
-    root.mainloop()
+    with instrument.profile_session(args.cprofile) if args.cprofile else nullcontext():
+        root = tk.Tk()
+        root.title("Minesweeper")
+        MenuWindow(root)
+        # The first Expose is the menu being mapped; it is drawn by the idle
+        # handlers queued with it
+        expose = root.bind('<Expose>', lambda event: [
+            root.unbind('<Expose>', expose),
+            root.after_idle(on_first_frame, root, args.startup_only)])
+        root.mainloop()
+        autosave.shutdown()
+
+    if recorder:
+        if args.instrument:
+            recorder.export_json(args.instrument)
+        if args.trace:
+            recorder.export_chrome_trace(args.trace)
+        print(recorder.format_summary(), file=sys.stderr)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
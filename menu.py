@@ -1,14 +1,32 @@
 import tkinter as tk
-from game_window import GameWindow
-from scoreboard import ScoreboardWindow
-from history import HistoryWindow
+import importlib
 import os
+from paths import LEGACY_SAVE_FILE, SAVE_FILE
+
+# Each screen's module is imported the first time it is opened, or in idle
+# time once the menu is on screen, so nothing but the menu loads before
+# the first frame
+SCREEN_MODULES = ['game_window', 'history', 'scoreboard']
+PRELOAD_DELAY = 100  # milliseconds after the menu is built
+
+DIFFICULTIES = {
+    "Easy": (9, 9, 10),
+    "Medium": (16, 16, 40),
+    "Hard": (30, 16, 99)
+}
+
+
+def screen(module, name):
+    return getattr(importlib.import_module(module), name)
 
 
 class MenuWindow:
     def __init__(self, master):
         self.master = master
+        self.no_guess = tk.BooleanVar(master, value=False)
         self.setup_ui()
+        self.preload = list(SCREEN_MODULES)
+        self.master.after(PRELOAD_DELAY, self.preload_next)
 
     def setup_ui(self):
         # Create main menu frame
@@ -23,8 +41,10 @@ class MenuWindow:
         tk.Button(self.frame, text="Start Game",
                  command=self.show_difficulty_selection).pack(pady=10)
 
-        tk.Button(self.frame, text="Continue Game",
-                 command=self.continue_game).pack(pady=10)
+        self.continue_button = tk.Button(self.frame, text="Continue Game",
+                                         command=self.continue_game)
+        self.continue_button.pack(pady=10)
+        self.update_continue()
 
         tk.Button(self.frame, text="Game History",
                  command=self.show_history).pack(pady=10)
@@ -32,10 +52,24 @@ class MenuWindow:
         tk.Button(self.frame, text="High Scores",
                  command=self.show_scoreboard).pack(pady=10)
 
+    def update_continue(self):
+        # Only a file existence check: the save is read when the game loads
+        saved = os.path.exists(SAVE_FILE) or os.path.exists(LEGACY_SAVE_FILE)
+        self.continue_button.config(state=tk.NORMAL if saved else tk.DISABLED)
+
+    def preload_next(self):
+        # Import one screen module per idle slot, so the menu stays responsive.
+        # Nothing is opened or created: the history index is built when the
+        # history is first shown.
+        if not self.preload:
+            return
+        importlib.import_module(self.preload.pop(0))
+        self.master.after_idle(self.preload_next)
+
     def continue_game(self):
         # Load and continue saved game
         self.frame.pack_forget()
-        GameWindow(self.master, load_saved=True, return_to_menu=self.show_menu)
+        screen('game_window', 'GameWindow')(self.master, load_saved=True, return_to_menu=self.show_menu)
 
     def show_difficulty_selection(self):
         # Show difficulty selection screen
@@ -46,34 +80,41 @@ class MenuWindow:
         tk.Label(diff_frame, text="Select Difficulty",
                 font=("Arial", 18)).pack(pady=20)
 
-        difficulties = {
-            "Easy": (9, 9, 10),
-            "Medium": (16, 16, 40),
-            "Hard": (30, 16, 99)
-        }
-
-        for diff, (width, height, mines) in difficulties.items():
+        for diff, (width, height, mines) in DIFFICULTIES.items():
             tk.Button(
                 diff_frame,
                 text=diff,
                 command=lambda w=width, h=height, m=mines: self.start_game(w, h, m, diff_frame)
             ).pack(pady=5)
 
+        tk.Checkbutton(diff_frame, text="No guessing", variable=self.no_guess,
+                       command=self.toggle_no_guess).pack(pady=10)
+
+    def toggle_no_guess(self):
+        # Boards are generated in the background from the moment the option
+        # is ticked, so the first click finds one ready
+        if self.no_guess.get():
+            pool = screen('no_guess', 'default_pool')()
+            for width, height, mines in DIFFICULTIES.values():
+                pool.warm(width, height, mines)
+
     def start_game(self, width, height, mines, diff_frame):
         # Start new game with selected difficulty
         diff_frame.destroy()
-        GameWindow(self.master, width, height, mines, self.show_menu)
+        screen('game_window', 'GameWindow')(self.master, width, height, mines, self.show_menu,
+                                            no_guess=self.no_guess.get())
 
     def show_scoreboard(self):
         # Show high scores screen
         self.frame.pack_forget()
-        ScoreboardWindow(self.master, self.show_menu)
+        screen('scoreboard', 'ScoreboardWindow')(self.master, self.show_menu)
 
     def show_history(self):
         # Show game history screen
         self.frame.pack_forget()
-        HistoryWindow(self.master, self.show_menu)
+        screen('history', 'HistoryWindow')(self.master, self.show_menu)
 
     def show_menu(self):
         # Show main menu
+        self.update_continue()
         self.frame.pack(expand=True, padx=20, pady=20)
\ No newline at end of file
@@ -0,0 +1,29 @@
+from typing import Tuple
+
+# A move is one 64-bit record:
+#   bits  0-39  flat cell index (y * width + x)
+#   bits 40-41  kind
+#   bits 42-63  milliseconds since the previous move, capped at MAX_DELTA_MS
+MOVE_REVEAL = 0
+MOVE_FLAG = 1
+MOVE_CHORD = 2
+
+MOVE_NAMES = {MOVE_REVEAL: 'reveal', MOVE_FLAG: 'flag', MOVE_CHORD: 'chord'}
+
+INDEX_BITS = 40
+KIND_BITS = 2
+INDEX_MASK = (1 << INDEX_BITS) - 1
+KIND_MASK = (1 << KIND_BITS) - 1
+DELTA_SHIFT = INDEX_BITS + KIND_BITS
+MAX_DELTA_MS = (1 << (64 - DELTA_SHIFT)) - 1
+
+
+def pack_move(index: int, kind: int, delta: float) -> int:
+    # `delta` is in seconds
+    delta_ms = min(int(delta * 1000), MAX_DELTA_MS)
+    return (delta_ms << DELTA_SHIFT) | (kind << INDEX_BITS) | index
+
+
+def unpack_move(record: int) -> Tuple[int, int, int]:
+    # (cell index, kind, milliseconds since the previous move)
+    return record & INDEX_MASK, (record >> INDEX_BITS) & KIND_MASK, record >> DELTA_SHIFT
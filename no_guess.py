@@ -0,0 +1,224 @@
+import atexit
+import multiprocessing
+import os
+import random
+import threading
+import time
+from array import array
+from collections import defaultdict, deque
+
+from game import Game, sample_mine_indices
+from solver import Solver
+
+# No-guess boards: layouts the solver clears from the first click without
+# ever guessing. Random layouts are resampled, or repaired by moving a mine
+# off the cells where the solver got stuck, until one is solved.
+MAX_ATTEMPTS = 500
+REPAIRS = 5  # mine moves tried on a layout before drawing a new one
+
+# Ready boards kept per (width, height, mines, position class)
+CACHE_BOARDS = 8
+
+# Mirror images of a board: (flip x, flip y)
+FLIPS = ((False, False), (True, False), (False, True), (True, True))
+
+
+def position_class(width: int, height: int, x: int, y: int):
+    # Cells up to mirroring: distance to the nearest side, 2 and more alike
+    return min(x, width - 1 - x, 2), min(y, height - 1 - y, 2)
+
+
+def class_cells(width: int, height: int, position):
+    # Every cell of a position class
+    return [(x, y) for y in range(height) for x in range(width)
+            if position_class(width, height, x, y) == position]
+
+
+def flip_index(i: int, width: int, height: int, flip_x: bool, flip_y: bool) -> int:
+    y, x = divmod(i, width)
+    return (height - 1 - y if flip_y else y) * width + (width - 1 - x if flip_x else x)
+
+
+def solve(width: int, height: int, mines: int, mine_indices: array, first_x: int, first_y: int):
+    # Play the layout with the solver only. Returns the finished game and
+    # the zero cells opened by the first click.
+    game = Game(width, height, mines, 'packed', persist=False)
+    game.moves = None
+    game.first_move = False
+    game.mine_indices = mine_indices
+    game.cells.lay_mines(mine_indices)
+    cells = game.cells
+    opened = game.reveal(first_x, first_y).cells
+    zeros = frozenset(i for i in opened if cells.get(i % width, i // width) == 0)
+    Solver(game).solve()
+    return game, zeros
+
+
+def repair(rng: random.Random, game: Game, mine_indices: array):
+    # Move one mine the solver could not place into the cells it has not
+    # reached yet, or None when there is no such move
+    cells, width = game.cells, game.width
+    mines = set(mine_indices)
+
+    def reached(i):
+        x, y = i % width, i // width
+        return cells.is_revealed(x, y) or any(cells.is_revealed(nx, ny) for nx, ny in cells.neighbors(x, y))
+
+    stuck = [i for i in mines if reached(i) and not cells.is_flagged(i % width, i // width)]
+    unreached = [i for i in range(width * game.height) if i not in mines and not reached(i)]
+    if not stuck or not unreached:
+        return None
+    mines.remove(rng.choice(stuck))
+    mines.add(rng.choice(unreached))
+    return array('q', sorted(mines))
+
+
+def generate(rng: random.Random, width: int, height: int, mines: int, first_x: int, first_y: int,
+             max_attempts: int = MAX_ATTEMPTS):
+    # (mine indices, zero cells opened by the first click, attempts) of a
+    # no-guess board, or None after max_attempts solver runs
+    attempts = 0
+    while attempts < max_attempts:
+        mine_indices = sample_mine_indices(rng, width, height, mines, first_x, first_y)
+        for _ in range(REPAIRS + 1):
+            game, zeros = solve(width, height, mines, mine_indices, first_x, first_y)
+            attempts += 1
+            if game.status == 'won':
+                return mine_indices, zeros, attempts
+            mine_indices = repair(rng, game, mine_indices) if attempts < max_attempts else None
+            if mine_indices is None:
+                break
+    return None
+
+
+def generate_board(task):
+    # Worker: one no-guess board for a cache key, with a random first click
+    # of its position class
+    key, seed = task
+    width, height, mines, position = key
+    rng = random.Random(seed)
+    start = time.process_time()
+    first_x, first_y = rng.choice(class_cells(width, height, position))
+    board = generate(rng, width, height, mines, first_x, first_y)
+    return key, board, time.process_time() - start
+
+
+def lower_priority():
+    # Pool workers yield to the game
+    if hasattr(os, 'nice'):
+        os.nice(10)
+
+
+class BoardPool:
+    # Generates no-guess boards in a process pool and keeps up to
+    # CACHE_BOARDS ready per (width, height, mines, position class). A
+    # cached board suits any first click on one of the zero cells its own
+    # first click opened, in any of its mirror images: that click opens the
+    # same region, so the solver plays the same game from there.
+    def __init__(self, workers: int = None, cache_boards: int = CACHE_BOARDS):
+        self.workers = workers or max((os.cpu_count() or 1) - 1, 1)
+        self.cache_boards = cache_boards
+        self.lock = threading.Lock()
+        self.cache = defaultdict(deque)  # key -> (mine indices, zeros)
+        self.pending = defaultdict(int)  # key -> boards being generated
+        self.rng = random.Random()
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.failed = 0
+        self.generation_seconds = 0.0
+        # Spawned, not forked: the workers never inherit the Tk process
+        self.pool = multiprocessing.get_context('spawn').Pool(self.workers, lower_priority)
+
+    def warm(self, width: int, height: int, mines: int):
+        # Start filling the cache of every position class of a board size
+        positions = {position_class(width, height, x, y) for y in range(height) for x in range(width)}
+        for position in sorted(positions):
+            self.refill((width, height, mines, position))
+
+    def refill(self, key):
+        with self.lock:
+            wanted = self.cache_boards - len(self.cache[key]) - self.pending[key]
+            self.pending[key] += max(wanted, 0)
+            seeds = [self.rng.randrange(2 ** 63) for _ in range(wanted)]
+        for seed in seeds:
+            self.pool.apply_async(generate_board, ((key, seed),), callback=self.add,
+                                  error_callback=lambda error, key=key: self.add((key, None, 0.0)))
+
+    def add(self, result):
+        # Pool callback, on the pool's result thread
+        key, board, seconds = result
+        with self.lock:
+            self.pending[key] -= 1
+            self.generation_seconds += seconds
+            if board is None:
+                self.failed += 1  # the next take() for the key tries again
+                return
+            mine_indices, zeros, _ = board
+            self.generated += 1
+            self.cache[key].append((mine_indices, zeros))
+
+    def take(self, width: int, height: int, mines: int, first_x: int, first_y: int):
+        # Mine indices of a cached board that suits this first click, or
+        # None. Boards of the click's own class are tried first.
+        own = (width, height, mines, position_class(width, height, first_x, first_y))
+        board = None
+        with self.lock:
+            keys = [own] + [key for key in self.cache if key[:3] == own[:3] and key != own]
+            for key in keys:
+                board = self.find(self.cache[key], width, height, first_y * width + first_x)
+                if board is not None:
+                    break
+            if board is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        self.refill(own)
+        if board is not None:
+            self.refill(key)
+        return board
+
+    @staticmethod
+    def find(boards: deque, width: int, height: int, first: int):
+        # Remove and return the first board with `first` among its zeros,
+        # mirrored to fit
+        for n, (mine_indices, zeros) in enumerate(boards):
+            for flip_x, flip_y in FLIPS:
+                if flip_index(first, width, height, flip_x, flip_y) in zeros:
+                    del boards[n]
+                    if flip_x or flip_y:
+                        mine_indices = array('q', sorted(flip_index(i, width, height, flip_x, flip_y)
+                                                         for i in mine_indices))
+                    return mine_indices
+        return None
+
+    def stats(self) -> dict:
+        with self.lock:
+            served = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / served if served else None,
+                'generated': self.generated,
+                'failed': self.failed,
+                'generation_seconds': self.generation_seconds,
+                'cached': sum(len(boards) for boards in self.cache.values()),
+                'pending': sum(self.pending.values()),
+            }
+
+    def close(self):
+        # Cached boards are not worth waiting for
+        self.pool.terminate()
+        self.pool.join()
+
+
+_default_pool = None
+
+
+def default_pool():
+    # The pool shared by every window, started on first use
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = BoardPool()
+        atexit.register(_default_pool.close)
+    return _default_pool
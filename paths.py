@@ -0,0 +1,6 @@
+# Where the game keeps its files, relative to the working directory. This
+# module imports nothing, so the menu can look for a saved game without
+# loading the game itself.
+SAVE_FILE = 'saved_game.sav'
+LEGACY_SAVE_FILE = 'saved_game.json'
+SAVES_DIR = 'Saves'
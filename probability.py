@@ -0,0 +1,129 @@
+from math import exp, lgamma
+from typing import Dict
+
+from solver import MAX_COMPONENT, Solver, split_components
+
+
+def log_comb(n: int, k: int) -> float:
+    return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+
+
+def convolve(a: Dict[int, float], b: Dict[int, float]) -> Dict[int, float]:
+    # Combine two {mines: ways} distributions
+    result = {}
+    for i, x in a.items():
+        for j, y in b.items():
+            result[i + j] = result.get(i + j, 0) + x * y
+    return result
+
+
+class ProbabilityEngine:
+    # Per-cell mine probability for a Game position, from the revealed
+    # numbers, the flags and the total mine count. The unknown frontier is
+    # split into independent components. Each component is counted exactly,
+    # for every number of mines it could hold. Components are then weighted
+    # by the ways to place the remaining mines in the interior, computed in
+    # log space. Component counts are memoized by the solver under a
+    # canonical signature, so after a click only changed components are
+    # recounted.
+    def __init__(self, game, max_component: int = MAX_COMPONENT):
+        self.game = game
+        self.solver = Solver(game, max_component)
+
+    def notice(self, changed):
+        # Track cells revealed or flagged since the last query
+        self.solver.notice(changed)
+
+    def refresh(self):
+        self.solver.refresh()
+
+    def probabilities(self) -> Dict[int, float]:
+        # Mine probability of every unknown cell, keyed by flat index.
+        # Cells not listed share interior_probability().
+        return self.query()[0]
+
+    def interior_probability(self) -> float:
+        return self.query()[1]
+
+    def query(self):
+        # (probabilities of the frontier cells, probability of any interior cell)
+        game = self.game
+        deductions, constraints = self.solver.reduce()
+        probabilities = {i: 0.0 for i in deductions.safe}
+        probabilities.update({i: 1.0 for i in deductions.mines})
+
+        exact = []
+        approximate = []
+        for component in split_components(list(constraints)):
+            cells = set().union(*(cells for cells, _ in component))
+            if len(cells) > self.solver.max_component:
+                approximate.append(component)
+            else:
+                exact.append(self.solver.solve_component(component))
+
+        # Components too large to count get a local estimate: the highest
+        # mine ratio among the constraints touching each cell
+        approximate_cells = set()
+        for component in approximate:
+            for cells, need in component:
+                ratio = need / len(cells)
+                for c in cells:
+                    probabilities[c] = max(probabilities.get(c, 0.0), ratio)
+                    approximate_cells.add(c)
+        expected = sum(probabilities[c] for c in approximate_cells)
+
+        unknown = game.width * game.height - game.revealed_count - game.flag_count
+        interior = unknown - len(probabilities) - sum(len(result.cells) for result in exact)
+        remaining = game.mines - game.flag_count - len(deductions.mines) - round(expected)
+
+        # Ways to place the remaining mines in the interior when the
+        # components hold m of them, in log space and scaled so the largest
+        # weight is 1; exact binomials of this size are too slow to multiply
+        top = sum(max(result.totals) for result in exact)
+        logs = [log_comb(interior, remaining - mines) if 0 <= remaining - mines <= interior else None
+                for mines in range(top + 1)]
+        peak = max((value for value in logs if value is not None), default=None)
+        if peak is None:
+            raise ValueError("The revealed numbers and flags do not fit the mine count")
+        interior_weights = [exp(value - peak) if value is not None else 0.0 for value in logs]
+
+        # Each component's counts as a distribution over its mine count
+        distributions = []
+        for result in exact:
+            solutions = sum(result.totals.values())
+            distributions.append({mines: ways / solutions for mines, ways in result.totals.items()})
+
+        # after[n][t]: weight of every placement of components n and later
+        # and of the interior, given t mines in the components before n
+        after = [interior_weights]
+        for distribution in reversed(distributions):
+            following = after[-1]
+            after.append([sum(p * following[t + mines] for mines, p in distribution.items()
+                              if t + mines <= top)
+                          for t in range(top + 1)])
+        after.reverse()
+        total = after[0][0]
+        if not total > 0:
+            raise ValueError("The revealed numbers and flags do not fit the mine count")
+
+        before = {0: 1.0}  # distribution of mines in the components before n
+        for n, result in enumerate(exact):
+            following = after[n + 1]
+            solutions = sum(result.totals.values())
+            mine_weights = [0.0] * len(result.cells)
+            for mines, hits in result.hits.items():
+                weight = sum(p * following[t + mines] for t, p in before.items()) / solutions
+                if weight:
+                    for j, count in enumerate(hits):
+                        mine_weights[j] += count * weight
+            for cell, weight in zip(result.cells, mine_weights):
+                probabilities[cell] = weight / total
+            before = convolve(before, distributions[n])
+
+        if interior:
+            interior_mines = sum(p * interior_weights[mines] * (remaining - mines)
+                                 for mines, p in before.items())
+            interior_probability = interior_mines / (interior * total)
+        else:
+            interior_probability = 0.0
+        return probabilities, interior_probability
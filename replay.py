@@ -0,0 +1,104 @@
+from array import array
+from typing import List, Optional
+
+from game import Game
+from events import CellsRevealed, FlagToggled
+from move_log import MOVE_FLAG, unpack_move
+
+# Moves between two keyframes: seeking replays at most this many moves
+KEYFRAME_EVERY = 64
+
+
+class Replay:
+    # Rebuilds the position after any number of moves of a recorded game.
+    # Every KEYFRAME_EVERY moves a copy of the game is kept, so a seek
+    # starts from the nearest keyframe at or before the target, or from
+    # the current position when that is closer.
+    def __init__(self, width: int, height: int, mines: int, mine_indices, moves,
+                 engine: str = 'packed', keyframe_every: int = KEYFRAME_EVERY,
+                 seed: Optional[int] = None):
+        self.moves = moves
+        self.keyframe_every = keyframe_every
+
+        # Without mine indices the mines come from the seed and the first
+        # click, as they did in the game (chunked boards)
+        game = Game(width, height, mines, engine, seed=seed, persist=False)
+        game.moves = None
+        if mine_indices is not None:
+            game.mine_indices = array('q', sorted(mine_indices))
+            game.cells.lay_mines(game.mine_indices)
+            game.first_move = False
+        self.game = game
+        self.position = 0
+        self.changes = set()
+
+        # Play the game through once, keeping a copy at each keyframe
+        self.keyframes: List[Game] = []
+        for n in range(len(moves)):
+            if n % keyframe_every == 0:
+                self.keyframes.append(game.snapshot())
+            self.apply(moves[n])
+        self.position = len(moves)
+        if len(moves) % keyframe_every == 0:
+            self.keyframes.append(game.snapshot())
+        game.subscribe(self.collect)
+
+    @classmethod
+    def from_save(cls, game_data: dict):
+        # A replay of a save as returned by save_format.read_save, or None
+        # when the save has no move log. It runs on the game's own engine:
+        # a chord stops at the first mine it opens, and the engines visit
+        # neighbors in different orders.
+        if not game_data.get('moves'):
+            return None
+        width = game_data['width']
+        engine = game_data.get('engine', 'list')
+        if engine == 'chunked':
+            return cls(width, game_data['height'], game_data['mines'], None,
+                       game_data['moves'], 'chunked', seed=game_data['seed'])
+        return cls(width, game_data['height'], game_data['mines'],
+                   [y * width + x for x, y in game_data['mine_positions']],
+                   game_data['moves'], engine)
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def apply(self, record: int):
+        index, kind, _ = unpack_move(record)
+        y, x = divmod(index, self.game.width)
+        if kind == MOVE_FLAG:
+            self.game.toggle_flag(x, y)
+        else:
+            self.game.reveal(x, y)
+
+    def collect(self, events):
+        # Cells changed by the moves applied since the last seek
+        for event in events:
+            if isinstance(event, CellsRevealed):
+                self.changes.update(event.cells)
+            elif isinstance(event, FlagToggled):
+                self.changes.add(event.index)
+
+    def delay(self, n: int) -> float:
+        # Seconds the player took before move n
+        return unpack_move(self.moves[n])[2] / 1000
+
+    def seek(self, target: int) -> Optional[List[int]]:
+        # Move to the position after `target` moves. Returns the cells that
+        # changed, or None when the whole board was restored.
+        target = max(0, min(target, len(self.moves)))
+        restored = False
+        keyframe = target // self.keyframe_every
+        if target < self.position or target - self.position > target - keyframe * self.keyframe_every:
+            self.game = self.keyframes[keyframe].snapshot()
+            self.game.subscribe(self.collect)
+            self.position = keyframe * self.keyframe_every
+            restored = True
+        while self.position < target:
+            self.apply(self.moves[self.position])
+            self.position += 1
+        changes, self.changes = self.changes, set()
+        return None if restored else sorted(changes)
+
+    def step(self, count: int = 1) -> Optional[List[int]]:
+        return self.seek(self.position + count)
@@ -0,0 +1,216 @@
+import json
+import struct
+import sys
+from array import array
+from board import ListBoard
+
+# Binary save layout (little endian):
+#   header  magic, version, flags, engine, width, height, mines, seed,
+#           revealed_count, flag_count, safe_remaining, timestamp, from
+#           version 2 seconds played and from version 3 the move count
+#   planes  mine, revealed and flagged bits, one bit per cell in row-major
+#           order, most significant bit first, each padded to whole bytes
+#   tiles   from version 4 and only for the chunked engine, in place of the
+#           planes: tile size, first click and tile count, then for every
+#           tile with a revealed or flagged cell its position and revealed
+#           and flagged bits. Mines are not stored; they come from the seed.
+#   moves   from version 3, one 64-bit record per move (see move_log)
+MAGIC = b'MSWB'
+VERSION = 4
+HEADER_V1 = struct.Struct('<4sBBBxIIQQQQQ20s')
+HEADER_V2 = struct.Struct('<4sBBBxIIQQQQQ20sd')
+HEADER = struct.Struct('<4sBBBxIIQQQQQ20sdQ')
+HEADERS = {1: HEADER_V1, 2: HEADER_V2, 3: HEADER, 4: HEADER}
+TILES = struct.Struct('<IiiI')
+TILE = struct.Struct('<II')
+
+GAME_OVER_FLAG = 0x01
+FIRST_MOVE_FLAG = 0x02
+
+ENGINE_CODES = {'list': 0, 'packed': 1, 'chunked': 2}
+ENGINE_NAMES = {code: name for name, code in ENGINE_CODES.items()}
+
+_TO_ASCII = bytes.maketrans(b'\x00\x01', b'01')
+_FROM_ASCII = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def pack_bits(plane: bytes) -> bytes:
+    # 0/1 bytes to bits, through a base-2 string so the work stays in C
+    if not plane:
+        return b''
+    plane = bytes(plane) + bytes(-len(plane) % 8)
+    return int(plane.translate(_TO_ASCII), 2).to_bytes(len(plane) // 8, 'big')
+
+
+def unpack_bits(bits, count: int) -> bytes:
+    # Bits back to `count` 0/1 bytes
+    if not count:
+        return b''
+    text = format(int.from_bytes(bits, 'big'), f'0{len(bits) * 8}b')
+    return text.encode('ascii')[:count].translate(_FROM_ASCII)
+
+
+def is_binary(path: str) -> bool:
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_binary(f, game, timestamp: str):
+    # Write a game to a binary file as a header followed by three bit planes
+    flags = (GAME_OVER_FLAG if game.game_over else 0) | (FIRST_MOVE_FLAG if game.first_move else 0)
+    moves = game.moves if game.moves is not None else array('Q')
+    header = HEADER.pack(MAGIC, VERSION, flags, ENGINE_CODES.get(game.engine, 0),
+                         game.width, game.height, game.mines, game.seed,
+                         game.revealed_count, game.flag_count, game.safe_remaining,
+                         timestamp.encode('ascii'), game.duration(), len(moves))
+    f.write(header)
+    if game.cells.lazy_mines:
+        write_tiles(f, game.cells)
+    else:
+        for plane in game.cells.to_planes():
+            f.write(pack_bits(plane))
+    if sys.byteorder == 'big':
+        moves = array('Q', moves)
+        moves.byteswap()
+    f.write(moves.tobytes())
+
+
+def write_tiles(f, cells):
+    # Touched tiles of a ChunkedBoard
+    tiles = list(cells.touched_tiles())
+    first_x, first_y = cells.first_click or (-1, -1)
+    f.write(TILES.pack(cells.tile_size, first_x, first_y, len(tiles)))
+    for tx, ty, revealed, flagged in tiles:
+        f.write(TILE.pack(tx, ty))
+        f.write(pack_bits(revealed))
+        f.write(pack_bits(flagged))
+
+
+def read_tiles(view, offset: int):
+    # Parse write_tiles output at `offset`; returns the tile section and
+    # where it ends
+    tile_size, first_x, first_y, count = TILES.unpack_from(view, offset)
+    offset += TILES.size
+    cells = tile_size * tile_size
+    plane_size = (cells + 7) // 8
+    tiles = []
+    for _ in range(count):
+        tx, ty = TILE.unpack_from(view, offset)
+        offset += TILE.size
+        revealed = unpack_bits(view[offset:offset + plane_size], cells)
+        flagged = unpack_bits(view[offset + plane_size:offset + 2 * plane_size], cells)
+        offset += 2 * plane_size
+        tiles.append((tx, ty, revealed, flagged))
+    section = {
+        'tile_size': tile_size,
+        'first_click': (first_x, first_y) if first_x >= 0 else None,
+        'tiles': tiles,
+    }
+    return section, offset
+
+
+def read_binary(path: str):
+    # One read of the whole file. The planes are decoded into the board's
+    # own cell bytes anyway, so mapping the file would not save a copy.
+    with open(path, 'rb') as f:
+        return parse_binary(f.read(), path)
+
+
+def parse_binary(data, name: str = 'save'):
+    # Header and planes of a binary save held in memory: a whole file or
+    # a record of an archive segment
+    if len(data) < HEADER_V1.size:
+        raise ValueError(f"{name} is not a valid save file")
+    version = data[len(MAGIC)]
+    header = HEADERS.get(version)
+    if data[:len(MAGIC)] != MAGIC or header is None or len(data) < header.size:
+        raise ValueError(f"Unsupported save file: {name}")
+    (magic, version, flags, engine, width, height, mines, seed,
+     revealed_count, flag_count, safe_remaining, timestamp,
+     *extra) = header.unpack_from(data)
+    duration = extra[0] if extra else 0.0
+    move_count = extra[1] if len(extra) > 1 else 0
+
+    with memoryview(data) as view:
+        if ENGINE_NAMES.get(engine) == 'chunked':
+            try:
+                tiles, moves_start = read_tiles(view, header.size)
+            except struct.error:
+                raise ValueError(f"{name} is truncated")
+            planes = None
+        else:
+            tiles = {}
+            count = width * height
+            plane_size = (count + 7) // 8
+            moves_start = header.size + 3 * plane_size
+            if len(data) < moves_start:
+                raise ValueError(f"{name} is truncated")
+            planes = [unpack_bits(view[header.size + n * plane_size:
+                                       header.size + (n + 1) * plane_size], count)
+                      for n in range(3)]
+        if len(data) < moves_start + 8 * move_count:
+            raise ValueError(f"{name} is truncated")
+        moves = array('Q')
+        moves.frombytes(view[moves_start:moves_start + 8 * move_count])
+    if sys.byteorder == 'big':
+        moves.byteswap()
+
+    header = {
+        'width': width,
+        'height': height,
+        'mines': mines,
+        'seed': seed,
+        'engine': ENGINE_NAMES.get(engine, 'list'),
+        'game_over': bool(flags & GAME_OVER_FLAG),
+        'first_move': bool(flags & FIRST_MOVE_FLAG),
+        'revealed_count': revealed_count,
+        'flag_count': flag_count,
+        'safe_remaining': safe_remaining,
+        'timestamp': timestamp.rstrip(b'\0').decode('ascii'),
+        'duration': duration,
+        'moves': moves,
+    }
+    header.update(tiles)
+    return header, planes
+
+
+def mine_indices(plane: bytes):
+    # Flat indices of the set bytes in a 0/1 mine plane
+    indices = []
+    i = plane.find(1)
+    while i != -1:
+        indices.append(i)
+        i = plane.find(1, i + 1)
+    return indices
+
+
+def read_save(path: str) -> dict:
+    # Load either format as the dict layout of a JSON save
+    if not is_binary(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return save_dict(*read_binary(path))
+
+
+def parse_save(data: bytes, name: str = 'save') -> dict:
+    # read_save for a save held in memory
+    if data[:len(MAGIC)] != MAGIC:
+        return json.loads(data)
+    return save_dict(*parse_binary(data, name))
+
+
+def save_dict(header: dict, planes) -> dict:
+    # Add the board lists of a JSON save to a binary header
+    if planes is None:
+        return header  # chunked: touched tiles only, the board is rebuilt from the seed
+    width = header['width']
+    cells = ListBoard(width, header['height'])
+    cells.load_planes(*planes)
+    board, revealed, flagged = cells.to_lists()
+    header.update({
+        'board': board,
+        'revealed': revealed,
+        'flagged': flagged,
+        'mine_positions': [[i % width, i // width] for i in mine_indices(planes[0])],
+    })
+    return header
@@ -1,26 +1,138 @@
 import tkinter as tk
 import json
 import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
 
-SCORES_FILE = "scores.json"
+SCORES_DB = "scores.db"
+LEGACY_SCORES_FILE = "scores.json"  # names only, imported into a new store
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+TOP_N = 10
 
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    mines INTEGER,
+    duration REAL,
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_rank ON scores (difficulty, duration IS NULL, duration, date);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
 
-def load_scores():
-    # Load high scores from file
-    if os.path.exists(SCORES_FILE):
-        with open(SCORES_FILE, 'r') as f:
-            return json.load(f)
-    return {"Easy": [], "Medium": [], "Hard": []}
 
+class ScoreStore:
+    # Every won game, in SQLite. WAL mode lets any number of game
+    # processes add scores at once: each score is one insert in its own
+    # transaction, so none is lost. Leaderboards come from the rank index
+    # and are cached until the database changes, in this process or another.
+    def __init__(self, path=SCORES_DB):
+        self.path = path
+        self.cache = {}  # (difficulty, limit) -> rows
+        self.cache_version = None
+        self.lock = threading.Lock()
+        self.reader = None
+        with self.connect() as db:
+            db.executescript(SCHEMA)
+        self.import_legacy()
 
-def save_score(player_name, difficulty):
+    @contextmanager
+    def connect(self):
+        # One short-lived connection per write, committed on success
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.row_factory = sqlite3.Row
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def import_legacy(self, path=LEGACY_SCORES_FILE):
+        # Names from the old scores.json, once per store. They have no time,
+        # so they rank after every timed score.
+        if not os.path.exists(path):
+            return
+        with open(path) as f:
+            legacy = json.load(f)
+        with self.connect() as db:
+            if db.execute("INSERT OR IGNORE INTO meta VALUES ('legacy_imported', ?)",
+                          (path,)).rowcount:
+                date = datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec='seconds')
+                db.executemany("INSERT INTO scores (name, difficulty, date) VALUES (?, ?, ?)",
+                               [(name, difficulty, date)
+                                for difficulty, names in legacy.items() for name in names])
+
+    def add(self, name, difficulty, width, height, mines, duration, date=None):
+        # Record one won game
+        date = date or datetime.now().isoformat(timespec='seconds')
+        with self.connect() as db:
+            db.execute("INSERT INTO scores (name, difficulty, width, height, mines, duration, date)"
+                       " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (name, difficulty, width, height, mines, duration, date))
+        with self.lock:
+            self.cache.clear()
+
+    def top(self, difficulty, limit=TOP_N):
+        # Fastest games of a difficulty, as dicts with their rank
+        with self.lock:
+            if self.reader is None:
+                self.reader = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+                self.reader.row_factory = sqlite3.Row
+            # data_version changes whenever another connection commits
+            version = self.reader.execute("PRAGMA data_version").fetchone()[0]
+            if version != self.cache_version:
+                self.cache.clear()
+                self.cache_version = version
+            key = (difficulty, limit)
+            if key not in self.cache:
+                rows = self.reader.execute(
+                    "SELECT * FROM scores WHERE difficulty = ?"
+                    " ORDER BY duration IS NULL, duration, date LIMIT ?", (difficulty, limit))
+                self.cache[key] = [dict(row, rank=rank) for rank, row in enumerate(rows, 1)]
+            return self.cache[key]
+
+    def count(self, difficulty=None):
+        with self.connect() as db:
+            if difficulty is None:
+                return db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+            return db.execute("SELECT COUNT(*) FROM scores WHERE difficulty = ?",
+                              (difficulty,)).fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            if self.reader is not None:
+                self.reader.close()
+                self.reader = None
+
+
+_default_store = None
+
+
+def default_store():
+    # The store shared by every window, opened on first use
+    global _default_store
+    if _default_store is None:
+        _default_store = ScoreStore()
+    return _default_store
+
+
+def save_score(player_name, difficulty, width=None, height=None, mines=None, duration=None):
     # Save new high score
-    scores = load_scores()
-    scores[difficulty].append(player_name)
-    scores[difficulty] = scores[difficulty][-5:]  # Keep only top 5 scores
+    default_store().add(player_name, difficulty, width, height, mines, duration)
+
 
-    with open(SCORES_FILE, 'w') as f:
-        json.dump(scores, f)
+def format_duration(seconds):
+    if seconds is None:
+        return "-"
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes)}:{seconds:04.1f}"
 
 
 class ScoreboardWindow:
@@ -37,15 +149,18 @@ class ScoreboardWindow:
         tk.Label(self.frame, text="High Scores",
                  font=("Arial", 18)).pack(pady=20)
 
-        # Display scores for each difficulty
-        scores = load_scores()
-        for difficulty in ["Easy", "Medium", "Hard"]:
+        # Display the fastest games for each difficulty
+        store = default_store()
+        for difficulty in DIFFICULTIES:
             tk.Label(self.frame, text=f"\n{difficulty} Mode:",
                      font=("Arial", 14)).pack()
 
-            if scores[difficulty]:
-                for i, name in enumerate(scores[difficulty], 1):
-                    tk.Label(self.frame, text=f"{i}. {name}").pack()
+            scores = store.top(difficulty)
+            if scores:
+                for score in scores:
+                    tk.Label(self.frame, text=f"{score['rank']}. {score['name']}  "
+                                              f"{format_duration(score['duration'])}  "
+                                              f"{score['date'][:10]}").pack()
             else:
                 tk.Label(self.frame, text="No scores yet").pack()
 
@@ -54,4 +169,4 @@ class ScoreboardWindow:
             self.frame,
             text="Back to Menu",
             command=lambda: [self.frame.destroy(), return_to_menu()]
-        ).pack(pady=20)
\ No newline at end of file
+        ).pack(pady=20)
@@ -0,0 +1,106 @@
+import os
+import re
+import struct
+import zlib
+from save_format import parse_save, read_save
+
+# Archive segments pack many finished games into one file (little endian):
+#   header   magic, version
+#   records  one per game: RECORD (stored size, original size, CRC-32 of the
+#            original bytes, name length), the original file name, then the
+#            save file's bytes compressed with zlib
+# Records are only ever appended, and each one describes itself, so a
+# segment can be read back without the history index.
+SEGMENT_MAGIC = b'MSWS'
+SEGMENT_VERSION = 1
+SEGMENT_HEADER = struct.Struct('<4sB3x')
+RECORD = struct.Struct('<IIII')
+SEGMENT_EXTENSION = '.seg'
+SEGMENT_NAME = re.compile(r'segment_(\d+)\.seg$')
+COMPRESSION = 6
+
+
+def is_segment(path: str) -> bool:
+    return path.endswith(SEGMENT_EXTENSION)
+
+
+def next_segment_path(saves_dir: str) -> str:
+    # segment_000001.seg, segment_000002.seg, ...
+    numbers = [int(match.group(1)) for match in map(SEGMENT_NAME.match, os.listdir(saves_dir)) if match]
+    return os.path.join(saves_dir, f"segment_{max(numbers, default=0) + 1:06d}{SEGMENT_EXTENSION}")
+
+
+def pack_record(name: str, data: bytes) -> bytes:
+    # One save file as a segment record
+    stored = zlib.compress(data, COMPRESSION)
+    encoded = name.encode('utf-8')
+    return RECORD.pack(len(stored), len(data), zlib.crc32(data), len(encoded)) + encoded + stored
+
+
+def write_segment(path: str, records) -> list:
+    # Write packed records to a new segment and return the (offset, length)
+    # of each. Like save files, the segment only appears once complete.
+    positions = []
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION))
+        for record in records:
+            positions.append((f.tell(), len(record)))
+            f.write(record)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    return positions
+
+
+def unpack_record(record: bytes, where: str):
+    # (name, original bytes) of a record, checking its checksum
+    stored_size, size, crc, name_size = RECORD.unpack_from(record)
+    start = RECORD.size + name_size
+    if len(record) < start + stored_size:
+        raise ValueError(f"{where} is truncated")
+    name = record[RECORD.size:start].decode('utf-8')
+    try:
+        data = zlib.decompress(record[start:start + stored_size])
+    except zlib.error as e:
+        raise ValueError(f"{where} is corrupt: {e}")
+    if len(data) != size or zlib.crc32(data) != crc:
+        raise ValueError(f"{where} fails its checksum")
+    return name, data
+
+
+def read_record(path: str, offset: int):
+    # (name, original bytes) of the record at `offset`
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        header = f.read(RECORD.size)
+        if len(header) < RECORD.size:
+            raise ValueError(f"{path}@{offset} is truncated")
+        stored_size, _, _, name_size = RECORD.unpack(header)
+        return unpack_record(header + f.read(name_size + stored_size), f"{path}@{offset}")
+
+
+def iter_records(path: str):
+    # (offset, length, name, original bytes) of every record in a segment
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < SEGMENT_HEADER.size or SEGMENT_HEADER.unpack_from(data) != (SEGMENT_MAGIC, SEGMENT_VERSION):
+        raise ValueError(f"Unsupported segment file: {path}")
+    offset = SEGMENT_HEADER.size
+    while offset < len(data):
+        if len(data) < offset + RECORD.size:
+            raise ValueError(f"{path}@{offset} is truncated")
+        stored_size, _, _, name_size = RECORD.unpack_from(data, offset)
+        length = RECORD.size + name_size + stored_size
+        name, original = unpack_record(data[offset:offset + length], f"{path}@{offset}")
+        yield offset, length, name, original
+        offset += length
+
+
+def read_archived(path: str, offset: int = 0) -> dict:
+    # An archived game as read_save returns it, from a loose save file or
+    # from a segment record
+    if is_segment(path):
+        name, data = read_record(path, offset)
+        return parse_save(data, name)
+    return read_save(path)
@@ -0,0 +1,335 @@
+import argparse
+import asyncio
+import logging
+import struct
+import time
+
+from board import COUNT_MASK, FLAG_BIT, MINE_BIT, REVEALED_BIT
+from events import CellsRevealed, FlagToggled, GameLost
+from game import Game
+from move_log import MOVE_FLAG, MOVE_REVEAL
+
+logger = logging.getLogger(__name__)
+
+# Wire protocol: every message is a FRAME (payload length, message type)
+# followed by its payload, all little endian.
+#
+# Client to server:
+#   CREATE    width, height, mines, seed (-1 for a random one); the sender
+#             joins the new game as a player
+#   JOIN      game id, role (PLAYER or SPECTATOR)
+#   MOVE      kind (move_log MOVE_REVEAL, MOVE_FLAG or MOVE_CHORD), x, y
+# Server to client:
+#   SNAPSHOT  game id, width, height, mines, status, sequence number, then
+#             one view byte per cell in row-major order
+#   DELTA     sequence number, status, cell count, then the flat indices
+#             (uint32 each) and the view bytes of the changed cells
+#   ERROR     a UTF-8 message
+#
+# Deltas are numbered per game. A snapshot carries the number of the last
+# delta it includes, so a client applies the deltas that follow it.
+FRAME = struct.Struct('<IB')
+CREATE, JOIN, MOVE = 1, 2, 3
+SNAPSHOT, DELTA, ERROR = 16, 17, 18
+CREATE_MESSAGE = struct.Struct('<IIIq')
+JOIN_MESSAGE = struct.Struct('<IB')
+MOVE_MESSAGE = struct.Struct('<BII')
+SNAPSHOT_HEADER = struct.Struct('<IIIIBI')
+DELTA_HEADER = struct.Struct('<IBI')
+
+PLAYER, SPECTATOR = 0, 1
+PLAYING, WON, LOST = 0, 1, 2
+STATUS_CODES = {'playing': PLAYING, 'won': WON, 'lost': LOST}
+
+# What a client sees of a cell: 0-8 for a revealed number, or one of these
+HIDDEN, FLAGGED, MINE = 9, 10, 11
+VIEW_TABLE = bytes((MINE if c & MINE_BIT else c & COUNT_MASK) if c & REVEALED_BIT
+                   else FLAGGED if c & FLAG_BIT else HIDDEN for c in range(256))
+# Once a game is lost every mine shows
+LOST_VIEW_TABLE = bytes(MINE if c & MINE_BIT else VIEW_TABLE[c] for c in range(256))
+
+MAX_MESSAGE = 64
+MAX_BOARD_CELLS = 4000 * 4000
+# A client this far behind gets a snapshot instead of the deltas it missed
+MAX_PENDING = 1 << 20
+
+
+def frame(kind: int, payload: bytes) -> bytes:
+    return FRAME.pack(len(payload), kind) + payload
+
+
+def error(message: str) -> bytes:
+    return frame(ERROR, message.encode('utf-8'))
+
+
+class Connection:
+    # One client. Outgoing frames are queued and written by a sender task,
+    # so a slow reader never holds up the game or the other clients. When
+    # more than MAX_PENDING bytes are waiting, they are dropped and the
+    # client gets a fresh snapshot once it has caught up.
+    def __init__(self, writer):
+        self.writer = writer
+        self.session = None
+        self.role = None
+        self.pending = []
+        self.pending_bytes = 0
+        self.needs_snapshot = False
+        self.wakeup = asyncio.Event()
+
+    def send(self, data: bytes):
+        if self.needs_snapshot:
+            return
+        if self.pending_bytes + len(data) > MAX_PENDING and self.session is not None:
+            self.pending.clear()
+            self.pending_bytes = 0
+            self.needs_snapshot = True
+        else:
+            self.pending.append(data)
+            self.pending_bytes += len(data)
+        self.wakeup.set()
+
+    async def run_sender(self):
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            if self.needs_snapshot:
+                # Taken now, so it includes every delta that was dropped
+                self.needs_snapshot = False
+                data = [self.session.snapshot()]
+            else:
+                data = self.pending
+            self.pending = []
+            self.pending_bytes = 0
+            self.writer.writelines(data)
+            await self.writer.drain()
+
+
+class Session:
+    # A hosted game and the clients watching it. The game's events are
+    # turned into one delta per move and sent to every client.
+    def __init__(self, game_id: int, game: Game):
+        self.id = game_id
+        self.game = game
+        self.clients = set()
+        self.sequence = 0
+        self.changed = set()
+        self.lost = False
+        game.subscribe(self.collect)
+
+    def collect(self, events):
+        for event in events:
+            if isinstance(event, CellsRevealed):
+                self.changed.update(event.cells)
+            elif isinstance(event, FlagToggled):
+                self.changed.add(event.index)
+            elif isinstance(event, GameLost):
+                self.lost = True
+                self.changed.update(self.game.mine_indices)
+
+    def status(self) -> int:
+        return STATUS_CODES[self.game.status]
+
+    def views(self, indices) -> bytes:
+        # View bytes of some cells, read from the packed cell bytes
+        cells, stride, width = self.game.cells.cells, self.game.cells.stride, self.game.width
+        return bytes(cells[(i // width + 1) * stride + i % width + 1]
+                     for i in indices).translate(LOST_VIEW_TABLE if self.lost else VIEW_TABLE)
+
+    def snapshot(self) -> bytes:
+        game = self.game
+        views = game.cells.interior().translate(LOST_VIEW_TABLE if self.lost else VIEW_TABLE)
+        return frame(SNAPSHOT, SNAPSHOT_HEADER.pack(self.id, game.width, game.height, game.mines,
+                                                    self.status(), self.sequence) + views)
+
+    def publish(self, mover: Connection):
+        # Send the cells changed by the last move. The mover always gets a
+        # delta, even an empty one, so it knows the move was handled.
+        indices = sorted(self.changed)
+        self.changed.clear()
+        if indices:
+            self.sequence += 1
+        data = frame(DELTA, DELTA_HEADER.pack(self.sequence, self.status(), len(indices))
+                     + struct.pack(f'<{len(indices)}I', *indices) + self.views(indices))
+        for client in self.clients:
+            if indices or client is mover:
+                client.send(data)
+
+
+class GameServer:
+    # Hosts any number of games in one process. Everything runs on the
+    # event loop thread, so moves on a game are applied one at a time.
+    def __init__(self):
+        self.sessions = {}
+        self.next_id = 1
+        self.moves = 0
+        self.games_created = 0
+        self.clients = 0
+
+    async def handle(self, reader, writer):
+        connection = Connection(writer)
+        sender = asyncio.create_task(connection.run_sender())
+        self.clients += 1
+        try:
+            while True:
+                length, kind = FRAME.unpack(await reader.readexactly(FRAME.size))
+                if length > MAX_MESSAGE:
+                    break
+                self.dispatch(connection, kind, await reader.readexactly(length))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.clients -= 1
+            self.leave(connection)
+            sender.cancel()
+            writer.close()
+
+    def dispatch(self, connection: Connection, kind: int, payload: bytes):
+        try:
+            if kind == CREATE:
+                self.create(connection, *CREATE_MESSAGE.unpack(payload))
+            elif kind == JOIN:
+                self.join(connection, *JOIN_MESSAGE.unpack(payload))
+            elif kind == MOVE:
+                self.move(connection, *MOVE_MESSAGE.unpack(payload))
+            else:
+                connection.send(error(f"unknown message type {kind}"))
+        except (struct.error, ValueError) as e:
+            connection.send(error(str(e)))
+
+    def create(self, connection: Connection, width: int, height: int, mines: int, seed: int):
+        if not 0 < width * height <= MAX_BOARD_CELLS:
+            raise ValueError(f"board must have between 1 and {MAX_BOARD_CELLS} cells")
+        # The first click keeps itself and its neighbors free of mines,
+        # up to a 3x3 block wherever it lands
+        if not 0 <= mines <= width * height - min(width, 3) * min(height, 3):
+            raise ValueError(f"cannot place {mines} mines on a {width}x{height} board")
+        game = Game(width, height, mines, 'packed', None if seed < 0 else seed, persist=False)
+        game.moves = None  # no move log: the game is never saved
+        session = self.sessions[self.next_id] = Session(self.next_id, game)
+        self.next_id += 1
+        self.games_created += 1
+        self.join(connection, session.id, PLAYER)
+
+    def join(self, connection: Connection, game_id: int, role: int):
+        session = self.sessions.get(game_id)
+        if session is None:
+            raise ValueError(f"no game {game_id}")
+        self.leave(connection)
+        connection.session, connection.role = session, role
+        session.clients.add(connection)
+        connection.send(session.snapshot())
+
+    def leave(self, connection: Connection):
+        # A game is closed once its last client has left
+        session = connection.session
+        if session is None:
+            return
+        session.clients.discard(connection)
+        connection.session = None
+        if not session.clients:
+            del self.sessions[session.id]
+
+    def move(self, connection: Connection, kind: int, x: int, y: int):
+        session = connection.session
+        if session is None or connection.role != PLAYER:
+            raise ValueError("join a game as a player first")
+        game = session.game
+        if not (0 <= x < game.width and 0 <= y < game.height):
+            raise ValueError(f"({x}, {y}) is outside the board")
+        if game.status == 'playing':
+            if kind == MOVE_FLAG:
+                game.toggle_flag(x, y)
+            elif kind == MOVE_REVEAL or game.cells.is_revealed(x, y):
+                game.reveal(x, y)  # a reveal on a revealed number chords
+            self.moves += 1
+        session.publish(connection)
+
+    def stats(self) -> dict:
+        return {'games': len(self.sessions), 'games_created': self.games_created,
+                'clients': self.clients, 'moves': self.moves, 'cpu_s': time.process_time()}
+
+
+class Client:
+    # Minimal client: keeps the view of one game up to date from the
+    # snapshots and deltas it receives
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.game_id = None
+        self.width = self.height = 0
+        self.status = PLAYING
+        self.sequence = 0
+        self.view = bytearray()
+
+    @classmethod
+    async def connect(cls, host: str, port: int):
+        return cls(*await asyncio.open_connection(host, port))
+
+    def send(self, kind: int, payload: bytes):
+        self.writer.write(frame(kind, payload))
+
+    async def create(self, width: int, height: int, mines: int, seed: int = -1):
+        self.send(CREATE, CREATE_MESSAGE.pack(width, height, mines, seed))
+        await self.receive()
+
+    async def join(self, game_id: int, role: int = SPECTATOR):
+        self.send(JOIN, JOIN_MESSAGE.pack(game_id, role))
+        await self.receive()
+
+    async def move(self, kind: int, x: int, y: int):
+        # Send a move and wait for the next delta, which answers it when
+        # this client is the game's only player
+        self.send(MOVE, MOVE_MESSAGE.pack(kind, x, y))
+        await self.receive()
+
+    async def receive(self) -> int:
+        # Read and apply one message; returns its type
+        length, kind = FRAME.unpack(await self.reader.readexactly(FRAME.size))
+        payload = await self.reader.readexactly(length)
+        if kind == SNAPSHOT:
+            (self.game_id, self.width, self.height, _, self.status,
+             self.sequence) = SNAPSHOT_HEADER.unpack_from(payload)
+            self.view = bytearray(payload[SNAPSHOT_HEADER.size:])
+        elif kind == DELTA:
+            sequence, self.status, count = DELTA_HEADER.unpack_from(payload)
+            if count:
+                if sequence != self.sequence + 1:
+                    raise ValueError(f"missed deltas {self.sequence + 1} to {sequence - 1}")
+                self.sequence = sequence
+                start = DELTA_HEADER.size
+                indices = struct.unpack_from(f'<{count}I', payload, start)
+                for i, view in zip(indices, payload[start + 4 * count:]):
+                    self.view[i] = view
+        elif kind == ERROR:
+            raise ValueError(payload.decode('utf-8'))
+        return kind
+
+    def close(self):
+        self.writer.close()
+
+
+async def serve(host: str, port: int):
+    server = GameServer()
+    listener = await asyncio.start_server(server.handle, host, port)
+    host, port = listener.sockets[0].getsockname()[:2]
+    print(f"listening on {host}:{port}", flush=True)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        print("stats", server.stats(), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host Minesweeper games for players and spectators.")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (0.0.0.0 for the LAN)")
+    parser.add_argument('--port', type=int, default=8765, help="0 picks a free port")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import argparse
+import importlib
+import multiprocessing
+import os
+import random
+import time
+from typing import Callable, Dict, Iterator
+
+from game import Game
+from probability import ProbabilityEngine
+from solver import Solver
+
+# Games per task handed to a worker; results come back one chunk at a time
+CHUNK_SIZE = 50
+
+
+def unknown_cells(game: Game, rng: random.Random):
+    # Every cell in a random order, skipping those opened or flagged by the
+    # time they come up
+    order = list(range(game.width * game.height))
+    rng.shuffle(order)
+    cells = game.cells
+    width = game.width
+    for i in order:
+        x, y = i % width, i // width
+        if not cells.is_revealed(x, y) and not cells.is_flagged(x, y):
+            yield i
+
+
+def random_strategy(game: Game, rng: random.Random) -> int:
+    # Click unknown cells at random; returns the number of reveals
+    reveals = 0
+    for i in unknown_cells(game, rng):
+        if game.status != 'playing':
+            break
+        game.reveal(i % game.width, i // game.width)
+        reveals += 1
+    return reveals
+
+
+def solver_strategy(game: Game, rng: random.Random) -> int:
+    # Play every certain move, guess at random when stuck
+    width = game.width
+    game.reveal(width // 2, game.height // 2)
+    reveals = 1
+    solver = Solver(game)
+    guesses = unknown_cells(game, rng)
+    while game.status == 'playing':
+        deductions = solver.analyse()
+        if not deductions:
+            i = next(guesses)
+            solver.notice(game.reveal(i % width, i // width).cells)
+            reveals += 1
+            continue
+        for i in deductions.mines:
+            game.toggle_flag(i % width, i // width)
+        solver.notice(deductions.mines)
+        for i in sorted(deductions.safe):
+            if game.status != 'playing':
+                break
+            solver.notice(game.reveal(i % width, i // width).cells)
+            reveals += 1
+    return reveals
+
+
+def probability_strategy(game: Game, rng: random.Random) -> int:
+    # Always open the cell least likely to be a mine
+    width = game.width
+    game.reveal(width // 2, game.height // 2)
+    reveals = 1
+    engine = ProbabilityEngine(game)
+    while game.status == 'playing':
+        probabilities, interior = engine.query()
+        best, risk = None, 2.0
+        for i, p in probabilities.items():
+            if p < risk:
+                best, risk = i, p
+        if interior < risk:
+            best = next((i for i in unknown_cells(game, rng) if i not in probabilities), best)
+        engine.notice(game.reveal(best % width, best // width).cells)
+        reveals += 1
+    return reveals
+
+
+STRATEGIES: Dict[str, Callable[[Game, random.Random], int]] = {
+    'random': random_strategy,
+    'solver': solver_strategy,
+    'probability': probability_strategy,
+}
+
+
+def get_strategy(name: str) -> Callable[[Game, random.Random], int]:
+    # A built-in strategy, or 'module:function' for one defined elsewhere.
+    # A strategy plays a fresh game to the end and returns its reveal count.
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    module, sep, function = name.partition(':')
+    if not sep:
+        raise ValueError(f"Unknown strategy: {name}")
+    return getattr(importlib.import_module(module), function)
+
+
+def run_chunk(task) -> dict:
+    # Play `count` games with seeds first_seed, first_seed + 1, ... so the
+    # results do not depend on how games are spread over workers
+    strategy_name, width, height, mines, engine, first_seed, count = task
+    strategy = get_strategy(strategy_name)
+    wins = reveals = 0
+    start = time.process_time()
+    for seed in range(first_seed, first_seed + count):
+        game = Game(width, height, mines, engine, seed=seed, persist=False)
+        reveals += strategy(game, random.Random(f"strategy-{seed}"))
+        wins += game.status == 'won'
+    return {'games': count, 'wins': wins, 'reveals': reveals,
+            'cpu_seconds': time.process_time() - start}
+
+
+def simulate(games: int, width: int, height: int, mines: int, strategy: str = 'solver',
+             engine: str = 'packed', seed: int = 0, workers: int = None,
+             chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    # Yield per-chunk results as workers finish them
+    workers = workers or os.cpu_count() or 1
+    get_strategy(strategy)  # fail here rather than in every worker
+    tasks = [(strategy, width, height, mines, engine, seed + first, min(chunk_size, games - first))
+             for first in range(0, games, chunk_size)]
+    if workers == 1:
+        yield from map(run_chunk, tasks)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(run_chunk, tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play Minesweeper games headless in a process pool.")
+    parser.add_argument('-n', '--games', type=int, default=1000)
+    parser.add_argument('--width', type=int, default=30)
+    parser.add_argument('--height', type=int, default=16)
+    parser.add_argument('--mines', type=int, default=99)
+    parser.add_argument('--strategy', default='solver',
+                        help=f"one of {', '.join(STRATEGIES)}, or module:function")
+    parser.add_argument('--engine', default='packed')
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('-v', '--verbose', action='store_true', help="print every chunk as it arrives")
+    args = parser.parse_args()
+
+    totals = {'games': 0, 'wins': 0, 'reveals': 0, 'cpu_seconds': 0.0}
+    start = time.perf_counter()
+    for chunk in simulate(args.games, args.width, args.height, args.mines, args.strategy,
+                          args.engine, args.seed, args.workers, args.chunk_size):
+        for key in totals:
+            totals[key] += chunk[key]
+        if args.verbose:
+            print(f"{totals['games']:>8} games  win rate {totals['wins'] / totals['games']:.1%}")
+    wall = time.perf_counter() - start
+
+    games = totals['games']
+    print(f"games:              {games}")
+    print(f"win rate:           {totals['wins'] / games:.2%}")
+    print(f"average reveals:    {totals['reveals'] / games:.1f}")
+    print(f"games/s:            {games / wall:,.1f} on {args.workers} workers")
+    print(f"games/s per core:   {games / wall / args.workers:,.1f} "
+          f"({games / max(totals['cpu_seconds'], 1e-9):,.1f} by CPU time)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+# Components with more unknown cells than this are only solved by the
+# single-cell, subset and overlap rules
+MAX_COMPONENT = 48
+
+# Cached component results are dropped once the cache grows past this
+CACHE_SIZE = 4096
+
+
+class Deductions:
+    # Cells (flat indices) that are certainly safe or certainly mines
+    def __init__(self):
+        self.safe: Set[int] = set()
+        self.mines: Set[int] = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.safe or self.mines)
+
+    def __repr__(self) -> str:
+        return f"Deductions(safe={sorted(self.safe)}, mines={sorted(self.mines)})"
+
+
+class ComponentResult:
+    # Exact solution counts of one frontier component: for every number of
+    # mines k, how many assignments use k mines and how often each cell is a
+    # mine among them
+    def __init__(self, cells: Tuple[int, ...], totals: Dict[int, int], hits: Dict[int, List[int]]):
+        self.cells = cells
+        self.totals = totals
+        self.hits = hits
+
+    def certain(self, deductions: Deductions):
+        # Cells that are a mine in every solution, or in none
+        solutions = sum(self.totals.values())
+        if not solutions:
+            return
+        for j, cell in enumerate(self.cells):
+            mines = sum(hits[j] for hits in self.hits.values())
+            if mines == 0:
+                deductions.safe.add(cell)
+            elif mines == solutions:
+                deductions.mines.add(cell)
+
+
+def split_components(constraints):
+    # Group constraints that share cells; returns lists of constraints
+    parent = {}
+
+    def find(c):
+        while parent[c] != c:
+            parent[c] = parent[parent[c]]
+            c = parent[c]
+        return c
+
+    for cells, _ in constraints:
+        first = None
+        for c in cells:
+            parent.setdefault(c, c)
+            if first is None:
+                first = find(c)
+            else:
+                root = find(c)
+                if root != first:
+                    parent[root] = first
+
+    groups = defaultdict(list)
+    for constraint in constraints:
+        groups[find(next(iter(constraint[0])))].append(constraint)
+    return list(groups.values())
+
+
+def canonical_form(component):
+    # Relabel cells by rank so translated copies of a component share one
+    # signature. Returns the signature and the cells in rank order.
+    cells = sorted(set().union(*(cells for cells, _ in component)))
+    rank = {c: r for r, c in enumerate(cells)}
+    signature = tuple(sorted((tuple(sorted(rank[c] for c in constraint_cells)), need)
+                             for constraint_cells, need in component))
+    return signature, cells
+
+
+def enumerate_component(constraints) -> ComponentResult:
+    # Backtrack over the cells of one component in breadth-first order, so
+    # constraints close early and prune the search
+    cell_constraints = defaultdict(list)
+    for n, (cells, _) in enumerate(constraints):
+        for c in cells:
+            cell_constraints[c].append(n)
+
+    order = []
+    seen = set()
+    for cells, _ in constraints:
+        for start in sorted(cells):
+            if start in seen:
+                continue
+            seen.add(start)
+            queue = [start]
+            while queue:
+                c = queue.pop(0)
+                order.append(c)
+                for n in cell_constraints[c]:
+                    for other in sorted(constraints[n][0]):
+                        if other not in seen:
+                            seen.add(other)
+                            queue.append(other)
+
+    needs = [need for _, need in constraints]
+    remaining = [len(cells) for cells, _ in constraints]
+    placed = [0] * len(constraints)
+    by_position = [cell_constraints[c] for c in order]
+    assignment = [0] * len(order)
+    totals = defaultdict(int)
+    hits = {}
+    size = len(order)
+
+    def backtrack(i, mines):
+        if i == size:
+            totals[mines] += 1
+            row = hits.get(mines)
+            if row is None:
+                row = hits[mines] = [0] * size
+            for j in range(size):
+                if assignment[j]:
+                    row[j] += 1
+            return
+        touched = by_position[i]
+        for value in (0, 1):
+            for n in touched:
+                p = placed[n] + value
+                if p > needs[n] or p + remaining[n] - 1 < needs[n]:
+                    break
+            else:
+                for n in touched:
+                    placed[n] += value
+                    remaining[n] -= 1
+                assignment[i] = value
+                backtrack(i + 1, mines + value)
+                for n in touched:
+                    placed[n] -= value
+                    remaining[n] += 1
+        assignment[i] = 0
+
+    backtrack(0, 0)
+    return ComponentResult(tuple(order), dict(totals), hits)
+
+
+class Solver:
+    # Finds every cell of a Game that is certainly safe or certainly a mine,
+    # from the revealed numbers and the flags only. Flags are trusted.
+    def __init__(self, game, max_component: int = MAX_COMPONENT):
+        self.game = game
+        self.max_component = max_component
+        self.cache: Dict[tuple, ComponentResult] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.frontier: Set[int] = set()
+        self.known: Dict[int, Tuple[frozenset, int]] = {}  # frontier cell -> its constraint
+        self.refresh()
+
+    def neighbors(self, i: int):
+        width, height = self.game.width, self.game.height
+        y, x = divmod(i, width)
+        for ny in range(max(y - 1, 0), min(y + 2, height)):
+            for nx in range(max(x - 1, 0), min(x + 2, width)):
+                if nx != x or ny != y:
+                    yield ny * width + nx
+
+    def refresh(self):
+        # Rebuild the frontier from a full scan, e.g. after outside moves
+        cells = self.game.cells
+        width = self.game.width
+        self.known.clear()
+        self.frontier = {y * width + x
+                         for y in range(self.game.height) for x in range(width)
+                         if cells.is_revealed(x, y) and cells.get(x, y) > 0}
+
+    def notice(self, changed):
+        # Track cells revealed or flagged since the last call (flat indices)
+        cells = self.game.cells
+        width = self.game.width
+        known = self.known
+        for i in changed:
+            y, x = divmod(i, width)
+            if cells.is_revealed(x, y) and cells.get(x, y) > 0:
+                self.frontier.add(i)
+            for n in self.neighbors(i):
+                known.pop(n, None)
+
+    def constraints(self) -> List[Tuple[frozenset, int]]:
+        # One (unknown cells, mines among them) pair per frontier cell; only
+        # cells next to a change since the last call are rebuilt
+        cells = self.game.cells
+        width = self.game.width
+        known = self.known
+        constraints = []
+        done = []
+        for i in self.frontier:
+            constraint = known.get(i)
+            if constraint is not None:
+                constraints.append(constraint)
+                continue
+            unknown = []
+            flags = 0
+            for n in self.neighbors(i):
+                ny, nx = divmod(n, width)
+                if cells.is_flagged(nx, ny):
+                    flags += 1
+                elif not cells.is_revealed(nx, ny):
+                    unknown.append(n)
+            if unknown:
+                y, x = divmod(i, width)
+                constraint = known[i] = (frozenset(unknown), cells.get(x, y) - flags)
+                constraints.append(constraint)
+            else:
+                done.append(i)
+        self.frontier.difference_update(done)
+        return constraints
+
+    def reduce(self):
+        # Single-cell rules, subset reduction and the overlap rule to a
+        # fixpoint. Returns the certain cells found and the constraints left
+        # over.
+        deductions = Deductions()
+        constraints = set(self.constraints())
+        while True:
+            constraints = self.apply_single_rules(constraints, deductions)
+            reduced = self.apply_overlap_rules(self.apply_subset_rules(constraints))
+            if reduced == constraints:
+                return deductions, constraints
+            constraints = reduced
+
+    def analyse(self) -> Deductions:
+        # Single-cell, subset and overlap rules, then exact enumeration of
+        # each independent component
+        deductions, constraints = self.reduce()
+        for component in split_components(list(constraints)):
+            unknown = set().union(*(cells for cells, _ in component))
+            if len(unknown) > self.max_component:
+                continue
+            self.solve_component(component).certain(deductions)
+        return deductions
+
+    def solve_component(self, component) -> ComponentResult:
+        # Exact counts for a component, cached by its canonical signature
+        signature, cells = canonical_form(component)
+        result = self.cache.get(signature)
+        if result is None:
+            self.cache_misses += 1
+            if len(self.cache) >= CACHE_SIZE:
+                self.cache.clear()
+            result = self.cache[signature] = enumerate_component(
+                [(frozenset(ranks), need) for ranks, need in signature])
+        else:
+            self.cache_hits += 1
+        return ComponentResult(tuple(cells[r] for r in result.cells), result.totals, result.hits)
+
+    def apply_single_rules(self, constraints, deductions: Deductions):
+        # A constraint needing no mines is all safe; one needing a mine in
+        # every cell is all mines. Known cells are then removed everywhere.
+        while True:
+            found_safe, found_mines = set(), set()
+            for cells, need in constraints:
+                if need == 0:
+                    found_safe |= cells
+                elif need == len(cells):
+                    found_mines |= cells
+            if not found_safe and not found_mines:
+                return constraints
+            deductions.safe |= found_safe
+            deductions.mines |= found_mines
+            simplified = set()
+            for cells, need in constraints:
+                rest = cells - found_safe - found_mines
+                if rest:
+                    simplified.add((frozenset(rest), need - len(cells & found_mines)))
+            constraints = simplified
+
+    def apply_subset_rules(self, constraints):
+        # If A's cells are a subset of B's, B's other cells hold B - A mines
+        by_cell = defaultdict(list)
+        for constraint in constraints:
+            for c in constraint[0]:
+                by_cell[c].append(constraint)
+
+        reduced = set(constraints)
+        for small in constraints:
+            small_cells, small_need = small
+            candidates = set(by_cell[next(iter(small_cells))])
+            for big in candidates:
+                if big is small or big not in reduced:
+                    continue
+                big_cells, big_need = big
+                if len(big_cells) > len(small_cells) and small_cells <= big_cells:
+                    reduced.discard(big)
+                    reduced.add((big_cells - small_cells, big_need - small_need))
+        return reduced
+
+    def apply_overlap_rules(self, constraints):
+        # If B minus the cells of B outside A equals A, the overlap holds all
+        # of A's mines: A's other cells are safe and B's other cells are all
+        # mines. These are added as constraints for the single-cell rules.
+        by_cell = defaultdict(list)
+        for constraint in constraints:
+            for c in constraint[0]:
+                by_cell[c].append(constraint)
+
+        reduced = set(constraints)
+        for a in constraints:
+            a_cells, a_need = a
+            candidates = set()
+            for c in a_cells:
+                candidates.update(by_cell[c])
+            for b in candidates:
+                b_cells, b_need = b
+                only_a, only_b = a_cells - b_cells, b_cells - a_cells
+                if only_a and only_b and b_need - len(only_b) == a_need:
+                    reduced.add((only_a, 0))
+                    reduced.add((only_b, len(only_b)))
+        return reduced
+
+    def step(self) -> Deductions:
+        # Analyse, then flag every certain mine and reveal every certain safe
+        # cell. Returns what was applied; empty when the solver is stuck.
+        deductions = self.analyse()
+        self.apply(deductions)
+        return deductions
+
+    def apply(self, deductions: Deductions):
+        # Play deductions on the game: flag mines, reveal safe cells.
+        # Subscribers get the whole round as one batch of events.
+        game = self.game
+        width = game.width
+        with game.batch():
+            for i in deductions.mines:
+                y, x = divmod(i, width)
+                if not game.cells.is_flagged(x, y):
+                    game.toggle_flag(x, y)
+            self.notice(deductions.mines)
+            for i in sorted(deductions.safe):
+                y, x = divmod(i, width)
+                if game.game_over or game.cells.is_revealed(x, y):
+                    continue
+                result = game.reveal(x, y)
+                self.notice(result.cells)
+
+    def solve(self) -> int:
+        # Step until stuck or the game ends; returns the number of steps
+        steps = 0
+        while not self.game.game_over and not self.game.check_win() and self.step():
+            steps += 1
+        return steps
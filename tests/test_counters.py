@@ -0,0 +1,69 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Game
+
+ENGINES = ['list', 'packed', 'chunked']
+SIZES = [(9, 9, 10), (16, 16, 40), (30, 16, 99), (100, 70, 300)]
+GAMES = 10  # seeds per engine and size
+
+
+def play(game: Game, rng: random.Random, check):
+    # Mostly safe reveals (the test may look at the mines), with flags and
+    # chords mixed in, until the game ends; check() runs after every move
+    width, height, cells = game.width, game.height, game.cells
+    while game.status == 'playing':
+        x, y = rng.randrange(width), rng.randrange(height)
+        roll = rng.random()
+        if game.first_move or cells.is_revealed(x, y):
+            game.reveal(x, y)  # on a revealed number this chords
+        elif roll < 0.2:
+            game.toggle_flag(x, y)
+        elif roll < 0.95 and cells.get(x, y) == -1:
+            continue
+        else:
+            game.reveal(x, y)
+        check()
+
+
+class CounterTest(unittest.TestCase):
+    # revealed_count, flag_count and safe_remaining are kept up to date by
+    # every move; they must always match a full recount of the board
+
+    def setUp(self):
+        self.check_counters = Game.check_counters
+        Game.check_counters = True  # check_win compares them with a scan too
+
+    def tearDown(self):
+        Game.check_counters = self.check_counters
+
+    def test_counters_match_a_recount(self):
+        for engine in ENGINES:
+            for width, height, mines in SIZES:
+                for seed in range(GAMES):
+                    with self.subTest(engine=engine, size=(width, height, mines), seed=seed):
+                        game = Game(width, height, mines, engine, seed=seed, persist=False)
+
+                        def check():
+                            self.assertEqual((game.revealed_count, game.flag_count, game.safe_remaining),
+                                             game.scan_counters())
+                            game.check_win()
+
+                        play(game, random.Random(seed), check)
+
+    def test_won_game_has_no_safe_cells_left(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                game = Game(9, 9, 0, engine, seed=1, persist=False)
+                game.reveal(4, 4)
+                self.assertEqual(game.safe_remaining, 0)
+                self.assertEqual(game.revealed_count, 81)
+                self.assertEqual(game.status, 'won')
+
+
+if __name__ == "__main__":
+    unittest.main()
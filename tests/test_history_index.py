@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import history_index
+from game import Game
+from history_index import HistoryIndex, INDEX_FILE, SAVES_DIR
+
+GAMES = 5
+
+
+class HistoryIndexTest(unittest.TestCase):
+    # An index whose first rebuild was cut short must still pick up every
+    # archived game the next time it is opened
+
+    def setUp(self):
+        # The index and the saves live under the working directory
+        self.directory = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        os.makedirs(SAVES_DIR)
+        for n in range(GAMES):
+            game = Game(9, 9, 10, 'packed', seed=n, persist=False)
+            game.reveal(4, 4)
+            timestamp = f"2024-01-0{n + 1}_00-00-00"
+            game.write_save(os.path.join(SAVES_DIR, f"game_{timestamp}.sav"), timestamp)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def test_interrupted_rebuild_runs_again(self):
+        read_save = history_index.read_save
+        calls = []
+
+        def interrupted(path):
+            calls.append(path)
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return read_save(path)
+
+        with mock.patch.object(history_index, 'read_save', interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                HistoryIndex()
+        self.assertTrue(os.path.exists(INDEX_FILE))
+        self.assertEqual(len(HistoryIndex().games()), GAMES)
+        self.assertEqual(len(HistoryIndex().games()), GAMES)
+
+    def test_finished_rebuild_is_not_repeated(self):
+        HistoryIndex()
+        with mock.patch.object(HistoryIndex, 'rebuild') as rebuild:
+            HistoryIndex()
+        rebuild.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Game
+from replay import Replay
+from save_format import read_save
+
+ENGINES = ['list', 'packed', 'chunked']
+GAMES = 30  # seeds per engine
+
+
+def play(game: Game, rng: random.Random):
+    # Safe reveals, flags that are often wrong, and chords on revealed
+    # numbers, so many games end with a chord opening a mine
+    width, height, cells = game.width, game.height, game.cells
+    while game.status == 'playing':
+        x, y = rng.randrange(width), rng.randrange(height)
+        if game.first_move or cells.is_revealed(x, y):
+            game.reveal(x, y)
+        elif rng.random() < 0.3:
+            game.toggle_flag(x, y)
+        elif cells.get(x, y) != -1:
+            game.reveal(x, y)
+
+
+class ReplayTest(unittest.TestCase):
+    # A replay of a save, played to its last move, must end on the saved board
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_replay(self, game: Game, path: str):
+        game.write_save(path, "2024-01-01_00-00-00")
+        replay = Replay.from_save(read_save(path))
+        saved = Game.load_file(path)
+        final = replay.game
+        self.assertEqual(final.game_over, saved.game_over)
+        for y in range(game.height):
+            for x in range(game.width):
+                self.assertEqual((final.cells.is_revealed(x, y), final.cells.is_flagged(x, y)),
+                                 (saved.cells.is_revealed(x, y), saved.cells.is_flagged(x, y)),
+                                 f"cell ({x}, {y})")
+
+    def test_replay_ends_on_the_saved_board(self):
+        for engine in ENGINES:
+            for seed in range(GAMES):
+                with self.subTest(engine=engine, seed=seed):
+                    game = Game(16, 16, 40, engine, seed=seed, persist=False)
+                    play(game, random.Random(seed))
+                    self.check_replay(game, os.path.join(self.directory.name, f"{engine}-{seed}.sav"))
+
+    def test_json_save(self):
+        game = Game(16, 16, 40, 'list', seed=2, persist=False)
+        game.save_format = 'json'
+        play(game, random.Random(2))
+        self.check_replay(game, os.path.join(self.directory.name, "game.json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Game
+from save_format import HEADER, HEADER_V1, HEADER_V2, MAGIC, VERSION, parse_binary, read_binary
+
+ENGINES = ['list', 'packed', 'chunked']
+TIMESTAMP = "2024-01-01_00-00-00"
+
+
+def play(game: Game, rng: random.Random, moves: int = 40):
+    # Some reveals and flags, stopping early if the game ends
+    for _ in range(moves):
+        if game.status != 'playing':
+            return
+        x, y = rng.randrange(game.width), rng.randrange(game.height)
+        if not game.first_move and rng.random() < 0.3:
+            game.toggle_flag(x, y)
+        elif game.first_move or game.cells.get(x, y) != -1:
+            game.reveal(x, y)
+
+
+def old_version(data: bytes, version: int) -> bytes:
+    # Rewrite a version 4 save of a list or packed game in an older layout:
+    # version 1 has no duration or moves, version 2 no moves
+    fields = HEADER.unpack_from(data)
+    body = data[HEADER.size:]
+    if version == 3:
+        return HEADER.pack(MAGIC, 3, *fields[2:]) + body
+    planes = body[:len(body) - 8 * fields[-1]]
+    if version == 2:
+        return HEADER_V2.pack(MAGIC, 2, *fields[2:-1]) + planes
+    return HEADER_V1.pack(MAGIC, 1, *fields[2:-2]) + planes
+
+
+class BinaryFormatTest(unittest.TestCase):
+    # A game written as a binary save must load back unchanged, and saves
+    # written by older versions must still load
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertSameGame(self, loaded: Game, game: Game, moves=True, duration=True):
+        self.assertEqual((loaded.width, loaded.height, loaded.mines, loaded.seed, loaded.engine),
+                         (game.width, game.height, game.mines, game.seed, game.engine))
+        self.assertEqual((loaded.game_over, loaded.first_move), (game.game_over, game.first_move))
+        self.assertEqual((loaded.revealed_count, loaded.flag_count, loaded.safe_remaining),
+                         (game.revealed_count, game.flag_count, game.safe_remaining))
+        for y in range(game.height):
+            for x in range(game.width):
+                self.assertEqual((loaded.cells.get(x, y), loaded.cells.is_revealed(x, y),
+                                  loaded.cells.is_flagged(x, y)),
+                                 (game.cells.get(x, y), game.cells.is_revealed(x, y),
+                                  game.cells.is_flagged(x, y)), f"cell ({x}, {y})")
+        if moves:
+            self.assertEqual(list(loaded.moves), list(game.moves))
+        if duration:
+            self.assertAlmostEqual(loaded.elapsed, game.duration(), delta=1)
+
+    def save(self, game: Game, name: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        game.write_save(path, TIMESTAMP)
+        return path
+
+    def test_round_trip(self):
+        for engine in ENGINES:
+            for seed in range(10):
+                with self.subTest(engine=engine, seed=seed):
+                    game = Game(20, 12, 30, engine, seed=seed, persist=False)
+                    play(game, random.Random(seed))
+                    path = self.save(game, f"{engine}-{seed}.sav")
+                    header, _ = read_binary(path)
+                    self.assertEqual(header['timestamp'], TIMESTAMP)
+                    self.assertSameGame(Game.load_file(path), game)
+
+    def test_unplayed_game(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                game = Game(9, 9, 10, engine, seed=3, persist=False)
+                loaded = Game.load_file(self.save(game, f"{engine}.sav"))
+                self.assertTrue(loaded.first_move)
+                self.assertEqual(loaded.revealed_count, 0)
+
+    def test_largest_seed(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                game = Game(16, 16, 40, engine, seed=2 ** 64 - 1, persist=False)
+                play(game, random.Random(1))
+                self.assertSameGame(Game.load_file(self.save(game, f"{engine}.sav")), game)
+
+    def test_negative_seed_is_rejected(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                with self.assertRaises(ValueError):
+                    Game(9, 9, 10, engine, seed=-1, persist=False)
+
+    def test_older_versions(self):
+        for engine in ['list', 'packed']:
+            for version in range(1, VERSION + 1):
+                with self.subTest(engine=engine, version=version):
+                    game = Game(20, 12, 30, engine, seed=version, persist=False)
+                    play(game, random.Random(version))
+                    with open(self.save(game, f"{engine}.sav"), 'rb') as f:
+                        data = f.read()
+                    if version < VERSION:
+                        data = old_version(data, version)
+                    path = os.path.join(self.directory.name, f"{engine}-v{version}.sav")
+                    with open(path, 'wb') as f:
+                        f.write(data)
+                    header, _ = parse_binary(data)
+                    self.assertEqual(header['moves'].tolist(), game.moves.tolist() if version >= 3 else [])
+                    self.assertEqual(header['duration'] == 0.0, version == 1)
+                    self.assertSameGame(Game.load_file(path), game, moves=version >= 3, duration=version >= 2)
+
+    def test_truncated_save(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                game = Game(16, 16, 40, engine, seed=5, persist=False)
+                play(game, random.Random(5))
+                with open(self.save(game, f"{engine}.sav"), 'rb') as f:
+                    data = f.read()
+                with self.assertRaises(ValueError):
+                    parse_binary(data[:-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
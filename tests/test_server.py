@@ -0,0 +1,111 @@
+import asyncio
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+from move_log import MOVE_FLAG, MOVE_REVEAL
+from server import (FRAME, MOVE, MOVE_MESSAGE, SNAPSHOT, SNAPSHOT_HEADER, SPECTATOR,
+                    STATUS_CODES, Client, GameServer, frame)
+
+TIMEOUT = 5  # seconds to wait for any one message
+
+
+def snapshot_view(session):
+    # Status and view bytes of the snapshot the server would send now
+    payload = session.snapshot()[FRAME.size:]
+    return SNAPSHOT_HEADER.unpack_from(payload)[4], bytes(payload[SNAPSHOT_HEADER.size:])
+
+
+class ServerTest(unittest.IsolatedAsyncioTestCase):
+    # A player and a spectator connected over TCP must both see exactly
+    # what Session.snapshot() holds after every move
+
+    async def asyncSetUp(self):
+        self.server = GameServer()
+        self.listener = await asyncio.start_server(self.server.handle, '127.0.0.1', 0)
+        self.port = self.listener.sockets[0].getsockname()[1]
+        self.clients = []
+
+    async def asyncTearDown(self):
+        for client in self.clients:
+            client.close()
+        self.listener.close()
+        await self.listener.wait_closed()
+
+    async def connect(self) -> Client:
+        client = await Client.connect('127.0.0.1', self.port)
+        self.clients.append(client)
+        return client
+
+    async def start_game(self, width, height, mines, seed):
+        # A player's new game and a spectator watching it
+        player = await self.connect()
+        await asyncio.wait_for(player.create(width, height, mines, seed), TIMEOUT)
+        spectator = await self.connect()
+        await asyncio.wait_for(spectator.join(player.game_id, SPECTATOR), TIMEOUT)
+        return player, spectator, self.server.sessions[player.game_id]
+
+    async def catch_up(self, client: Client, session) -> list:
+        # Read until the client has every delta of the game; returns the
+        # types of the messages read
+        kinds = []
+        while client.sequence < session.sequence:
+            kinds.append(await asyncio.wait_for(client.receive(), TIMEOUT))
+        return kinds
+
+    def assertViewsMatch(self, session, *clients):
+        status, view = snapshot_view(session)
+        for client in clients:
+            self.assertEqual((client.status, bytes(client.view)), (status, view))
+
+    async def test_player_and_spectator_follow_the_game(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                player, spectator, session = await self.start_game(12, 10, 15, seed)
+                self.assertViewsMatch(session, player, spectator)
+                game, rng = session.game, random.Random(seed)
+                while game.status == 'playing':
+                    x, y = rng.randrange(game.width), rng.randrange(game.height)
+                    roll = rng.random()
+                    if game.first_move or game.cells.is_revealed(x, y):
+                        kind = MOVE_REVEAL  # on a revealed number this chords
+                    elif roll < 0.2:
+                        kind = MOVE_FLAG
+                    elif roll < 0.97 and game.cells.get(x, y) == -1:
+                        continue
+                    else:
+                        kind = MOVE_REVEAL
+                    await asyncio.wait_for(player.move(kind, x, y), TIMEOUT)
+                    await self.catch_up(spectator, session)
+                    self.assertViewsMatch(session, player, spectator)
+                self.assertEqual(player.status, STATUS_CODES[game.status])
+
+    async def test_slow_client_gets_a_snapshot(self):
+        # A burst of moves is handled without the senders running in
+        # between, so more than MAX_PENDING bytes queue up for each client
+        player, spectator, session = await self.start_game(16, 16, 40, 1)
+        await asyncio.wait_for(player.move(MOVE_REVEAL, 8, 8), TIMEOUT)
+        await self.catch_up(spectator, session)
+        hidden = [(x, y) for y in range(16) for x in range(16)
+                  if not session.game.cells.is_revealed(x, y)]
+        with mock.patch.object(server, 'MAX_PENDING', 200):
+            player.writer.write(b''.join(frame(MOVE, MOVE_MESSAGE.pack(MOVE_FLAG, x, y))
+                                         for x, y in hidden[:30]))
+            while session.sequence < 31:
+                await asyncio.sleep(0.01)
+            player_kinds = await self.catch_up(player, session)
+            spectator_kinds = await self.catch_up(spectator, session)
+        self.assertIn(SNAPSHOT, player_kinds)
+        self.assertIn(SNAPSHOT, spectator_kinds)
+        self.assertLess(len(spectator_kinds), 30)
+        self.assertViewsMatch(session, player, spectator)
+        self.assertEqual(session.game.flag_count, 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
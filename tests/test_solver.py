@@ -0,0 +1,115 @@
+import itertools
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Game
+from solver import Deductions, Solver
+
+SIZES = [(4, 4, 4), (5, 5, 6), (6, 5, 8), (6, 6, 10)]
+GAMES = 40  # seeds per size
+MAX_UNKNOWN = 16  # positions with more frontier cells are not brute forced
+
+
+def play_some(game: Game, rng: random.Random):
+    # Open the board, then a few more safe cells and correct flags, so the
+    # frontier has numbers from several directions
+    game.reveal(game.width // 2, game.height // 2)
+    for _ in range(rng.randrange(6)):
+        if game.status != 'playing':
+            return
+        x, y = rng.randrange(game.width), rng.randrange(game.height)
+        if game.cells.is_revealed(x, y) or game.cells.is_flagged(x, y):
+            continue
+        if game.cells.get(x, y) == -1:
+            game.toggle_flag(x, y)
+        else:
+            game.reveal(x, y)
+
+
+def brute_force(game: Game):
+    # Cells that are safe, or a mine, in every layout that agrees with the
+    # revealed numbers and the flags, or None when there are too many cells
+    width, height, cells = game.width, game.height, game.cells
+    constraints = []
+    unknown = set()
+    for y in range(height):
+        for x in range(width):
+            if not cells.is_revealed(x, y) or cells.get(x, y) <= 0:
+                continue
+            around = []
+            flags = 0
+            for ny in range(max(y - 1, 0), min(y + 2, height)):
+                for nx in range(max(x - 1, 0), min(x + 2, width)):
+                    if cells.is_flagged(nx, ny):
+                        flags += 1
+                    elif not cells.is_revealed(nx, ny):
+                        around.append(ny * width + nx)
+            if around:
+                constraints.append((around, cells.get(x, y) - flags))
+                unknown.update(around)
+    unknown = sorted(unknown)
+    if len(unknown) > MAX_UNKNOWN:
+        return None
+    position = {c: j for j, c in enumerate(unknown)}
+    seen_mine = [False] * len(unknown)
+    seen_safe = [False] * len(unknown)
+    for layout in itertools.product((0, 1), repeat=len(unknown)):
+        if all(sum(layout[position[c]] for c in around) == need for around, need in constraints):
+            for j, value in enumerate(layout):
+                if value:
+                    seen_mine[j] = True
+                else:
+                    seen_safe[j] = True
+    deductions = Deductions()
+    for j, c in enumerate(unknown):
+        if seen_safe[j] and not seen_mine[j]:
+            deductions.safe.add(c)
+        elif seen_mine[j] and not seen_safe[j]:
+            deductions.mines.add(c)
+    return deductions
+
+
+class SolverTest(unittest.TestCase):
+    # The solver's deductions must be exactly the cells brute force finds
+    # certain, and the rules alone must never claim more than that
+
+    def test_matches_brute_force(self):
+        checked = 0
+        for width, height, mines in SIZES:
+            for seed in range(GAMES):
+                game = Game(width, height, mines, 'list', seed=seed, persist=False)
+                play_some(game, random.Random(seed))
+                if game.status != 'playing':
+                    continue
+                expected = brute_force(game)
+                if expected is None:
+                    continue
+                checked += 1
+                with self.subTest(size=(width, height, mines), seed=seed):
+                    deductions = Solver(game).analyse()
+                    self.assertEqual((deductions.safe, deductions.mines), (expected.safe, expected.mines))
+
+                    rules, _ = Solver(game, max_component=0).reduce()
+                    self.assertLessEqual(rules.safe, expected.safe)
+                    self.assertLessEqual(rules.mines, expected.mines)
+        self.assertGreater(checked, GAMES)
+
+    def test_overlap_rule(self):
+        # {0, 1, 2} holds 1 mine and {1, 2, 3} holds 2: cell 0 is safe and
+        # cell 3 a mine, which no subset reduction finds
+        solver = Solver(Game(4, 1, 1, 'list', seed=0, persist=False))
+        deductions = Deductions()
+        constraints = {(frozenset({0, 1, 2}), 1), (frozenset({1, 2, 3}), 2)}
+        self.assertEqual(solver.apply_subset_rules(constraints), constraints)
+        reduced = solver.apply_overlap_rules(constraints)
+        left = solver.apply_single_rules(reduced, deductions)
+        self.assertEqual((deductions.safe, deductions.mines), ({0}, {3}))
+        self.assertEqual(left, {(frozenset({1, 2}), 1)})
+
+
+if __name__ == "__main__":
+    unittest.main()